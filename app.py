@@ -1,6 +1,9 @@
 import streamlit as st
-import importlib
 import streamlit.components.v1 as components
+from core.prewarm import timed_import, start_prewarm, likely_next_tools
+from core.tools_registry import get_registry
+from core.tracing import begin_rerun, tag_rerun, finish_rerun, span, install_chart_spans
+from core.memprofile import profile_tool
 
 # 1. PAGE CONFIG (ΠΑΝΤΑ ΠΡΩΤΟ - ΧΩΡΙΣ ΕΣΟΧΗ)
 st.set_page_config(
@@ -10,6 +13,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Tracing του rerun (βλ. ?debug=1 > Latency Panel)
+begin_rerun()
+install_chart_spans()
+
 # 2. MICROSOFT CLARITY (ΑΝΤΙΚΑΤΑΣΤΑΣΗ GOOGLE ANALYTICS)
 clarity_code = """
 <script type="text/javascript">
@@ -22,13 +29,15 @@ clarity_code = """
 """
 
 # Ενσωμάτωση Clarity - Το ύψος 0 το κρατάει κρυφό
-components.html(clarity_code, height=0)
+with span("clarity"):
+    components.html(clarity_code, height=0)
 
-# 3. ΕΙΣΑΓΩΓΕΣ MODULES
-from ui.sidebar import show_sidebar
-from ui.home import run_home
-from ui.about import show_about
-from core.engine import calculate_metrics
+# 3. ΕΙΣΑΓΩΓΕΣ MODULES (χρονομετρημένες - βλ. ?debug=1 > Import Timings)
+with span("imports"):
+    show_sidebar = timed_import("ui.sidebar", source="startup").show_sidebar
+    run_home = timed_import("ui.home", source="startup").run_home
+    show_about = timed_import("ui.about", source="startup").show_about
+    get_metrics = timed_import("core.sync", source="startup").get_metrics
 
 # --------------------------------------------------
 # TOOL MAP
@@ -56,6 +65,9 @@ TOOL_MAP = {
     "shock_simulator": ("core.tools.company_shock_simulator", "show_company_shock_simulator"),
 }
 
+# Validated μία φορά ανά process· κάθε tool φορτώνεται μία φορά και μένει cached
+TOOLS = get_registry(TOOL_MAP)
+
 # 4. STATE INITIALIZATION
 s = st.session_state
 
@@ -86,65 +98,65 @@ for key, val in defaults.items():
     if key not in s:
         s[key] = val
 
-# 5. RUN FINANCIAL ENGINE
-s.metrics = calculate_metrics(
-    price=float(s.price),
-    volume=float(s.volume),
-    variable_cost=float(s.variable_cost),
-    fixed_cost=float(s.fixed_cost),
-    ar_days=int(s.ar_days),
-    inv_days=int(s.inv_days),
-    ap_days=int(s.ap_days),
-    annual_debt_service=float(s.annual_debt_service),
-    opening_cash=float(s.opening_cash),
-    total_debt=float(s.total_debt),
-    fixed_assets=float(s.fixed_assets),
-    target_profit=float(s.target_profit_goal),
-    tax_rate=float(s.tax_rate),
-    annual_interest=float(s.annual_interest_only),
-    equity=float(s.equity),
-    depreciation=float(s.depreciation)
-)
+# 5. RUN FINANCIAL ENGINE (μία φορά ανά αλλαγή inputs - όλα τα tools διαβάζουν το ίδιο s.metrics)
+with span("engine"):
+    get_metrics()
 
 # 6. SIDEBAR & ROUTING
-show_sidebar()
+with span("sidebar"):
+    show_sidebar()
 step = s.flow_step
+tag_rerun(step=step, tool=s.selected_tool if step == "tool" else step)
+
+with finish_rerun(), span("routing"):
+    if step == "home":
+        s.selected_tool = None
+        with span("page:home"):
+            run_home()
+        # Μετά το πρώτο paint: φόρτωσε στο παρασκήνιο τα tools που πιθανότατα ανοίγουν μετά
+        start_prewarm(TOOLS.available, likely_next_tools("home", TOOLS.available))
+        st.stop()
 
-if step == "home":
-    s.selected_tool = None
-    run_home()
-    st.stop()
-
-elif step == "about":
-    show_about()
-    st.stop()
-
-elif step == "control_tower":
-    mod_name, func_name = TOOL_MAP["control_tower"]
-    try:
-        module = importlib.import_module(mod_name)
-        func = getattr(module, func_name)
-        if st.sidebar.button("🏠 Back to Strategy Hub", use_container_width=True):
-            s.flow_step = "home"
-            st.rerun()
-        func() 
-    except Exception as e:
-        st.error(f"Error loading Mission Control: {e}")
-    st.stop()
-
-elif step == "tool":
-    tool_key = s.selected_tool
-    if tool_key in TOOL_MAP:
-        mod_name, func_name = TOOL_MAP[tool_key]
-        col_title, col_back = st.columns([0.8, 0.2])
-        col_title.caption(f"Strategy Room > {tool_key.replace('_',' ').title()}")
-        if col_back.button("⬅ Back to Hub", use_container_width=True):
-            s.flow_step = "home"
-            st.rerun()
-        st.divider()
+    elif step == "about":
+        show_about()
+        st.stop()
+
+    elif step == "latency" and st.query_params.get("debug") == "1":
+        # Κρυφό debug page (ανοίγει από το sidebar με ?debug=1)
+        from ui.latency import show_latency_panel
+        show_latency_panel()
+        st.stop()
+
+    elif step == "control_tower":
         try:
-            module = importlib.import_module(mod_name)
-            func = getattr(module, func_name)
-            func()
+            with span("tool_import"):
+                func = TOOLS.entry("control_tower")
+            if st.sidebar.button("🏠 Back to Strategy Hub", use_container_width=True):
+                s.flow_step = "home"
+                st.rerun()
+            with span("tool:control_tower"), profile_tool("control_tower"):
+                func()
+            start_prewarm(TOOLS.available, likely_next_tools("control_tower", TOOLS.available))
         except Exception as e:
-            st.error(f"Error loading module: {e}")
+            st.error(f"Error loading Mission Control: {e}")
+        st.stop()
+
+    elif step == "tool":
+        tool_key = s.selected_tool
+        if tool_key in TOOL_MAP:
+            col_title, col_back = st.columns([0.8, 0.2])
+            col_title.caption(f"Strategy Room > {tool_key.replace('_',' ').title()}")
+            if col_back.button("⬅ Back to Hub", use_container_width=True):
+                s.flow_step = "home"
+                st.rerun()
+            st.divider()
+            if TOOLS.error(tool_key):
+                st.warning(f"This tool is not available yet ({TOOLS.error(tool_key)}).")
+                st.stop()
+            try:
+                with span("tool_import"):
+                    func = TOOLS.entry(tool_key)
+                with span(f"tool:{tool_key}"), profile_tool(tool_key):
+                    func()
+            except Exception as e:
+                st.error(f"Error loading module: {e}")
@@ -0,0 +1,109 @@
+"""
+Benchmark: streaming AR aging / DSO on a synthetic receivables file.
+
+    python -m benchmarks.bench_ar_aging --rows 20000000
+    python -m benchmarks.bench_ar_aging --rows 2000000 --format csv
+
+Writes a fixed-width export (invoice_date:0:8, amount:8:22, paid_date:22:30,
+YYYYMMDD dates, ~7% still open) or a CSV with the same data, chunk by chunk,
+then times core.ar_aging.compute_aging and reports rows/s and peak RSS.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from core.ar_aging import compute_aging, format_aging
+
+LAYOUT = "invoice_date:0:8,amount:8:22,paid_date:22:30"
+RECORD = 31
+WRITE_CHUNK = 1_000_000
+
+
+def _digits(values, width):
+    # Μη αρνητικοί ακέραιοι -> ASCII ψηφία σταθερού πλάτους (uint8)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + 48).astype(np.uint8)
+
+
+def _yyyymmdd(days):
+    dates = days.astype("datetime64[D]")
+    year = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    day = (dates - dates.astype("datetime64[M]")).astype(np.int64) + 1
+    return year * 10000 + month * 100 + day
+
+
+def make_chunk(rng, n, start_day, span_days):
+    inv = start_day + rng.integers(0, span_days, n)
+    late = rng.random(n) < 0.35
+    days = np.where(late, rng.gamma(3.0, 25.0, n), rng.gamma(4.0, 7.0, n)).round().astype(np.int64)
+    paid = inv + days
+    open_ = (paid > start_day + span_days) | (rng.random(n) < 0.02)
+    cents = (rng.lognormal(7, 0.9, n) * 100).astype(np.int64)
+    return inv, np.where(open_, -1, paid), cents
+
+
+def write_fixed_width(path, rows, seed=9, span_days=730):
+    rng = np.random.default_rng(seed)
+    start_day = int((np.datetime64("2024-01-01") - np.datetime64("1970-01-01")).astype(np.int64))
+    with open(path, "wb") as fh:
+        for lo in range(0, rows, WRITE_CHUNK):
+            n = min(WRITE_CHUNK, rows - lo)
+            inv, paid, cents = make_chunk(rng, n, start_day, span_days)
+            rec = np.full((n, RECORD), 32, dtype=np.uint8)
+            rec[:, 0:8] = _digits(_yyyymmdd(inv), 8)
+            rec[:, 8:19] = _digits(cents // 100, 11)
+            rec[:, 19] = ord(".")
+            rec[:, 20:22] = _digits(cents % 100, 2)
+            has_paid = paid >= 0
+            rec[has_paid, 22:30] = _digits(_yyyymmdd(paid[has_paid]), 8)
+            rec[:, 30] = 10
+            fh.write(rec.tobytes())
+
+
+def write_csv(path, rows, seed=9, span_days=730):
+    import pandas as pd
+    from core.stream_io import ChunkWriter
+    rng = np.random.default_rng(seed)
+    start_day = int((np.datetime64("2024-01-01") - np.datetime64("1970-01-01")).astype(np.int64))
+    writer = ChunkWriter(path)
+    try:
+        for lo in range(0, rows, WRITE_CHUNK):
+            n = min(WRITE_CHUNK, rows - lo)
+            inv, paid, cents = make_chunk(rng, n, start_day, span_days)
+            paid_text = np.datetime_as_string(np.maximum(paid, 0).astype("datetime64[D]"))
+            writer.write(pd.DataFrame({
+                "invoice_date": np.datetime_as_string(inv.astype("datetime64[D]")),
+                "amount": cents / 100,
+                "paid_date": np.where(paid >= 0, paid_text, ""),
+            }))
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--format", choices=("fixed", "csv"), default="fixed")
+    parser.add_argument("--as-of", default="2025-12-31")
+    parser.add_argument("--keep", help="write the file here and keep it (default: temp file)")
+    args = parser.parse_args(argv)
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(), "ar.txt" if args.format == "fixed" else "ar.csv")
+    t0 = time.perf_counter()
+    (write_fixed_width if args.format == "fixed" else write_csv)(path, args.rows)
+    print(f"wrote {args.rows:,} rows ({os.path.getsize(path) / 1e6:,.0f} MB) in {time.perf_counter() - t0:.1f}s")
+
+    result = compute_aging(path, as_of=args.as_of, fixed_width=LAYOUT if args.format == "fixed" else None)
+    print(format_aging(result))
+    print(f"{result['rows']:,} rows in {result['seconds']:.1f}s -> {result['rows_per_s']:,.0f} rows/s | "
+          f"peak RSS {result['peak_rss_mb']:,.0f} MB")
+    if not args.keep:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
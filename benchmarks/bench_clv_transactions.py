@@ -0,0 +1,125 @@
+"""
+Benchmark: transaction-log CLV on a synthetic order-line log.
+
+    python -m benchmarks.bench_clv_transactions --lines 50000000
+    python -m benchmarks.bench_clv_transactions --lines 5000000 --format parquet --keep /tmp/orders.parquet
+
+Customers are acquired over --years years; each acquisition year has its own
+annual churn and purchase rate (Poisson orders while alive, 1-3 lines per
+order). The log is written week by week in date order, never whole in
+memory, then core.clv_transactions.transaction_clv streams it back; the
+per-cohort churn / purchases per year are printed next to the generator's.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from core.clv_transactions import format_report, transaction_clv
+from core.stream_io import ChunkWriter
+
+WINDOW_DAYS = 7
+START = np.datetime64("2021-01-01")
+LINES_PER_ORDER = 2.0     # 1-3 ισοπίθανα
+
+
+def cohort_params(years):
+    return {
+        "churn": np.linspace(35.0, 20.0, years),       # % ανά έτος
+        "purchases": np.linspace(3.0, 6.0, years),     # παραγγελίες / έτος όσο ζει
+    }
+
+
+def _customers_for(lines, years, params, seed=1):
+    # Αναμενόμενες γραμμές ανά πελάτη (Monte Carlo) -> πλήθος πελατών
+    rng = np.random.default_rng(seed)
+    cohort = rng.integers(0, years, 20_000)
+    start = cohort * 365 + rng.uniform(0, 365, cohort.size)
+    life = rng.exponential(1 / -np.log1p(-params["churn"][cohort] / 100)) * 365
+    alive = np.minimum(life, years * 365 - start)
+    per_customer = (alive / 365 * params["purchases"][cohort]).mean() * LINES_PER_ORDER
+    return max(int(lines / per_customer), 1)
+
+
+def write_log(path, lines, years=4, seed=5):
+    import pandas as pd
+    params = cohort_params(years)
+    n = _customers_for(lines, years, params)
+    rng = np.random.default_rng(seed)
+    cohort = rng.integers(0, years, n)
+    born = (cohort * 365 + rng.integers(0, 365, n)).astype(np.int64)
+    hazard = -np.log1p(-params["churn"][cohort] / 100)
+    dies = born + rng.exponential(1 / hazard) * 365
+    rate = params["purchases"][cohort] / 365                      # ανά ημέρα
+    ticket = rng.lognormal(3.5, 0.6, n)
+
+    writer = ChunkWriter(path)
+    written, order_id = 0, 0
+    try:
+        for lo in range(0, years * 365, WINDOW_DAYS):
+            hi = min(lo + WINDOW_DAYS, years * 365)
+            begin, end = np.maximum(born, lo), np.minimum(dies, hi)
+            live = np.flatnonzero(end > begin)
+            orders = rng.poisson(rate[live] * (end[live] - begin[live]))
+            cust = np.repeat(live, orders)
+            if not cust.size:
+                continue
+            day = np.floor(rng.uniform(begin[cust], end[cust])).astype(np.int64)
+            first_order = born[cust] == day
+            # η πρώτη αγορά κάθε πελάτη γίνεται την ημέρα απόκτησης
+            acquired = live[(born[live] >= lo) & (born[live] < hi)]
+            cust = np.concatenate([cust[~first_order], acquired])
+            day = np.concatenate([day[~first_order], born[acquired]])
+            order = np.argsort(day, kind="stable")
+            cust, day = cust[order], day[order]
+            ids = order_id + np.arange(cust.size)
+            order_id += cust.size
+            per = rng.integers(1, 4, cust.size)
+            line_cust, line_day, line_order = (np.repeat(x, per) for x in (cust, day, ids))
+            qty = rng.integers(1, 4, line_cust.size)
+            writer.write(pd.DataFrame({
+                "customer_id": line_cust,
+                "order_id": line_order,
+                "order_date": np.datetime_as_string(START + line_day.astype("timedelta64[D]")),
+                "quantity": qty,
+                "amount": (ticket[line_cust] * qty).round(2),
+            }))
+            written += line_cust.size
+    finally:
+        writer.close()
+    return written, n, params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5_000_000)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--keep", help="write the log here and keep it (default: temp file)")
+    parser.add_argument("--log", help="skip generation and read this existing log")
+    args = parser.parse_args(argv)
+
+    params = cohort_params(args.years)
+    path = args.log or args.keep or os.path.join(tempfile.mkdtemp(), f"orders.{args.format}")
+    if not args.log:
+        t0 = time.perf_counter()
+        written, customers, params = write_log(path, args.lines, args.years)
+        print(f"wrote {written:,} lines, {customers:,} customers ({os.path.getsize(path) / 1e6:,.0f} MB) "
+              f"in {time.perf_counter() - t0:.1f}s")
+
+    result = transaction_clv(path, chunksize=args.chunksize, date_format="%Y-%m-%d")
+    print(format_report(result))
+    t = result["table"]
+    print("generator:  " + "  ".join(f"{c} churn {ch:.0f}% / {p:.1f} orders/yr"
+                                     for c, ch, p in zip(t["cohort"], params["churn"], params["purchases"])))
+    print(f"scan: {result['scan_seconds']:.1f}s -> {result['lines_per_s']:,.0f} lines/s | "
+          f"{result['customers']:,} customers | peak RSS {result['peak_rss_mb']:,.0f} MB")
+    if not (args.keep or args.log):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
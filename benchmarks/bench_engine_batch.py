@@ -0,0 +1,81 @@
+"""
+Benchmark: core.engine.calculate_metrics (Python loop) vs calculate_metrics_batch.
+
+    python -m benchmarks.bench_engine_batch --rows 100000
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from core.engine import ENGINE_INPUTS, calculate_metrics, calculate_metrics_batch
+
+
+def make_baselines(rows, seed=42):
+    """Random baseline variants around the app defaults (incl. loss-making rows)."""
+    rng = np.random.default_rng(seed)
+    return {
+        "price": rng.uniform(50, 250, rows),
+        "volume": rng.integers(0, 30000, rows).astype(float),
+        "variable_cost": rng.uniform(40, 200, rows),
+        "fixed_cost": rng.uniform(100000, 900000, rows),
+        "ar_days": rng.integers(0, 120, rows).astype(float),
+        "inv_days": rng.integers(0, 120, rows).astype(float),
+        "ap_days": rng.integers(0, 90, rows).astype(float),
+        "annual_debt_service": rng.uniform(0, 150000, rows),
+        "opening_cash": rng.uniform(0, 400000, rows),
+        "total_debt": rng.uniform(0, 1000000, rows),
+        "fixed_assets": rng.uniform(0, 1500000, rows),
+        "target_profit": rng.uniform(0, 300000, rows),
+        "tax_rate": rng.uniform(0, 35, rows),
+        "annual_interest": rng.uniform(0, 50000, rows),
+        "equity": rng.uniform(0, 1000000, rows),
+        "depreciation": rng.uniform(0, 100000, rows),
+    }
+
+
+def check_parity(cols, batch, rows):
+    """Row-by-row comparison with the scalar engine (exact equality)."""
+    for i in range(rows):
+        ref = calculate_metrics(**{k: float(cols[k][i]) for k in ENGINE_INPUTS})
+        for key, value in ref.items():
+            if key == "roic_debug":
+                continue
+            got = batch[key][i]
+            if value is None:
+                assert not batch["bep_defined"][i] and math.isnan(got), (i, key)
+            else:
+                assert got == value, (i, key, got, value)
+
+
+def run(rows, loop_rows):
+    cols = make_baselines(rows)
+
+    t0 = time.perf_counter()
+    batch = calculate_metrics_batch(**cols)
+    t_batch = time.perf_counter() - t0
+
+    loop_rows = min(loop_rows, rows)
+    t0 = time.perf_counter()
+    for i in range(loop_rows):
+        calculate_metrics(**{k: float(cols[k][i]) for k in ENGINE_INPUTS})
+    t_loop = time.perf_counter() - t0
+
+    check_parity(cols, batch, loop_rows)
+
+    loop_rate = loop_rows / t_loop
+    batch_rate = rows / t_batch
+    print(f"Python loop : {loop_rows:>10,} rows  {t_loop:8.3f}s  {loop_rate:>14,.0f} rows/s")
+    print(f"Batch       : {rows:>10,} rows  {t_batch:8.3f}s  {batch_rate:>14,.0f} rows/s")
+    print(f"Speed-up    : {batch_rate / loop_rate:,.1f}x  (parity checked on {loop_rows:,} rows)")
+    return {"loop_rows_per_s": loop_rate, "batch_rows_per_s": batch_rate}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--loop-rows", type=int, default=50_000,
+                        help="rows for the scalar loop (kept smaller - it is slow)")
+    args = parser.parse_args()
+    run(args.rows, args.loop_rows)
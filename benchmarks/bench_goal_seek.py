@@ -0,0 +1,67 @@
+"""
+Benchmark: batched core.goal_seek vs a per-row Python bisection on calculate_metrics.
+
+    python -m benchmarks.bench_goal_seek --rows 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_engine_batch import make_baselines
+from core.engine import ENGINE_INPUTS, calculate_metrics
+from core.goal_seek import goal_seek
+
+CASES = (
+    ("margin_of_safety", 0.0, "price"),
+    ("net_cash_position", 0.0, "ap_days"),
+    ("roic", 0.15, "volume"),
+)
+
+
+def scalar_bisect(row, metric, target, name, iters=60):
+    """Η "παλιά" μέθοδος: bisection ανά γραμμή, μία κλήση του engine ανά βήμα."""
+    def f(x):
+        value = calculate_metrics(**{**row, name: x})[metric]
+        return float("nan") if value is None else value - target
+    lo, hi = 0.0, max(10 * abs(row[name]), 1.0)
+    f_lo = f(lo)
+    for _ in range(iters):
+        mid = (lo + hi) / 2
+        f_mid = f(mid)
+        if (f_mid < 0) == (f_lo < 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def run(rows, loop_rows):
+    cols = make_baselines(rows, seed=11)
+    loop_rows = min(loop_rows, rows)
+    results = {}
+    for metric, target, name in CASES:
+        t0 = time.perf_counter()
+        out = goal_seek(metric, target, name, cols)
+        t_batch = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for i in range(loop_rows):
+            scalar_bisect({k: float(cols[k][i]) for k in ENGINE_INPUTS}, metric, target, name)
+        t_loop = time.perf_counter() - t0
+
+        batch_rate, loop_rate = rows / t_batch, loop_rows / t_loop
+        methods = np.bincount(out["method"] + 1, minlength=4)
+        print(f"{metric:>18} via {name:<10} batch {batch_rate:>12,.0f} targets/s | "
+              f"loop {loop_rate:>9,.0f} targets/s | x{batch_rate / loop_rate:,.0f} | "
+              f"solved {out['solved'].mean():.1%} (closed {methods[1]}, linear {methods[2]}, bracket {methods[3]})")
+        results[f"{metric}:{name}"] = batch_rate
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--loop-rows", type=int, default=300)
+    args = parser.parse_args()
+    run(args.rows, args.loop_rows)
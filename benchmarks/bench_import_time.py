@@ -0,0 +1,62 @@
+"""
+Benchmark: cold import time of the compute core vs the UI modules.
+Each import runs in a fresh interpreter (no warm sys.modules), best of N.
+
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = (
+    "numpy",
+    "core.engine",
+    "core.compute",
+    "core.monte_carlo",
+    "core.sync",
+    "core.tools.receivables_npv",
+    "core.tools.clv_calculator",
+)
+
+# Modules the compute core must never pull in
+HEAVY = ("streamlit", "pandas", "plotly", "matplotlib", "fpdf")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat=5):
+    best, heavy = float("inf"), []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        sample = json.loads(out.stdout.strip().splitlines()[-1])
+        best, heavy = min(best, sample["seconds"]), sample["heavy"]
+    return {"module": module, "seconds": best, "heavy": heavy}
+
+
+def run(repeat, targets=TARGETS):
+    results = [measure(module, repeat) for module in targets]
+    for r in results:
+        print(f"{r['module']:<30} {r['seconds'] * 1000:>9.1f} ms   heavy: {', '.join(r['heavy']) or '-'}")
+    compute = next((r for r in results if r["module"] == "core.compute"), None)
+    if compute and compute["heavy"]:
+        raise SystemExit(f"core.compute imported UI dependencies: {compute['heavy']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--module", action="append", help="module(s) to time instead of the defaults")
+    args = parser.parse_args()
+    run(args.repeat, tuple(args.module) if args.module else TARGETS)
@@ -0,0 +1,42 @@
+"""
+Benchmark: core.monte_carlo.run_monte_carlo on the app's default baseline.
+
+    python -m benchmarks.bench_monte_carlo --draws 1000000 --seed 7
+"""
+import argparse
+import time
+
+from core.monte_carlo import run_monte_carlo
+
+# Ίδιο με τα defaults του app.py (engine input names)
+DEFAULT_BASELINE = {
+    "price": 150.0, "volume": 10000.0, "variable_cost": 100.0, "fixed_cost": 450000.0,
+    "ar_days": 60.0, "inv_days": 45.0, "ap_days": 30.0,
+    "annual_debt_service": 70000.0, "opening_cash": 150000.0,
+    "total_debt": 500000.0, "fixed_assets": 800000.0, "target_profit": 200000.0,
+    "tax_rate": 22.0, "annual_interest": 0.0, "equity": 500000.0, "depreciation": 50000.0,
+}
+
+
+def run(draws, seed):
+    t0 = time.perf_counter()
+    result = run_monte_carlo(DEFAULT_BASELINE, n_draws=draws, seed=seed)
+    elapsed = time.perf_counter() - t0
+
+    again = run_monte_carlo(DEFAULT_BASELINE, n_draws=min(draws, 200_000), seed=seed)
+    first = run_monte_carlo(DEFAULT_BASELINE, n_draws=min(draws, 200_000), seed=seed)
+    assert again == first, "same seed must reproduce the same result"
+
+    print(f"Draws        : {draws:,}  in {elapsed:.3f}s  ({draws / elapsed:,.0f} draws/s)")
+    print(f"P(net cash<0): {result['p_negative_cash']:.4f}")
+    print(f"P(ROIC<WACC) : {result['p_roic_below_wacc']:.4f}")
+    print(f"Runway q     : {result['runway_quantiles']}")
+    return {"draws_per_s": draws / elapsed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.draws, args.seed)
@@ -0,0 +1,49 @@
+"""
+Scaling benchmark: core.parallel.run_monte_carlo_parallel at 1/2/4/8 workers.
+Also checks that the samples are bit-identical for every worker count.
+
+    python -m benchmarks.bench_parallel --draws 10000000 --workers 1 2 4 8
+"""
+import argparse
+import hashlib
+import os
+import time
+
+from benchmarks.bench_monte_carlo import DEFAULT_BASELINE
+from core.monte_carlo import SAMPLE_METRICS
+from core.parallel import run_monte_carlo_parallel
+
+
+def _digest(samples):
+    h = hashlib.sha256()
+    for key in SAMPLE_METRICS:
+        h.update(samples[key].tobytes())
+    return h.hexdigest()
+
+
+def run(draws, workers_list, seed):
+    print(f"CPU cores: {os.cpu_count()} | draws: {draws:,} | seed: {seed}")
+    rows, digests = [], set()
+    base_rate = None
+    for workers in workers_list:
+        t0 = time.perf_counter()
+        result = run_monte_carlo_parallel(DEFAULT_BASELINE, n_draws=draws, seed=seed,
+                                          workers=workers, keep_samples=True)
+        elapsed = time.perf_counter() - t0
+        digests.add(_digest(result.pop("samples")))
+        rate = draws / elapsed
+        base_rate = base_rate or rate
+        rows.append({"workers": workers, "seconds": elapsed, "draws_per_s": rate})
+        print(f"workers={workers:<3} {elapsed:8.3f}s  {rate:>14,.0f} draws/s  x{rate / base_rate:.2f}")
+    assert len(digests) == 1, "results differ between worker counts"
+    print("Bit-identical across worker counts: yes")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--draws", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.draws, args.workers, args.seed)
@@ -0,0 +1,248 @@
+"""
+Concurrent-session load harness: drives app.py headlessly with Streamlit's
+AppTest, N sessions at a time, and reports rerun latency per tool,
+throughput and peak RSS per session count.
+
+    python -m benchmarks.load_sessions --sessions 1,4,8 --budget-ms 500
+    python -m benchmarks.load_sessions --sessions 2 --tools stress_test,clv_calculator --json load.json
+
+Each session: Home -> "Test My Business" (locks the baseline, opens Mission
+Control) -> every TOOL_MAP tool -> moves up to --max-sliders sliders per
+tool, one rerun each. All sessions of a level run concurrently in one
+process, like one Streamlit server pod.
+
+AppTest swaps a process-global mock Runtime in and out around every run,
+so two AppTest reruns cannot overlap; the harness serializes them with a
+lock and interleaves the sessions rerun by rerun. Script execution is
+GIL-bound Python anyway, so throughput matches a real pod's CPU ceiling;
+`latency` includes the wait for the lock (what a user would feel),
+`service` is the rerun alone.
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+LOCK_BUTTON = "▶ Test My Business"
+
+_run_lock = threading.Lock()  # ένα AppTest run τη φορά (global mock Runtime)
+
+
+def load_tool_map(path=APP):
+    """TOOL_MAP literal from app.py (without running the script)."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "TOOL_MAP" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise LookupError("TOOL_MAP not found in app.py")
+
+
+def available_tools(tool_map):
+    from core.tools_registry import ToolRegistry
+    return list(ToolRegistry(tool_map).available)
+
+
+# ------------------------------------------------
+# RSS
+# ------------------------------------------------
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+class RSSSampler:
+    """Background sampler: peak RSS within a window (ru_maxrss only ever grows)."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+# ------------------------------------------------
+# ONE SESSION
+# ------------------------------------------------
+
+def _timed_run(at, samples, label, kind, timeout):
+    t0 = time.perf_counter()
+    with _run_lock:
+        t1 = time.perf_counter()
+        at.run(timeout=timeout)
+        t2 = time.perf_counter()
+    samples.append({"tool": label, "kind": kind, "ms": (t2 - t0) * 1000, "service_ms": (t2 - t1) * 1000,
+                    "error": bool(at.exception)})
+
+
+def _next_value(slider):
+    value = slider.value
+    if isinstance(value, (tuple, list)):
+        return None  # range slider - δεν το μετακινούμε
+    step = slider.step or 1
+    lo, hi = slider.min, slider.max
+    target = value + step * 3 if value + step * 3 <= hi else value - step * 3
+    if isinstance(value, int) and isinstance(step, int):
+        return int(min(max(target, lo), hi))
+    return min(max(target, lo), hi)
+
+
+def run_session(tools, max_sliders=3, timeout=60):
+    from streamlit.testing.v1 import AppTest
+
+    samples = []
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    _timed_run(at, samples, "home", "open", timeout)
+
+    # 1. Lock baseline μέσω του πραγματικού κουμπιού (fallback: session_state)
+    lock = [b for b in at.button if b.label == LOCK_BUTTON]
+    if lock:
+        lock[0].click()
+    else:
+        at.session_state["baseline_locked"] = True
+        at.session_state["flow_step"] = "control_tower"
+    _timed_run(at, samples, "control_tower", "open", timeout)
+
+    # 2. Κάθε tool + κίνηση sliders
+    for key in tools:
+        if key == "control_tower":
+            at.session_state["flow_step"] = "control_tower"
+        else:
+            at.session_state["flow_step"] = "tool"
+            at.session_state["selected_tool"] = key
+        _timed_run(at, samples, key, "open", timeout)
+
+        moved = index = 0
+        while moved < max_sliders and index < len(at.slider):
+            slider = at.slider[index]
+            index += 1
+            value = _next_value(slider)
+            if value is None or value == slider.value:
+                continue
+            slider.set_value(value)
+            _timed_run(at, samples, key, "slider", timeout)
+            moved += 1
+    return samples
+
+
+# ------------------------------------------------
+# LEVELS (N concurrent sessions)
+# ------------------------------------------------
+
+def _quantiles(values):
+    arr = np.asarray(values, dtype=np.float64)
+    return {"n": int(arr.size), "p50": float(np.percentile(arr, 50)), "p95": float(np.percentile(arr, 95)),
+            "max": float(arr.max())}
+
+
+def run_level(n_sessions, tools, max_sliders=3, timeout=60):
+    rss_before = current_rss_mb()
+    barrier = threading.Barrier(n_sessions)
+
+    def session(_):
+        barrier.wait()  # όλες οι sessions ξεκινούν μαζί
+        return run_session(tools, max_sliders=max_sliders, timeout=timeout)
+
+    t0 = time.perf_counter()
+    with RSSSampler() as rss, ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        results = list(pool.map(session, range(n_sessions)))
+    wall = time.perf_counter() - t0
+
+    samples = [s for r in results for s in r]
+    per_tool = {}
+    for sample in samples:
+        per_tool.setdefault(sample["tool"], []).append(sample["ms"])
+    return {
+        "sessions": n_sessions,
+        "reruns": len(samples),
+        "errors": sum(s["error"] for s in samples),
+        "wall_s": wall,
+        "reruns_per_s": len(samples) / wall if wall else 0.0,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": rss.peak,
+        "rss_per_session_mb": (rss.peak - rss_before) / n_sessions,
+        "latency_ms": _quantiles([s["ms"] for s in samples]),
+        "service_ms": _quantiles([s["service_ms"] for s in samples]),
+        "per_tool": {tool: _quantiles(ms) for tool, ms in per_tool.items()},
+    }
+
+
+def format_level(level, budget_ms=None):
+    lines = [
+        f"== {level['sessions']} session(s): {level['reruns']} reruns in {level['wall_s']:.1f}s "
+        f"-> {level['reruns_per_s']:.1f} reruns/s | errors {level['errors']} | "
+        f"peak RSS {level['peak_rss_mb']:.0f} MB (+{level['rss_per_session_mb']:.1f} MB/session)",
+        f"rerun latency p50/p95 {level['latency_ms']['p50']:.0f}/{level['latency_ms']['p95']:.0f} ms "
+        f"(service {level['service_ms']['p50']:.0f}/{level['service_ms']['p95']:.0f} ms)",
+        f"{'tool':<22}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}",
+    ]
+    for tool, q in sorted(level["per_tool"].items(), key=lambda kv: kv[1]["p95"], reverse=True):
+        flag = "  OVER BUDGET" if budget_ms and q["p95"] > budget_ms else ""
+        lines.append(f"{tool:<22}{q['n']:>5}{q['p50']:>10.1f}{q['p95']:>10.1f}{q['max']:>10.1f}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_sessions", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", default="1,2,4", help="comma-separated concurrent session counts")
+    parser.add_argument("--tools", help="comma-separated TOOL_MAP keys (default: every valid tool)")
+    parser.add_argument("--max-sliders", type=int, default=3, help="sliders moved per tool")
+    parser.add_argument("--budget-ms", type=float, help="flag tools whose p95 rerun exceeds this")
+    parser.add_argument("--timeout", type=float, default=60, help="AppTest timeout per rerun (s)")
+    parser.add_argument("--json", help="write all levels as JSON")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="measure the cold first session too (imports, first figures)")
+    args = parser.parse_args(argv)
+
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    tools = args.tools.split(",") if args.tools else available_tools(load_tool_map())
+    if not args.no_warmup:
+        run_session(tools, max_sliders=args.max_sliders, timeout=args.timeout)
+    levels = []
+    for n in (int(x) for x in args.sessions.split(",")):
+        level = run_level(n, tools, max_sliders=args.max_sliders, timeout=args.timeout)
+        levels.append(level)
+        print(format_level(level, args.budget_ms))
+        print()
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"tools": tools, "budget_ms": args.budget_ms, "levels": levels}, fh, indent=2)
+    over = {t for lv in levels for t, q in lv["per_tool"].items() if args.budget_ms and q["p95"] > args.budget_ms}
+    if over:
+        print(f"Over the {args.budget_ms:.0f} ms p95 budget: {', '.join(sorted(over))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
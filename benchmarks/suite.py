@@ -0,0 +1,332 @@
+"""
+Benchmark suite with stored baselines and a regression gate.
+
+    python -m benchmarks.suite run --out benchmarks/results/baseline.json
+    python -m benchmarks.suite compare benchmarks/results/baseline.json --threshold 0.25
+    python -m benchmarks.suite run --filter engine --quick
+
+Every case is timed at a scalar size (one call) and at a batch size (one
+vectorized call where the kernel has one, otherwise a loop over varied
+inputs). `compare` re-runs the suite (or loads --current) and exits 1 when
+any case's median time per call grew by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_engine_batch import make_baselines
+from benchmarks.bench_monte_carlo import DEFAULT_BASELINE
+
+DEFAULT_THRESHOLD = 0.25   # +25% στο median = regression
+MIN_TIME = 0.05            # δευτερόλεπτα ανά μέτρηση (autorange)
+REPEAT = 5
+
+
+# ------------------------------------------------
+# CASES: name -> (rows, setup() -> callable)
+# ------------------------------------------------
+
+def _engine_scalar():
+    from core.engine import calculate_metrics
+    return lambda: calculate_metrics(**DEFAULT_BASELINE)
+
+
+def _engine_batch(rows):
+    def setup():
+        from core.engine import calculate_metrics_batch
+        cols = make_baselines(rows)
+        return lambda: calculate_metrics_batch(**cols)
+    return setup
+
+
+def _sync_scalar():
+    from core.sync import calculate_metrics
+    args = [DEFAULT_BASELINE[k] for k in ("price", "volume", "variable_cost", "fixed_cost", "ar_days",
+                                          "inv_days", "ap_days", "annual_debt_service", "opening_cash")]
+    return lambda: calculate_metrics(*args, target_profit=DEFAULT_BASELINE["target_profit"])
+
+
+def _sync_batch(rows):
+    def setup():
+        from core.sync import calculate_metrics
+        cols = make_baselines(rows)
+        names = ("price", "volume", "variable_cost", "fixed_cost", "ar_days",
+                 "inv_days", "ap_days", "annual_debt_service", "opening_cash")
+        calls = [[float(cols[n][i]) for n in names] for i in range(rows)]
+        return lambda: [calculate_metrics(*args) for args in calls]
+    return setup
+
+
+def _receivables_inputs(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    return [
+        (1_500_000.0, float(rng.uniform(0, 300_000)), float(rng.uniform(0.005, 0.05)),
+         float(rng.uniform(0.1, 0.9)), 60.0, 75.0, float(rng.integers(5, 30)),
+         1_000_000.0, float(rng.uniform(0.05, 0.25)), 30.0)
+        for _ in range(rows)
+    ]
+
+
+def _receivables(rows):
+    def setup():
+        from core.tools.receivables_npv import calculate_discount_npv
+        calls = _receivables_inputs(rows)
+        if rows == 1:
+            args = calls[0]
+            return lambda: calculate_discount_npv(*args)
+        return lambda: [calculate_discount_npv(*args) for args in calls]
+    return setup
+
+
+def _receivables_batch(rows):
+    def setup():
+        from core.compute.receivables import calculate_discount_npv_batch
+        cols = [np.array(col) for col in zip(*_receivables_inputs(rows))]
+        return lambda: calculate_discount_npv_batch(*cols)
+    return setup
+
+
+def _receivables_decimal():
+    from core.compute.receivables import calculate_discount_npv_decimal
+    args = _receivables_inputs(1)[0]
+    return lambda: calculate_discount_npv_decimal(*args)
+
+
+def _clv(rows):
+    def setup():
+        from core.tools.clv_calculator import get_clv_data
+        rng = np.random.default_rng(11)
+        calls = [(4.0, float(rng.uniform(20, 80)), 10, 10.0, float(rng.uniform(5, 40)), 0.95, 2.0,
+                  float(rng.uniform(50, 300))) for _ in range(rows)]
+        if rows == 1:
+            args = calls[0]
+            return lambda: get_clv_data(*args)
+        return lambda: [get_clv_data(*args) for args in calls]
+    return setup
+
+
+def _clv_batch(rows):
+    def setup():
+        from core.compute.clv import clv_batch
+        rng = np.random.default_rng(11)
+        args = (4.0, rng.uniform(20, 80, rows), 10, 10.0, rng.uniform(5, 40, rows), 0.95, 2.0,
+                rng.uniform(50, 300, rows))
+        return lambda: clv_batch(*args)
+    return setup
+
+
+def _leasing(rows):
+    def setup():
+        from core.tools.loan_vs_leasing import calculate_final_burden
+        rng = np.random.default_rng(13)
+        calls = [(float(rng.uniform(0.03, 0.09)), float(rng.uniform(0.05, 0.12)), 15, 250_000.0,
+                  0.7, 1.0, 35_000.0, 30_000.0, 3_530.0, 30, 0.29, int(rng.integers(0, 2)))
+                 for _ in range(rows)]
+        if rows == 1:
+            args = calls[0]
+            return lambda: calculate_final_burden(*args)
+        return lambda: [calculate_final_burden(*args) for args in calls]
+    return setup
+
+
+def _pdf(rows):
+    def setup():
+        from core.engine import calculate_metrics
+        from core.pdf_report import generate_professional_pdf
+        metrics = calculate_metrics(**DEFAULT_BASELINE)
+        if rows == 1:
+            return lambda: generate_professional_pdf(metrics, "Benchmark Scenario")
+        return lambda: [generate_professional_pdf(metrics, f"Scenario {i}") for i in range(rows)]
+    return setup
+
+
+def _figure(cached):
+    def setup():
+        from core.figures import cached_figure
+        from core.tools.control_tower import _break_even_figure
+        args = (150.0, 90.0, 450_000.0, 15_000.0)
+        if cached:
+            return lambda: cached_figure("bench:break_even", _break_even_figure, *args)
+        return lambda: _break_even_figure(*args)
+    return setup
+
+
+CASES = {
+    "engine.calculate_metrics[1]": (1, _engine_scalar),
+    "engine.calculate_metrics_batch[10k]": (10_000, _engine_batch(10_000)),
+    "engine.calculate_metrics_batch[1M]": (1_000_000, _engine_batch(1_000_000)),
+    "sync.calculate_metrics[1]": (1, _sync_scalar),
+    "sync.calculate_metrics[1k]": (1_000, _sync_batch(1_000)),
+    "receivables_npv.calculate_discount_npv[1]": (1, _receivables(1)),
+    "receivables_npv.calculate_discount_npv[1k]": (1_000, _receivables(1_000)),
+    "receivables.calculate_discount_npv_batch[100k]": (100_000, _receivables_batch(100_000)),
+    "receivables.calculate_discount_npv_decimal[1]": (1, _receivables_decimal),
+    "clv_calculator.get_clv_data[1]": (1, _clv(1)),
+    "clv_calculator.get_clv_data[1k]": (1_000, _clv(1_000)),
+    "clv.clv_batch[100k]": (100_000, _clv_batch(100_000)),
+    "loan_vs_leasing.calculate_final_burden[1]": (1, _leasing(1)),
+    "loan_vs_leasing.calculate_final_burden[1k]": (1_000, _leasing(1_000)),
+    "pdf_report.generate_professional_pdf[1]": (1, _pdf(1)),
+    "pdf_report.generate_professional_pdf[20]": (20, _pdf(20)),
+    "control_tower.break_even_figure[build]": (1, _figure(False)),
+    "control_tower.break_even_figure[cached]": (1, _figure(True)),
+}
+
+# Για γρήγορο έλεγχο (CI / pre-commit): χωρίς τις μεγάλες batch περιπτώσεις
+QUICK_SKIP = ("engine.calculate_metrics_batch[1M]",)
+
+
+# ------------------------------------------------
+# TIMING
+# ------------------------------------------------
+
+def _autorange(func, min_time):
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1_000_000:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def time_case(func, repeat=REPEAT, min_time=MIN_TIME):
+    """Best / median seconds per call over `repeat` autoranged measurements."""
+    func()  # warm-up (imports, caches, first-call allocations)
+    number = _autorange(func, min_time)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - t0) / number)
+    return {"best_s": min(samples), "median_s": statistics.median(samples), "loops": number, "repeat": repeat}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names=None, repeat=REPEAT, min_time=MIN_TIME, progress=True):
+    results = {}
+    for name in names or CASES:
+        rows, setup = CASES[name]
+        timing = time_case(setup(), repeat=repeat, min_time=min_time)
+        timing["rows"] = rows
+        timing["per_row_us"] = timing["median_s"] / rows * 1e6
+        results[name] = timing
+        if progress:
+            print(f"{name:<48}{timing['median_s'] * 1e3:>11.3f} ms/call"
+                  f"{timing['per_row_us']:>12.2f} us/row", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, names=None):
+    """Rows of (case, baseline s, current s, ratio, status); status is ok / REGRESSION / new / missing / absent."""
+    rows = []
+    base, cur = baseline["results"], current["results"]
+    for name in sorted((set(base) | set(cur)) if names is None else set(names)):
+        if name not in cur and name not in base:
+            rows.append((name, None, None, None, "absent"))     # π.χ. case του --filter που δεν μετρήθηκε ποτέ
+        elif name not in cur:
+            rows.append((name, base[name]["median_s"], None, None, "missing"))
+        elif name not in base:
+            rows.append((name, None, cur[name]["median_s"], None, "new"))
+        else:
+            ratio = cur[name]["median_s"] / base[name]["median_s"]
+            rows.append((name, base[name]["median_s"], cur[name]["median_s"], ratio,
+                         "REGRESSION" if ratio > 1 + threshold else "ok"))
+    return rows
+
+
+def _cell(value, width, scale=1.0, digits=3):
+    return f"{value * scale:>{width}.{digits}f}" if value is not None else "-".rjust(width)
+
+
+def format_comparison(rows, threshold):
+    lines = [f"{'case':<48}{'baseline ms':>13}{'current ms':>13}{'ratio':>8}  status (threshold +{threshold:.0%})"]
+    for name, b, c, ratio, status in rows:
+        lines.append(f"{name:<48}{_cell(b, 13, 1e3)}{_cell(c, 13, 1e3)}{_cell(ratio, 8, digits=2)}  {status}")
+    return "\n".join(lines)
+
+
+def _select(args):
+    names = [n for n in CASES if not args.filter or any(f in n for f in args.filter)]
+    if args.quick:
+        names = [n for n in names if n not in QUICK_SKIP]
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for cmd in ("run", "compare"):
+        p = sub.add_parser(cmd)
+        p.add_argument("--filter", action="append", help="only cases containing this text (repeatable)")
+        p.add_argument("--quick", action="store_true", help="skip the largest batch sizes")
+        p.add_argument("--repeat", type=int, default=REPEAT)
+        p.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds per measurement")
+    sub.choices["run"].add_argument("--out", help="write results JSON here")
+    sub.choices["compare"].add_argument("baseline", help="stored results JSON")
+    sub.choices["compare"].add_argument("--current", help="compare this results JSON instead of re-running")
+    sub.choices["compare"].add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                        help="allowed slowdown of the median, e.g. 0.25 = +25%%")
+    sub.choices["compare"].add_argument("--out", help="also write the fresh results JSON here")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_suite(_select(args), repeat=args.repeat, min_time=args.min_time)
+        if args.out:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            with open(args.out, "w") as fh:
+                json.dump(results, fh, indent=2)
+        return 0
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    selected = _select(args) if (args.filter or args.quick) else None
+    if args.current:
+        with open(args.current) as fh:
+            current = json.load(fh)
+    else:
+        names = [n for n in _select(args) if n in baseline["results"]] or _select(args)
+        current = run_suite(names, repeat=args.repeat, min_time=args.min_time)
+        if args.out:
+            with open(args.out, "w") as fh:
+                json.dump(current, fh, indent=2)
+    rows = compare(baseline, current, args.threshold, names=selected)
+    print(format_comparison(rows, args.threshold))
+    regressions = [r[0] for r in rows if r[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
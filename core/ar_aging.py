@@ -0,0 +1,333 @@
+"""
+Streaming AR aging and DSO for large open-item / receivables files.
+
+Reads CSV / Parquet chunk by chunk, or a fixed-width export through a
+memory map, and folds every row into per-day arrays (invoiced amount,
+AR balance changes, open amount / count by invoice day). Memory depends on
+the date span of the file, never on its row count.
+
+    python -m core.ar_aging receivables.csv --as-of 2025-12-31
+    python -m core.ar_aging ar.txt --fixed-width invoice_date:0:8,amount:8:22,paid_date:22:30
+    python -m core.ar_aging ar.parquet --window 90 --json aging.json
+
+Columns: invoice_date, amount, and optionally paid_date (empty = still open;
+needed for the balance DSO history). Fixed-width fields: dates as YYYYMMDD,
+amount as plain decimal text, records newline-terminated (the last one may
+omit it), all the same length; invalid dates there (blank, 20250231, ...)
+count as skipped rows. CSV / Parquet dates use --date-format or one format
+guessed from the first rows; a date that does not match it is an error.
+
+Results:
+    buckets        open amount / count by invoice age (0-30, 31-60, ...)
+    dso_count      average age of the open items
+    dso_amount     amount-weighted average age of the open items
+    dso_balance    AR balance / sales of the last `window` days x window
+                   (the collection period the engine's ar_days stands for)
+    trend          month-end balance DSO over the file's history
+"""
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+
+import numpy as np
+
+from core.stream_io import (
+    DEFAULT_CHUNKSIZE, day_numbers, guess_date_format, iter_chunks, parse_rename, peak_rss_mb,
+)
+
+DEFAULT_EDGES = (30, 60, 90, 120)
+DEFAULT_WINDOW = 90            # ημέρες πωλήσεων για το balance DSO
+FIXED_WIDTH_CHUNK = 1_000_000  # records ανά πέρασμα στο memmap
+AGING_COLUMNS = ("invoice_date", "paid_date", "amount")
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+
+def _iso(day):
+    return str(_EPOCH_DAY + np.timedelta64(int(day), "D"))
+
+
+# ------------------------------------------------
+# READERS -> (invoice_day, paid_day, amount) arrays
+# ------------------------------------------------
+
+def iter_table(path, chunksize=DEFAULT_CHUNKSIZE, rename=None, date_format=None):
+    """
+    CSV / Parquet in chunks; dates as day numbers (NaN = missing), all in
+    date_format or the one format guessed from the first dated rows.
+    """
+    for frame in iter_chunks(path, chunksize):
+        if rename:
+            frame = frame.rename(columns=rename)
+        if date_format is None:
+            date_format = guess_date_format(*[frame[c] for c in ("invoice_date", "paid_date")
+                                              if c in frame.columns])
+        paid = (day_numbers(frame["paid_date"], date_format, "paid_date") if "paid_date" in frame.columns
+                else np.full(len(frame), np.nan))
+        yield (day_numbers(frame["invoice_date"], date_format, "invoice_date"), paid,
+               frame["amount"].to_numpy(dtype=np.float64))
+
+
+def parse_layout(spec):
+    """'invoice_date:0:8,amount:8:22' -> {name: (start, end)}."""
+    layout = {}
+    for part in spec.split(","):
+        name, start, end = part.strip().split(":")
+        layout[name] = (int(start), int(end))
+    missing = {"invoice_date", "amount"} - set(layout)
+    if missing:
+        raise ValueError(f"Fixed-width layout needs {sorted(missing)}")
+    return layout
+
+
+def _yyyymmdd(field):
+    # uint8 (rows, 8) ψηφία -> day numbers, NaN για κενά / άκυρα
+    digits = field.astype(np.int64) - 48
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    value = digits @ (10 ** np.arange(field.shape[1] - 1, -1, -1))
+    year, month, day = value // 10000, (value // 100) % 100, value % 100
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0)
+    first = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    days = first + day - 1
+    # 20250231 κ.λπ.: η ημέρα πρέπει να μένει μέσα στον ίδιο μήνα
+    valid &= days < (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    return np.where(valid, days, np.nan)
+
+
+def _decimal(field):
+    text = np.ascontiguousarray(field).view(f"S{field.shape[1]}").ravel().copy()
+    text[(field == 32).all(axis=1)] = b"0"
+    return text.astype(np.float64)
+
+
+def _fixed_width_fields(block, layout):
+    inv = _yyyymmdd(block[:, slice(*layout["invoice_date"])])
+    paid = (_yyyymmdd(block[:, slice(*layout["paid_date"])]) if "paid_date" in layout
+            else np.full(len(block), np.nan))
+    return inv, paid, _decimal(block[:, slice(*layout["amount"])])
+
+
+def iter_fixed_width(path, layout, chunk_rows=FIXED_WIDTH_CHUNK):
+    """
+    Fixed-width records through np.memmap, one chunk of rows at a time. Pages
+    already parsed are dropped from the mapping (MADV_DONTNEED), so resident
+    memory stays at about one chunk however large the file is.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    newline = np.flatnonzero(data[:4096] == 10)
+    if not newline.size:
+        raise ValueError("Fixed-width file: no newline in the first 4 KB")
+    record = int(newline[0]) + 1
+    n, tail = divmod(data.size, record)
+    if tail and tail != record - 1:
+        raise ValueError(f"Fixed-width file: {data.size} bytes is not a whole number of {record}-byte records")
+    rows = data[:n * record].reshape(n, record)
+    raw = getattr(data, "_mmap", None)
+    release = raw is not None and hasattr(raw, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+    done = 0
+    for lo in range(0, n, chunk_rows):
+        block = rows[lo:lo + chunk_rows]
+        yield _fixed_width_fields(block, layout)
+        if release:
+            end = (lo + len(block)) * record // mmap.PAGESIZE * mmap.PAGESIZE
+            if end > done:
+                raw.madvise(mmap.MADV_DONTNEED, done, end - done)
+                done = end
+    if tail:
+        # τελευταία εγγραφή χωρίς newline στο τέλος του αρχείου
+        last = np.full((1, record), 10, dtype=np.uint8)
+        last[0, :tail] = data[n * record:]
+        yield _fixed_width_fields(last, layout)
+
+
+# ------------------------------------------------
+# ACCUMULATOR
+# ------------------------------------------------
+
+class AgingAccumulator:
+    """
+    Per-day running sums from the first to the last date seen. With an
+    explicit as_of, items paid after it still count as open at as_of.
+    """
+
+    _ARRAYS = ("sales", "ar_delta", "open_amount", "open_count")
+
+    def __init__(self, as_of=None):
+        self.as_of = as_of
+        self.origin = None
+        self.days = {name: np.zeros(0) for name in self._ARRAYS}
+        self.rows = 0
+        self.skipped = 0
+        self.has_paid = False
+        self.last_day = -np.inf
+
+    def _span(self, lo, hi):
+        # Μεγαλώνει τα per-day arrays ώστε να καλύπτουν [lo, hi]
+        if self.origin is None:
+            self.origin = lo
+        end = self.origin + self.days["sales"].size - 1
+        left, right = max(self.origin - lo, 0), max(hi - end, 0)
+        if left or right:
+            for name in self._ARRAYS:
+                self.days[name] = np.pad(self.days[name], (left, right))
+            self.origin -= left
+
+    def update(self, inv, paid, amount):
+        self.rows += inv.size
+        ok = np.isfinite(inv) & np.isfinite(amount)
+        self.skipped += int(inv.size - ok.sum())
+        inv, paid, amount = inv[ok].astype(np.int64), paid[ok], amount[ok]
+        if not inv.size:
+            return
+        has_paid = np.isfinite(paid)
+        self.has_paid |= bool(has_paid.any())
+        paid_days = paid[has_paid].astype(np.int64)
+
+        lo = int(min(inv.min(), paid_days.min() if paid_days.size else inv.min()))
+        hi = int(max(inv.max(), paid_days.max() if paid_days.size else inv.max()))
+        self.last_day = max(self.last_day, hi)
+        self._span(lo, hi)
+        size = self.days["sales"].size
+        i = inv - self.origin
+
+        self.days["sales"] += np.bincount(i, weights=amount, minlength=size)
+        self.days["ar_delta"] += np.bincount(i, weights=amount, minlength=size)
+        if paid_days.size:
+            self.days["ar_delta"] -= np.bincount(paid_days - self.origin, weights=amount[has_paid], minlength=size)
+
+        still_open = ~has_paid
+        if self.as_of is not None:
+            still_open |= has_paid & (np.nan_to_num(paid, nan=-np.inf) > self.as_of)
+        self.days["open_amount"] += np.bincount(i[still_open], weights=amount[still_open], minlength=size)
+        self.days["open_count"] += np.bincount(i[still_open], minlength=size)
+
+    def result(self, edges=DEFAULT_EDGES, window=DEFAULT_WINDOW):
+        if self.origin is None:
+            raise ValueError("No valid rows (invoice_date / amount) in the file")
+        as_of = int(self.as_of if self.as_of is not None else self.last_day)
+        day = np.arange(self.days["sales"].size) + self.origin
+        upto = day <= as_of
+        age = (as_of - day)[upto].astype(np.float64)
+        amt, cnt = self.days["open_amount"][upto], self.days["open_count"][upto]
+
+        bucket = np.searchsorted(np.asarray(edges), age, side="left")
+        labels = [f"{lo}-{hi}" for lo, hi in zip((0,) + tuple(e + 1 for e in edges[:-1]), edges)] + [f"{edges[-1] + 1}+"]
+        b_amt = np.bincount(bucket, weights=amt, minlength=len(labels))
+        b_cnt = np.bincount(bucket, weights=cnt, minlength=len(labels))
+
+        total_amt, total_cnt = float(amt.sum()), float(cnt.sum())
+        balance, trend = self._balance_dso(day, as_of, window)
+        return {
+            "as_of": _iso(as_of),
+            "rows": self.rows,
+            "skipped_rows": self.skipped,
+            "open_items": int(total_cnt),
+            "open_amount": total_amt,
+            "dso_count": float((cnt * age).sum() / total_cnt) if total_cnt else 0.0,
+            "dso_amount": float((amt * age).sum() / total_amt) if total_amt else 0.0,
+            "dso_balance": balance,
+            "window_days": window,
+            "buckets": [
+                {"bucket": label, "amount": float(a), "count": int(c), "share": float(a / total_amt) if total_amt else 0.0}
+                for label, a, c in zip(labels, b_amt, b_cnt)
+            ],
+            "trend": trend,
+            "first_day": _iso(self.origin),
+        }
+
+    def _balance_dso(self, day, as_of, window):
+        # AR υπόλοιπο(t) / πωλήσεις τελευταίων `window` ημερών x window
+        if not self.has_paid:
+            return None, []
+        balance = np.cumsum(self.days["ar_delta"])
+        csum = np.concatenate(([0.0], np.cumsum(self.days["sales"])))
+        idx = np.arange(day.size)
+        sales_w = csum[idx + 1] - csum[np.maximum(idx + 1 - window, 0)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dso = np.where(sales_w > 0, balance / sales_w * window, np.nan)
+
+        at = min(max(as_of - self.origin, 0), day.size - 1)
+        months = day.astype("datetime64[D]").astype("datetime64[M]")
+        month_end = np.flatnonzero(np.append(months[1:] != months[:-1], True))
+        month_end = month_end[(month_end >= window - 1) & (day[month_end] <= as_of)]  # πλήρες παράθυρο
+        trend = [{"date": _iso(day[k]), "ar_balance": float(balance[k]), "dso": float(dso[k])}
+                 for k in month_end if np.isfinite(dso[k])]
+        return (float(dso[at]) if np.isfinite(dso[at]) else None), trend
+
+
+def compute_aging(path, as_of=None, edges=DEFAULT_EDGES, window=DEFAULT_WINDOW, chunksize=DEFAULT_CHUNKSIZE,
+                  fixed_width=None, rename=None, date_format=None, progress=False, stream=sys.stderr):
+    """One streaming pass over `path` -> aging / DSO result dict (plus seconds, rows/s, peak RSS)."""
+    as_of_day = None
+    if as_of is not None:
+        as_of_day = int((np.datetime64(as_of, "D") - _EPOCH_DAY).astype(np.int64))
+    acc = AgingAccumulator(as_of=as_of_day)
+    chunks = (iter_fixed_width(path, parse_layout(fixed_width) if isinstance(fixed_width, str) else fixed_width)
+              if fixed_width else iter_table(path, chunksize, rename=rename, date_format=date_format))
+    t0 = time.perf_counter()
+    for inv, paid, amount in chunks:
+        acc.update(inv, paid, amount)
+        if progress:
+            elapsed = time.perf_counter() - t0
+            stream.write(f"\r{acc.rows:>12,} rows | {acc.rows / elapsed if elapsed else 0:>12,.0f} rows/s | "
+                         f"peak RSS {peak_rss_mb():,.0f} MB")
+            stream.flush()
+    if progress:
+        stream.write("\n")
+    out = acc.result(edges=tuple(edges), window=window)
+    out["seconds"] = time.perf_counter() - t0
+    out["rows_per_s"] = acc.rows / out["seconds"] if out["seconds"] else 0.0
+    out["peak_rss_mb"] = peak_rss_mb()
+    out["source"] = os.path.basename(path)
+    return out
+
+
+def format_aging(result):
+    lines = [f"AR aging as of {result['as_of']} | {result['open_items']:,} open items | "
+             f"${result['open_amount']:,.0f} open",
+             f"{'bucket':<10}{'amount':>18}{'count':>12}{'share':>8}"]
+    for b in result["buckets"]:
+        lines.append(f"{b['bucket']:<10}{b['amount']:>18,.0f}{b['count']:>12,}{b['share']:>8.1%}")
+    balance = f"{result['dso_balance']:.1f}" if result["dso_balance"] is not None else "n/a (no paid_date)"
+    lines.append(f"DSO count-weighted {result['dso_count']:.1f} | amount-weighted {result['dso_amount']:.1f} | "
+                 f"balance ({result['window_days']}d sales) {balance}")
+    if result["trend"]:
+        lines.append("month-end balance DSO: " + "  ".join(f"{t['date'][:7]} {t['dso']:.0f}" for t in result["trend"][-12:]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.ar_aging", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV / Parquet, or a fixed-width text file with --fixed-width")
+    parser.add_argument("--as-of", help="YYYY-MM-DD (default: last invoice / payment date in the file)")
+    parser.add_argument("--edges", default=",".join(map(str, DEFAULT_EDGES)), help="bucket upper bounds in days")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="sales days for the balance DSO")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--fixed-width", metavar="LAYOUT", help="name:start:end,... (invoice_date, amount, paid_date)")
+    parser.add_argument("--rename", nargs="*", metavar="SRC:COL", help="map headers to invoice_date / paid_date / amount")
+    parser.add_argument("--date-format", help="strftime format of the date columns (default: guessed from the first rows)")
+    parser.add_argument("--json", help="write the full result here")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = compute_aging(
+        args.path, as_of=args.as_of, edges=[int(e) for e in args.edges.split(",")], window=args.window,
+        chunksize=args.chunksize, fixed_width=args.fixed_width,
+        rename=parse_rename(args.rename, AGING_COLUMNS), date_format=args.date_format,
+        progress=not args.quiet,
+    )
+    print(format_aging(result))
+    print(f"{result['rows']:,} rows in {result['seconds']:.1f}s ({result['rows_per_s']:,.0f} rows/s), "
+          f"peak RSS {result['peak_rss_mb']:,.0f} MB", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(result, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Headless batch scoring: streams baselines from CSV / Parquet through the
+vectorized engine and writes the metric columns back out, chunk by chunk.
+
+    python -m core.batch_cli plan.csv scored.csv --chunksize 200000
+    python -m core.batch_cli plan.parquet scored.parquet --metrics roic,net_cash_position
+
+Input columns use the engine input names (price, volume, variable_cost, ...);
+use --rename to map other headers. Parquet needs pyarrow.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from core.engine import ENGINE_INPUTS, ENGINE_DEFAULTS, calculate_metrics_batch, calculate_metrics_frame
+from core.stream_io import DEFAULT_CHUNKSIZE, ChunkWriter, iter_chunks, parse_rename, peak_rss_mb
+
+
+def score_chunk(frame, rename=None, metrics=None, keep_inputs=True):
+    """One DataFrame chunk -> inputs (optional) + engine metric columns."""
+    import pandas as pd
+    if rename:
+        frame = frame.rename(columns=rename)
+    missing = [n for n in ENGINE_INPUTS if n not in frame.columns and n not in ENGINE_DEFAULTS]
+    if missing:
+        raise KeyError(f"Missing required input columns: {missing}")
+    # int σε ένα chunk, float στο επόμενο -> ίδιο schema σε κάθε chunk της εξόδου
+    frame = frame.astype({n: np.float64 for n in ENGINE_INPUTS if n in frame.columns})
+    out = calculate_metrics_frame(frame)
+    keys = list(metrics) if metrics else list(out)
+    # tax_rate / annual_interest / total_debt επιστρέφονται ήδη ως inputs
+    metric_cols = {k: out[k] for k in keys if not (keep_inputs and k in frame.columns)}
+    result = pd.DataFrame(metric_cols, index=frame.index)
+    return pd.concat([frame, result], axis=1) if keep_inputs else result
+
+
+def run_batch(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, rename=None,
+              metrics=None, keep_inputs=True, progress=True, stream=sys.stderr):
+    """Scores the whole file with bounded memory; returns a throughput report."""
+    if metrics:
+        known = calculate_metrics_batch(*[0.0] * 9)
+        unknown = [m for m in metrics if m not in known]
+        if unknown:
+            raise SystemExit(f"Unknown metric columns: {unknown}. Available: {', '.join(known)}")
+    writer = ChunkWriter(output_path)
+    rows = chunks = 0
+    t0 = time.perf_counter()
+    try:
+        for frame in iter_chunks(input_path, chunksize):
+            writer.write(score_chunk(frame, rename=rename, metrics=metrics, keep_inputs=keep_inputs))
+            rows += len(frame)
+            chunks += 1
+            if progress:
+                elapsed = time.perf_counter() - t0
+                stream.write(f"\rchunk {chunks:>5} | {rows:>12,} rows | "
+                             f"{rows / elapsed if elapsed else 0:>12,.0f} rows/s | "
+                             f"peak RSS {peak_rss_mb():,.0f} MB")
+                stream.flush()
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - t0
+    if progress:
+        stream.write("\n")
+    return {
+        "input": input_path,
+        "output": output_path,
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "rows_per_s": rows / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.batch_cli",
+                                     description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or Parquet file with one baseline per row")
+    parser.add_argument("output", help="CSV or Parquet file to write (format by extension)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--metrics", help="comma-separated metric columns (default: all)")
+    parser.add_argument("--rename", nargs="*", metavar="SRC:INPUT", help="map input headers to engine inputs")
+    parser.add_argument("--metrics-only", action="store_true", help="do not copy input columns to the output")
+    parser.add_argument("--report", help="write the throughput report as JSON to this path")
+    parser.add_argument("--quiet", action="store_true", help="no progress line")
+    args = parser.parse_args(argv)
+
+    report = run_batch(
+        args.input, args.output,
+        chunksize=args.chunksize,
+        rename=parse_rename(args.rename, ENGINE_INPUTS),
+        metrics=[m.strip() for m in args.metrics.split(",")] if args.metrics else None,
+        keep_inputs=not args.metrics_only,
+        progress=not args.quiet,
+    )
+    summary = (f"Scored {report['rows']:,} rows in {report['seconds']:.2f}s "
+               f"({report['rows_per_s']:,.0f} rows/s, {report['chunks']} chunks, "
+               f"peak RSS {report['peak_rss_mb']:,.0f} MB) -> {report['output']}")
+    print(summary, file=sys.stderr)
+    if args.report:
+        with open(args.report, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+Customer Lifetime Value calibrated on a raw order-line log.
+
+Streams the log (CSV or Parquet) chunk by chunk into per-customer arrays
+(first / last purchase day, orders, lines, revenue, units), then groups the
+customers into acquisition cohorts and derives, per cohort, the inputs the
+CLV tool otherwise takes as guesses - purchases / year, units and revenue
+per order, annual churn - and values every cohort in one clv_batch call.
+Memory grows with the number of customers (~60 bytes each), never with the
+number of order lines.
+
+    python -m core.clv_transactions orders.csv --margin-rate 0.35 --cac 150
+    python -m core.clv_transactions orders.parquet --cohort quarter --rename cust:customer_id date:order_date
+
+Columns (use --rename to map other headers):
+    customer_id                   any label / number
+    order_date                    date of the order line (one format: --date-format or guessed)
+    amount                        line revenue
+    order_id    (optional)        lines sharing it form one order (default: one order per customer-day)
+    quantity    (optional)        units on the line
+
+Orders split across chunk boundaries are merged when the log is in date
+(or order-id) order, as exports usually are.
+
+Churn and purchase rate per cohort: orders arrive as a Poisson process
+(purchases_per_year) while the customer is alive, lifetimes are exponential
+(annual churn = 1 - exp(-mu)); both are fitted by EM on first / last order,
+repeat orders and time to as_of, so customers gone quiet only count as
+churned in proportion to how unlikely their silence is. The expected
+lifetimes by tenure year give the time-varying churn_path for the "all" row.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from core.stream_io import (
+    DEFAULT_CHUNKSIZE, day_numbers, guess_date_format, iter_chunks, parse_rename, peak_rss_mb,
+)
+from core.compute.clv import clv_batch
+
+DEFAULT_COHORT = "year"
+LOG_COLUMNS = ("customer_id", "order_date", "amount", "order_id", "quantity")
+EM_MAX_ITER = 500
+EM_TOL = 1e-8
+EM_BLOCK = 1 << 20         # πελάτες ανά μπλοκ στο E-step (φράσσει τα προσωρινά arrays)
+MAX_ORDERS = 50           # ιστόγραμμα παραγγελιών ανά πελάτη: 1..50, 50 = 50+
+COHORT_UNITS = {"year": "Y", "quarter": "M", "month": "M"}
+CLV_DEFAULTS = {          # όπως τα defaults του CLV tool
+    "discount": 15.0,
+    "risk_p": 3.0,
+    "realization": 0.90,
+    "cac": 150.0,
+    "horizon": 5,
+    "margin_rate": 0.30,  # contribution / revenue όταν δεν δίνεται unit contribution
+}
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+_NO_KEY = np.iinfo(np.int64).min
+
+
+def _keys(column):
+    # Ετικέτες -> int64 ανεξάρτητα από το dtype του chunk (ένα κενό id κάνει
+    # τη στήλη float, ένα "A12" object): ακέραιες τιμές - 123, 123.0, "123" -
+    # ως έχουν, οτιδήποτε άλλο μέσω 64-bit hash του κειμένου
+    values = column.to_numpy()
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+    import pandas as pd
+    text = None
+    if values.dtype.kind == "f":
+        numbers = values.astype(np.float64)
+    else:
+        text = column.astype(str).str.strip()
+        numbers = np.full(values.size, np.nan)
+        # to_numeric μόνο σε ό,τι μοιάζει με αριθμό (πολύ αργό σε ετικέτες σαν "C271")
+        numeric = text.str[:1].isin(tuple("+-0123456789")).to_numpy()
+        if numeric.any():
+            numbers[numeric] = pd.to_numeric(text[numeric], errors="coerce").to_numpy(dtype=np.float64)
+    integral = np.isfinite(numbers) & (numbers == np.round(numbers)) & (np.abs(numbers) < 2.0 ** 63)
+    keys = np.empty(values.size, dtype=np.int64)
+    keys[integral] = numbers[integral].astype(np.int64)
+    if not integral.all():
+        text = column.astype(str).str.strip() if text is None else text
+        keys[~integral] = pd.util.hash_pandas_object(text[~integral], index=False).to_numpy().view(np.int64)
+    return keys
+
+
+def iter_order_lines(path, chunksize=DEFAULT_CHUNKSIZE, rename=None, date_format=None):
+    """
+    (customer_key, day, amount, order_key or None, units or None) arrays per
+    chunk; order dates all in date_format or the one guessed from the first rows.
+    """
+    for frame in iter_chunks(path, chunksize):
+        if rename:
+            frame = frame.rename(columns=rename)
+        if date_format is None:
+            date_format = guess_date_format(frame["order_date"])
+        valid = frame["customer_id"].notna().to_numpy()
+        if not valid.all():
+            frame = frame[valid]
+        yield (
+            _keys(frame["customer_id"]),
+            day_numbers(frame["order_date"], date_format, "order_date"),
+            frame["amount"].to_numpy(dtype=np.float64),
+            _keys(frame["order_id"]) if "order_id" in frame.columns else None,
+            frame["quantity"].to_numpy(dtype=np.float64) if "quantity" in frame.columns else None,
+        )
+
+
+class CustomerAccumulator:
+    """
+    One row per customer in growable NumPy arrays; customer keys map to rows
+    through a sorted key array (searchsorted), not a dict. With an explicit
+    as_of, lines dated after it are left out (counted in after_as_of).
+    """
+
+    _FIELDS = {
+        "first_day": (np.int32, np.iinfo(np.int32).max),
+        "last_day": (np.int32, np.iinfo(np.int32).min),
+        "last_key": (np.int64, _NO_KEY),
+        "orders": (np.int32, 0),
+        "lines": (np.int32, 0),
+        "revenue": (np.float64, 0.0),
+        "units": (np.float64, 0.0),
+    }
+
+    def __init__(self, as_of=None):
+        self.as_of = as_of
+        self.n = 0
+        self.cols = {name: np.full(0, fill, dtype=dtype) for name, (dtype, fill) in self._FIELDS.items()}
+        self._keys = np.zeros(0, dtype=np.int64)   # ταξινομημένα
+        self._rows = np.zeros(0, dtype=np.int64)   # γραμμή για κάθε key
+        self.rows = 0
+        self.skipped = 0
+        self.after_as_of = 0
+        self.has_units = False
+        self.has_order_id = False
+
+    def _grow(self, n):
+        cap = self.cols["orders"].size
+        if n <= cap:
+            return
+        new_cap = max(n, cap + cap // 2, 1024)
+        for name, (dtype, fill) in self._FIELDS.items():
+            grown = np.full(new_cap, fill, dtype=dtype)
+            grown[:cap] = self.cols[name]
+            self.cols[name] = grown
+
+    def _rows_for(self, keys):
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        pos = np.searchsorted(self._keys, uniq)
+        known = pos < self._keys.size
+        known[known] = self._keys[pos[known]] == uniq[known]
+        new = uniq[~known]
+        if new.size:
+            at = np.searchsorted(self._keys, new)
+            self._keys = np.insert(self._keys, at, new)
+            self._rows = np.insert(self._rows, at, np.arange(self.n, self.n + new.size))
+            self.n += new.size
+            self._grow(self.n)
+            pos = np.searchsorted(self._keys, uniq)
+        return self._rows[pos][inverse]
+
+    def update(self, customers, day, amount, order_key=None, units=None):
+        self.rows += customers.size
+        ok = np.isfinite(day) & np.isfinite(amount)
+        self.skipped += int(customers.size - ok.sum())
+        if self.as_of is not None:
+            later = ok & (day > self.as_of)
+            self.after_as_of += int(later.sum())
+            ok &= ~later
+        if not ok.any():
+            return
+        customers, day, amount = customers[ok], day[ok].astype(np.int32), amount[ok]
+        rows = self._rows_for(customers)
+        c = self.cols
+
+        # Διακριτές παραγγελίες: (πελάτης, order_id) ή (πελάτης, ημέρα)
+        self.has_order_id |= order_key is not None
+        okey = order_key[ok] if order_key is not None else day
+        order = np.lexsort((okey, rows))
+        r, k = rows[order], okey[order]
+        first = np.ones(r.size, dtype=bool)
+        first[1:] = (r[1:] != r[:-1]) | (k[1:] != k[:-1])
+        first &= k != c["last_key"][r]            # συνέχεια παραγγελίας από το προηγούμενο chunk
+        last = np.append(r[1:] != r[:-1], True)   # μεγαλύτερο key κάθε πελάτη στο chunk
+        c["last_key"][r[last]] = k[last]
+
+        n = self.n
+        c["orders"][:n] += np.bincount(r[first], minlength=n)
+        c["lines"][:n] += np.bincount(rows, minlength=n)
+        c["revenue"][:n] += np.bincount(rows, weights=amount, minlength=n)
+        if units is not None:
+            self.has_units = True
+            c["units"][:n] += np.bincount(rows, weights=np.nan_to_num(units[ok]), minlength=n)
+        np.minimum.at(c["first_day"], rows, day)
+        np.maximum.at(c["last_day"], rows, day)
+
+    def customers(self):
+        """Per-customer arrays (views, length n)."""
+        return {name: values[:self.n] for name, values in self.cols.items()}
+
+
+def scan_transactions(path, chunksize=DEFAULT_CHUNKSIZE, rename=None, date_format=None, as_of=None,
+                      progress=False, stream=sys.stderr):
+    """Streams the order-line log once; returns the filled CustomerAccumulator."""
+    acc = CustomerAccumulator(as_of)
+    t0 = time.perf_counter()
+    for chunk in iter_order_lines(path, chunksize, rename=rename, date_format=date_format):
+        acc.update(*chunk)
+        if progress:
+            elapsed = time.perf_counter() - t0
+            stream.write(f"\r{acc.rows:>12,} lines | {acc.n:>10,} customers | "
+                         f"{acc.rows / elapsed if elapsed else 0:>12,.0f} lines/s | peak RSS {peak_rss_mb():,.0f} MB")
+            stream.flush()
+    if progress:
+        stream.write("\n")
+    return acc
+
+
+# ------------------------------------------------
+# EMPIRICAL DISTRIBUTIONS
+# ------------------------------------------------
+
+def _annual_churn(deaths, exposure_years):
+    # Εκθετικός κίνδυνος -> ετήσιο churn σε %
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hazard = np.where(exposure_years > 0, deaths / exposure_years, np.nan)
+    return (1 - np.exp(-hazard)) * 100
+
+
+def _blocks(n, size=EM_BLOCK):
+    return (slice(lo, min(lo + size, n)) for lo in range(0, n, size))
+
+
+def _lifetime_loglik(lam, mu, repeat, t_last, t_end, group, n_groups):
+    # log L ανά ομάδα: x ln(lam) - s t_x + ln(mu + lam e^(-s (T - t_x))) - ln(s),  s = lam + mu
+    total = np.zeros(n_groups)
+    for b in _blocks(group.size):
+        lg, mg = lam[group[b]], mu[group[b]]
+        rate = lg + mg
+        quiet = np.maximum(t_end[b] - t_last[b], 0.0)
+        terms = repeat[b] * np.log(lg) - rate * t_last[b] + np.log(mg + lg * np.exp(-rate * quiet)) - np.log(rate)
+        total += np.bincount(group[b], weights=terms, minlength=n_groups)
+    return total
+
+
+def lifetime_posterior(lam, mu, t_last, t_end, group):
+    """P(alive at as_of) and expected years from the last order to leaving, per customer."""
+    rate = (lam + mu)[group]
+    quiet = np.maximum(t_end - t_last, 0.0)              # έτη χωρίς αγορά ως το as_of
+    sd = np.minimum(rate * quiet, 700.0)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        p_alive = 1.0 / (1.0 + mu[group] / rate * np.expm1(sd))
+        gap = np.where(sd > 0, 1.0 / rate - quiet / np.expm1(sd), 0.0)
+    return p_alive, gap
+
+
+def _em_step(lam, mu, repeat, t_last, t_end, group, n_groups):
+    exposure, deaths = np.zeros(n_groups), np.zeros(n_groups)
+    for b in _blocks(group.size):
+        p_alive, gap = lifetime_posterior(lam, mu, t_last[b], t_end[b], group[b])
+        exposure += np.bincount(group[b], weights=p_alive * t_end[b] + (1 - p_alive) * (t_last[b] + gap),
+                                minlength=n_groups)
+        deaths += np.bincount(group[b], weights=1 - p_alive, minlength=n_groups)
+    exposure = np.maximum(exposure, 1e-9)
+    return np.bincount(group, weights=repeat, minlength=n_groups) / exposure, deaths / exposure
+
+
+def fit_lifetimes(repeat, t_last, t_end, group, n_groups, max_iter=EM_MAX_ITER, tol=EM_TOL):
+    """
+    Poisson purchases (rate lam / year) over an exponential lifetime (rate mu),
+    fitted per group by EM. repeat = orders after the first, t_last / t_end =
+    years from the first order to the last order / to as_of.
+
+    E-step: P(alive at as_of) and, if not, the expected years between the last
+    order and leaving; M-step: lam, mu = repeat orders, deaths / customer-years.
+    Steps are extrapolated (SQUAREM, in log space) and kept only where they
+    raise the likelihood. The E-step runs in blocks of EM_BLOCK customers.
+    """
+    data = (repeat, t_last, t_end, group, n_groups)
+    lam = np.bincount(group, weights=repeat, minlength=n_groups) / np.maximum(
+        np.bincount(group, weights=t_end, minlength=n_groups), 1e-9)
+    lam = np.maximum(lam, 1e-6)
+    mu = np.full(n_groups, 0.5)
+    for _ in range(max_iter):
+        lam1, mu1 = _em_step(lam, mu, *data)
+        lam2, mu2 = _em_step(lam1, mu1, *data)
+        # εκτός αν έχει ήδη συγκλίνει (r = v = 0): το άλμα κρίνεται από τη likelihood
+        with np.errstate(all="ignore"):
+            theta0, theta1, theta2 = (np.log(np.stack(x)) for x in ((lam, mu), (lam1, mu1), (lam2, mu2)))
+            r, v = theta1 - theta0, theta2 - 2 * theta1 + theta0
+            alpha = np.minimum(-np.sqrt((r ** 2).sum(axis=0) / (v ** 2).sum(axis=0)), -1.0)
+            jump = np.exp(theta0 - 2 * alpha * r + alpha ** 2 * v)
+            better = np.isfinite(jump).all(axis=0) & (
+                _lifetime_loglik(jump[0], jump[1], *data) >= _lifetime_loglik(lam2, mu2, *data))
+        new_lam, new_mu = _em_step(np.where(better, jump[0], lam2), np.where(better, jump[1], mu2), *data)
+        done = np.allclose(new_lam, lam, rtol=tol, atol=0) and np.allclose(new_mu, mu, rtol=tol, atol=1e-12)
+        lam, mu = new_lam, new_mu
+        if done:
+            break
+    return lam, mu
+
+
+def _tenure_sums(tenure_years, weights, horizon):
+    # πελατο-έτη έκθεσης και πλήθος (βάρος) ανά ακέραιο έτος ζωής 0..horizon
+    whole = np.minimum(np.floor(tenure_years).astype(np.int64), horizon)
+    lived = np.bincount(whole, weights=weights, minlength=horizon + 1)
+    beyond = lived[::-1].cumsum()[::-1]                  # πελάτες με tenure >= k
+    frac = np.bincount(whole, weights=weights * (tenure_years - whole), minlength=horizon + 1)
+    return beyond[1:horizon + 1] + frac[:horizon], lived[:horizon]
+
+
+def _churn_path(horizon, alive, churned):
+    # Churn ανά έτος ζωής: θάνατοι στο έτος k / πελατο-έτη έκθεσης στο έτος k
+    exposure_alive, _ = _tenure_sums(*alive, horizon)
+    exposure_churned, deaths = _tenure_sums(*churned, horizon)
+    exposure = exposure_alive + exposure_churned
+    path = _annual_churn(deaths, exposure)
+    # χωρίς δεδομένα για μεγάλα tenure: κρατάμε την τελευταία εκτίμηση
+    for k in range(1, horizon):
+        if not np.isfinite(path[k]):
+            path[k] = path[k - 1]
+    return path, exposure
+
+
+def customer_profile(acc, cohort=DEFAULT_COHORT, horizon=15):
+    """
+    Cohort table (dict of arrays, one row per acquisition period, plus an
+    "all" row last) and the frequency / churn distributions behind it, as of
+    acc.as_of (default: the last order day scanned).
+    """
+    if not acc.n:
+        raise ValueError("No valid order lines (customer_id / order_date / amount) in the log")
+    c = acc.customers()
+    first, last = c["first_day"], c["last_day"]
+    as_of = int(last.max() if acc.as_of is None else acc.as_of)
+    orders, revenue, units = c["orders"], c["revenue"], c["units"]
+
+    periods = first.astype("datetime64[D]").astype(f"datetime64[{COHORT_UNITS[cohort]}]").astype(np.int64)
+    if cohort == "quarter":
+        periods -= periods % 3                          # μήνες -> πρώτος μήνας του τριμήνου
+    labels, idx = np.unique(periods, return_inverse=True)
+    k = labels.size
+
+    def per_cohort(weights=None):
+        sums = np.bincount(idx, weights=weights, minlength=k).astype(np.float64)
+        return np.append(sums, sums.sum())
+
+    repeat = np.maximum(orders - 1, 0).astype(np.float64)
+    t_last, t_end = (last - first) / 365.0, (as_of - first) / 365.0
+    lam, mu = fit_lifetimes(repeat, t_last, t_end, idx, k)
+    everyone = np.zeros_like(idx)
+    lam_all, mu_all = fit_lifetimes(repeat, t_last, t_end, everyone, 1)
+    p_alive, gap = lifetime_posterior(lam_all, mu_all, t_last, t_end, everyone)
+    # κοόρτες χωρίς ιστορικό (π.χ. αποκτήθηκαν στο as_of): τιμές όλων των πελατών
+    lam = np.where(np.isfinite(lam) & (lam > 0), lam, lam_all[0])
+    mu = np.where(np.isfinite(mu) & (mu > 0), mu, mu_all[0])
+    lam, mu = np.append(lam, lam_all), np.append(mu, mu_all)
+
+    n_orders, n_revenue, n_units = per_cohort(orders), per_cohort(revenue), per_cohort(units)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = {
+            "cohort": np.array([_cohort_label(v, cohort) for v in labels] + ["all"], dtype=object),
+            "customers": per_cohort(),
+            "alive": per_cohort(p_alive),
+            "orders": n_orders,
+            "revenue": n_revenue,
+            "purchases_per_year": lam,
+            "revenue_per_order": n_revenue / n_orders,
+            "units_per_order": n_units / n_orders if acc.has_units else np.ones(k + 1),
+            "churn": (1 - np.exp(-mu)) * 100,
+        }
+
+    gap += t_last                                        # αναμενόμενη διάρκεια ζωής αν έφυγε
+    active = p_alive * t_end + (1 - p_alive) * gap       # αναμενόμενα ενεργά έτη
+    mature = active >= 1.0
+    rate = repeat[mature] / active[mature]
+    # ενεργοί: censored στο as_of· churned: θάνατος στο t_last + gap
+    path, path_exposure = _churn_path(int(horizon), (t_end, p_alive), (gap, 1 - p_alive))
+    distributions = {
+        "orders_hist": np.bincount(np.minimum(orders, MAX_ORDERS), minlength=MAX_ORDERS + 1)[1:].tolist(),
+        "repeat_per_year_quantiles": {
+            f"p{q}": float(np.percentile(rate, q)) if rate.size else None for q in (25, 50, 75, 90)},
+        "churn_by_tenure": path.tolist(),
+        "exposure_by_tenure": path_exposure.tolist(),
+        "one_time_buyers": float((orders == 1).mean()),
+    }
+    return table, distributions, as_of
+
+
+def _cohort_label(value, cohort):
+    if cohort == "quarter":
+        return f"{str(np.datetime64(int(value), 'M'))[:4]}Q{(int(value) % 12) // 3 + 1}"
+    return str(np.datetime64(int(value), COHORT_UNITS[cohort]))
+
+
+def clv_from_profile(table, distributions, unit_contribution=None, margin_rate=CLV_DEFAULTS["margin_rate"],
+                     discount=CLV_DEFAULTS["discount"], risk_p=CLV_DEFAULTS["risk_p"],
+                     realization=CLV_DEFAULTS["realization"], cac=CLV_DEFAULTS["cac"],
+                     horizon=CLV_DEFAULTS["horizon"]):
+    """
+    get_clv_data for every cohort in one clv_batch call. Margin per order is
+    unit_contribution x units / order (as the CLV tool) when given, otherwise
+    margin_rate x revenue / order. The "all" row is also valued on the
+    churn-by-tenure path ("clv_tenure").
+    """
+    per_order = (table["units_per_order"] * unit_contribution if unit_contribution is not None
+                 else table["revenue_per_order"] * margin_rate)
+    freq = np.nan_to_num(table["purchases_per_year"])
+    churn = np.nan_to_num(table["churn"], nan=100.0)
+    out = clv_batch(freq, np.nan_to_num(per_order), horizon, discount, churn, realization, risk_p, cac)
+    path = np.asarray(distributions["churn_by_tenure"], dtype=np.float64)
+    tenure = clv_batch(freq[-1], np.nan_to_num(per_order[-1]), horizon, discount, 0.0, realization, risk_p, cac,
+                       churn_path=np.nan_to_num(path[:int(horizon)], nan=100.0))
+    return {
+        "margin_per_order": per_order,
+        "clv": out["final"],
+        "ltv_cac": (out["final"] + cac) / cac if cac > 0 else np.zeros_like(out["final"]),
+        "payback": out["payback"],
+        "clv_tenure": float(tenure["final"][0]),
+        "years": out["years"],
+        "cumulative": out["cumulative"],
+    }
+
+
+def transaction_clv(path, chunksize=DEFAULT_CHUNKSIZE, rename=None, date_format=None, as_of=None,
+                    cohort=DEFAULT_COHORT, progress=False, **clv):
+    """One streaming pass + cohort CLV -> result dict (JSON-ready apart from the "table" arrays)."""
+    t0 = time.perf_counter()
+    as_of_day = None if as_of is None else int((np.datetime64(as_of, "D") - _EPOCH_DAY).astype(np.int64))
+    acc = scan_transactions(path, chunksize=chunksize, rename=rename, date_format=date_format,
+                            as_of=as_of_day, progress=progress)
+    scan_seconds = time.perf_counter() - t0
+    horizon = int(clv.get("horizon", CLV_DEFAULTS["horizon"]))
+    table, distributions, as_of_day = customer_profile(acc, cohort=cohort, horizon=max(horizon, 15))
+    values = clv_from_profile(table, distributions, **clv)
+    seconds = time.perf_counter() - t0
+    return {
+        "table": {**table, **{k: values[k] for k in ("margin_per_order", "clv", "ltv_cac", "payback")}},
+        "distributions": distributions,
+        "clv_tenure": values["clv_tenure"],
+        "as_of": str(_EPOCH_DAY + np.timedelta64(as_of_day, "D")),
+        "lines": acc.rows,
+        "skipped_lines": acc.skipped,
+        "lines_after_as_of": acc.after_as_of,
+        "customers": acc.n,
+        "orders_from": "order_id" if acc.has_order_id else "customer-day",
+        "has_units": acc.has_units,
+        "scan_seconds": scan_seconds,
+        "seconds": seconds,
+        "lines_per_s": acc.rows / scan_seconds if scan_seconds else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def format_report(result):
+    t = result["table"]
+    lines = [f"{'cohort':<9}{'customers':>11}{'churn %':>9}{'orders/yr':>11}{'rev/order':>11}"
+             f"{'units/ord':>10}{'CLV':>12}{'LTV/CAC':>9}{'payback':>9}"]
+    for i in range(len(t["cohort"])):
+        payback = f"{t['payback'][i]:.0f}y" if np.isfinite(t["payback"][i]) else "-"
+        lines.append(f"{t['cohort'][i]:<9}{t['customers'][i]:>11,.0f}{t['churn'][i]:>9.1f}"
+                     f"{t['purchases_per_year'][i]:>11.2f}{t['revenue_per_order'][i]:>11,.2f}"
+                     f"{t['units_per_order'][i]:>10.2f}{t['clv'][i]:>12,.2f}{t['ltv_cac'][i]:>9.2f}{payback:>9}")
+    d = result["distributions"]
+    q = d["repeat_per_year_quantiles"]
+    if q["p50"] is not None:
+        lines.append("repeat orders / active year (>= 1y active): " +
+                     "  ".join(f"{k} {v:.2f}" for k, v in q.items()))
+    lines.append("churn % by tenure year: " + "  ".join(f"{v:.0f}" for v in d["churn_by_tenure"][:10]) +
+                 f" | one-time buyers {d['one_time_buyers']:.0%} | CLV on tenure path {result['clv_tenure']:,.2f}")
+    return "\n".join(lines)
+
+
+def _json_ready(result):
+    table = {k: [v if isinstance(v, str) else (float(v) if np.isfinite(v) else None) for v in col]
+             for k, col in result["table"].items()}
+    return {**result, "table": table}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.clv_transactions", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="CSV or Parquet order-line log")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--rename", nargs="*", metavar="SRC:COL", help="map log headers to the expected columns")
+    parser.add_argument("--date-format", help="strftime format of order_date (default: guessed from the first rows)")
+    parser.add_argument("--as-of", help="YYYY-MM-DD (default: last order date in the log)")
+    parser.add_argument("--cohort", choices=tuple(COHORT_UNITS), default=DEFAULT_COHORT)
+    parser.add_argument("--unit-contribution", type=float, help="$ per unit (price - variable cost)")
+    parser.add_argument("--margin-rate", type=float, default=CLV_DEFAULTS["margin_rate"],
+                        help="contribution / revenue when --unit-contribution is not given")
+    parser.add_argument("--discount", type=float, default=CLV_DEFAULTS["discount"], help="WACC %%")
+    parser.add_argument("--risk-premium", type=float, default=CLV_DEFAULTS["risk_p"], help="%%")
+    parser.add_argument("--realization", type=float, default=CLV_DEFAULTS["realization"])
+    parser.add_argument("--cac", type=float, default=CLV_DEFAULTS["cac"])
+    parser.add_argument("--horizon", type=int, default=CLV_DEFAULTS["horizon"], help="years")
+    parser.add_argument("--json", help="write the full result here")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = transaction_clv(
+        args.log, chunksize=args.chunksize, rename=parse_rename(args.rename, LOG_COLUMNS),
+        date_format=args.date_format, as_of=args.as_of, cohort=args.cohort,
+        progress=not args.quiet, unit_contribution=args.unit_contribution, margin_rate=args.margin_rate,
+        discount=args.discount, risk_p=args.risk_premium, realization=args.realization, cac=args.cac,
+        horizon=args.horizon,
+    )
+    print(format_report(result))
+    if result["lines_after_as_of"]:
+        print(f"{result['lines_after_as_of']:,} lines dated after --as-of left out", file=sys.stderr)
+    print(f"{result['lines']:,} lines | {result['customers']:,} customers | orders by {result['orders_from']} | "
+          f"as of {result['as_of']} | scan {result['scan_seconds']:.1f}s ({result['lines_per_s']:,.0f} lines/s) | "
+          f"peak RSS {result['peak_rss_mb']:,.0f} MB", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(_json_ready(result), fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
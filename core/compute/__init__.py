@@ -0,0 +1,23 @@
+"""
+Pure compute core: NumPy + stdlib only, no Streamlit / pandas / plotly.
+Safe to import from process-pool workers, CLIs and benchmarks; the UI tools
+import their math from here.
+"""
+from core.engine import (
+    ENGINE_INPUTS, ENGINE_DEFAULTS,
+    calculate_metrics, calculate_metrics_batch, calculate_metrics_frame,
+)
+from core.metrics_cache import cached_calculate_metrics, metrics_cache_stats
+from core.sensitivity import calculate_sensitivities, elasticities, tornado
+from core.monte_carlo import run_monte_carlo
+from core.projection import project_cash, volume_profile
+from core.goal_seek import goal_seek
+from core.product_mix import calculate_product_mix
+from core.compute.summary import summary_metrics
+from core.compute.receivables import (
+    calculate_discount_npv, calculate_discount_npv_batch, calculate_discount_npv_decimal, audit_discount_npv,
+)
+from core.compute.clv import clv_batch, clv_schedule
+from core.compute.leasing import pmt_basic, calculate_final_burden
+from core.compute.payables import calculate_supplier_credit_gain
+from core.compute.resilience import analyze_resilience
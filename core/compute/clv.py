@@ -0,0 +1,77 @@
+import numpy as np
+
+
+def _as_float(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+def clv_batch(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac,
+              churn_path=None):
+    """
+    NPV Customer Lifetime Value for many cohorts / channels in one call.
+    Every argument may be a scalar or a (cohorts,) array; rates in %.
+
+    Constant churn uses the closed-form geometric series
+        cum_t = -CAC + A * q * (1 - q^t) / (1 - q),   q = (1 - churn) / (1 + disc + risk)
+    with A = purchases * margin_per_order * realization. For time-varying
+    churn pass churn_path (%, shape (years,) or (cohorts, years)); it replaces
+    churn and survival becomes its cumulative product.
+
+    Returns a dict of arrays:
+        years       (H,)            1..H, H = max(retention_years)
+        cumulative  (cohorts, H)    cumulative NPV, flat after each cohort's horizon
+        final       (cohorts,)      NPV CLV at the cohort's horizon
+        payback     (cohorts,)      first year with cumulative NPV >= 0, NaN if never
+    """
+    inputs = [
+        _as_float(purchases) * _as_float(margin_per_order) * _as_float(realization),
+        (_as_float(discount) + _as_float(risk_p)) / 100,
+        _as_float(cac),
+        _as_float(churn) / 100,
+        np.asarray(retention_years).astype(np.int64),
+    ]
+    path = None
+    if churn_path is not None:
+        path = np.atleast_2d(_as_float(churn_path) / 100)
+        inputs.append(np.empty(path.shape[0]))       # οι γραμμές του path είναι κοόρτες
+    annual, rate, cac, churn, horizon = np.broadcast_arrays(*[np.atleast_1d(x) for x in inputs])[:5]
+
+    n_years = int(horizon.max()) if horizon.size else 0
+    t = np.arange(1, n_years + 1, dtype=np.float64)
+
+    if path is None:
+        q = ((1 - churn) / (1 + rate))[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where(np.abs(1 - q) < 1e-12, t, q * (1 - q ** t) / (1 - q))
+    else:
+        if path.shape[1] < n_years:
+            raise ValueError(f"churn_path covers {path.shape[1]} years, retention_years needs {n_years}")
+        survival = np.cumprod(1 - path[:, :n_years], axis=1)
+        growth = np.cumsum(survival * (1 + rate)[:, None] ** -t, axis=1)
+    growth = np.broadcast_to(growth, (annual.size, n_years))
+
+    # μετά τον ορίζοντα κάθε κοόρτης η καμπύλη μένει στην τελική της τιμή
+    active = t <= horizon[:, None]
+    if n_years:
+        at_horizon = np.take_along_axis(growth, (np.clip(horizon, 1, n_years) - 1)[:, None], axis=1)
+        growth = np.where(active, growth, np.where(horizon[:, None] > 0, at_horizon, 0.0))
+
+    cumulative = annual[:, None] * growth - cac[:, None]
+    final = cumulative[:, -1] if n_years else -cac.copy()
+
+    reached = (cumulative >= 0) & active
+    payback = np.full(annual.size, np.nan)
+    if n_years:
+        payback = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1.0, np.nan)
+    return {"years": t.astype(np.int64), "cumulative": cumulative, "final": final, "payback": payback}
+
+
+def clv_schedule(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac):
+    """
+    Year-by-year NPV Customer Lifetime Value without pandas (one cohort).
+    Returns (years, cumulative_npv, final_npv, payback_year or None).
+    """
+    out = clv_batch(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac)
+    payback = out["payback"][0]
+    return (out["years"].tolist(), out["cumulative"][0].tolist(), float(out["final"][0]),
+            None if np.isnan(payback) else int(payback))
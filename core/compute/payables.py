@@ -0,0 +1,20 @@
+def calculate_supplier_credit_gain(SupplierCreditDays, Discount, CashPrc, CurrentSales, UnitPrice, TotalUnitCost, InterestRateOnDebt):
+    # Μετατροπή ποσοστών σε δεκαδικούς
+    Discount = Discount / 100
+    CashPrc = CashPrc / 100
+    InterestRateOnDebt = InterestRateOnDebt / 100
+
+    # 1. Gain from the discount on purchases
+    # Το άμεσο κέρδος από την έκπτωση που προσφέρει ο προμηθευτής
+    discount_gain = CurrentSales * Discount * CashPrc
+
+    # 2. Opportunity cost from losing supplier credit
+    # Υπολογισμός με βάση 365 ημέρες (User Instruction 2026-02-18)
+    average_cost_ratio = TotalUnitCost / UnitPrice
+    
+    # Το κόστος του κεφαλαίου που απαιτείται για να καλυφθεί η πρόωρη πληρωμή
+    # Αντί για 0% πίστωση προμηθευτή, χρησιμοποιούμε κεφάλαιο με επιτόκιο InterestRateOnDebt
+    credit_benefit_lost = ((CurrentSales / (365 / SupplierCreditDays)) * average_cost_ratio * CashPrc) * InterestRateOnDebt
+
+    net_gain = discount_gain - credit_benefit_lost
+    return discount_gain, credit_benefit_lost, net_gain
@@ -0,0 +1,196 @@
+import logging
+import os
+from decimal import Decimal, getcontext
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Audit mode: κάθε scalar κλήση τρέχει και σε Decimal (prec 50) και διασταυρώνεται με το float64
+AUDIT_ENABLED = os.environ.get("MLAB_RECEIVABLES_AUDIT", "0") == "1"
+AUDIT_RTOL = 1e-9
+AUDIT_ATOL = 1e-6   # < 1 cent
+
+RESULT_KEYS = (
+    "avg_current_collection_days", "current_receivables", "new_avg_collection_period", "new_receivables",
+    "free_capital", "profit_from_extra_sales", "profit_from_free_capital", "discount_cost",
+    "npv", "max_discount", "optimum_discount", "pct_new_policy",
+)
+
+
+# --- CALCULATION ENGINE (float64, vectorized)
+def calculate_discount_npv_batch(
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+):
+    """
+    Same model as the Decimal engine over whole grids: every argument may be
+    a scalar or an array and they broadcast together (e.g. discount[:, None, None]
+    x adoption[None, :, None] x wacc[None, None, :]). Returns a dict of
+    float64 arrays with the broadcast shape, keys as calculate_discount_npv.
+    Zero current sales / zero adopters give inf / nan instead of raising.
+    """
+    (cs, es, dt, pct_take, d_take_old, d_no_take_old, d_new_policy, cg, wc, d_supp) = np.broadcast_arrays(*[
+        np.asarray(x, dtype=np.float64) for x in (
+            current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+            days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+            new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers)
+    ])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_no_take = 1 - pct_take
+        avg_curr_days = pct_take * d_take_old + pct_no_take * d_no_take_old
+        curr_rec = cs * avg_curr_days / 365
+
+        total_sales = cs + es
+        prcnt_new_policy = (cs * pct_take + es) / total_sales
+        prcnt_old_policy = 1 - prcnt_new_policy
+
+        new_avg_period = prcnt_new_policy * d_new_policy + prcnt_old_policy * d_no_take_old
+        new_rec = total_sales * new_avg_period / 365
+        free_cap = curr_rec - new_rec
+
+        cost_ratio = cg / cs
+        prof_extra = es * (1 - cost_ratio)
+        prof_free_cap = free_cap * wc
+        dist_cost = total_sales * prcnt_new_policy * dt
+
+        # (1 + i) ** d ως exp(d * log1p(i)): ακριβές για το μικρό ημερήσιο i
+        log_g = np.log1p(wc / 365)
+
+        def growth(days):
+            return np.exp(days * log_g)
+
+        inflow = (total_sales * prcnt_new_policy * (1 - dt)) / growth(d_new_policy) \
+            + (total_sales * prcnt_old_policy) / growth(d_no_take_old)
+        outflow = cost_ratio * (es / cs) * cs / growth(d_supp) + cs / growth(avg_curr_days)
+        npv = inflow - outflow
+
+        max_d = 1 - growth(d_new_policy - d_no_take_old) * (
+            (1 - 1 / prcnt_new_policy) + (
+                growth(d_no_take_old - avg_curr_days)
+                + cost_ratio * (es / cs) * growth(d_no_take_old - d_supp)
+            ) / (prcnt_new_policy * (1 + es / cs))
+        )
+        opt_d = (1 - growth(d_new_policy - avg_curr_days)) / 2
+
+    return {
+        "avg_current_collection_days": avg_curr_days,
+        "current_receivables": curr_rec,
+        "new_avg_collection_period": new_avg_period,
+        "new_receivables": new_rec,
+        "free_capital": free_cap,
+        "profit_from_extra_sales": prof_extra,
+        "profit_from_free_capital": prof_free_cap,
+        "discount_cost": dist_cost,
+        "npv": npv,
+        "max_discount": max_d * 100,
+        "optimum_discount": opt_d * 100,
+        "pct_new_policy": prcnt_new_policy * 100,
+    }
+
+
+def calculate_discount_npv(*args, audit=None):
+    """
+    One scenario -> dict of floats (float64 kernel).
+    With audit=True (or MLAB_RECEIVABLES_AUDIT=1) returns the Decimal result
+    instead, after cross-checking it against the float64 one.
+    """
+    if AUDIT_ENABLED if audit is None else audit:
+        return audit_discount_npv(*args)["decimal"]
+    return {k: float(v) for k, v in calculate_discount_npv_batch(*args).items()}
+
+
+def audit_discount_npv(*args):
+    """
+    Decimal (prec 50) vs float64 for one scenario. Returns both results, the
+    largest relative difference and the keys outside AUDIT_RTOL / AUDIT_ATOL
+    (logged as a warning).
+    """
+    exact = calculate_discount_npv_decimal(*args)
+    fast = {k: float(v) for k, v in calculate_discount_npv_batch(*args).items()}
+    mismatches, max_rel = [], 0.0
+    for key in RESULT_KEYS:
+        a, b = exact[key], fast[key]
+        diff = abs(a - b)
+        if diff:
+            max_rel = max(max_rel, diff / max(abs(a), abs(b)))
+        if not diff <= AUDIT_ATOL + AUDIT_RTOL * abs(a):
+            mismatches.append(key)
+    if mismatches:
+        logger.warning("Receivables NPV audit: float64 differs from Decimal on %s (args=%r)", mismatches, args)
+    return {"decimal": exact, "float64": fast, "max_rel_diff": max_rel, "mismatches": mismatches}
+
+
+# --- AUDIT ENGINE (Decimal, prec 50)
+def calculate_discount_npv_decimal(
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+):
+    getcontext().prec = 50 
+    
+    cs = Decimal(str(current_sales))
+    es = Decimal(str(extra_sales))
+    dt = Decimal(str(discount_trial))
+    pct_take = Decimal(str(prc_clients_take_disc))
+    d_take_old = Decimal(str(days_curently_paying_clients_take_discount))
+    d_no_take_old = Decimal(str(days_curently_paying_clients_not_take_discount))
+    d_new_policy = Decimal(str(new_days_payment_clients_take_disc))
+    cg = Decimal(str(cogs))
+    wc = Decimal(str(wacc))
+    d_supp = Decimal(str(avg_days_pay_suppliers))
+    
+    pct_no_take = Decimal('1') - pct_take
+    avg_curr_days = (pct_take * d_take_old) + (pct_no_take * d_no_take_old)
+    curr_rec = (cs * avg_curr_days) / Decimal('365')
+    
+    total_sales = cs + es
+    prcnt_new_policy = ((cs * pct_take) + es) / total_sales
+    prcnt_old_policy = Decimal('1') - prcnt_new_policy
+    
+    new_avg_period = (prcnt_new_policy * d_new_policy) + (prcnt_old_policy * d_no_take_old)
+    new_rec = (total_sales * new_avg_period) / Decimal('365')
+    free_cap = curr_rec - new_rec
+    
+    prof_extra = es * (Decimal('1') - (cg / cs))
+    prof_free_cap = free_cap * wc
+    dist_cost = total_sales * prcnt_new_policy * dt
+    
+    i = wc / Decimal('365')
+    term1 = (total_sales * prcnt_new_policy * (Decimal('1') - dt)) / ((Decimal('1') + i) ** d_new_policy)
+    term2 = (total_sales * prcnt_old_policy) / ((Decimal('1') + i) ** d_no_take_old)
+    inflow = term1 + term2
+    
+    term3 = (cg / cs) * (es / cs) * cs / ((Decimal('1') + i) ** d_supp)
+    term4 = cs / ((Decimal('1') + i) ** avg_curr_days)
+    outflow = term3 + term4
+    
+    npv = inflow - outflow
+
+    max_d = Decimal('1') - (
+        (Decimal('1') + i)**(d_new_policy - d_no_take_old) * (
+            (Decimal('1') - Decimal('1')/prcnt_new_policy) + (
+                (Decimal('1') + i)**(d_no_take_old - avg_curr_days) + 
+                (cg/cs)*(es/cs)*(Decimal('1') + i)**(d_no_take_old - d_supp)
+            ) / (prcnt_new_policy * (Decimal('1') + es/cs))
+        )
+    )
+    
+    opt_d = (Decimal('1') - ((Decimal('1') + i)**(d_new_policy - avg_curr_days))) / Decimal('2')
+
+    return {
+        "avg_current_collection_days": float(avg_curr_days),
+        "current_receivables": float(curr_rec),
+        "new_avg_collection_period": float(new_avg_period),
+        "new_receivables": float(new_rec),
+        "free_capital": float(free_cap),
+        "profit_from_extra_sales": float(prof_extra),
+        "profit_from_free_capital": float(prof_free_cap),
+        "discount_cost": float(dist_cost),
+        "npv": float(npv),
+        "max_discount": float(max_d * 100),
+        "optimum_discount": float(opt_d * 100),
+        "pct_new_policy": float(prcnt_new_policy * 100)
+    }
@@ -0,0 +1,5 @@
+def analyze_resilience(profit, assets, current_assets, current_liabilities):
+    # Fixed division by zero by using a minimum epsilon or conditional check
+    roa = (profit / assets) * 100 if assets > 0 else 0
+    current_ratio = current_assets / current_liabilities if current_liabilities > 0 else 0
+    return round(roa, 2), round(current_ratio, 2)
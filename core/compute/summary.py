@@ -0,0 +1,22 @@
+from core.engine import calculate_metrics as _engine_metrics
+
+
+def summary_metrics(price, volume, variable_cost, fixed_cost,
+                    ar_days, inv_days, ap_days,
+                    annual_debt_service, opening_cash,
+                    target_profit=0.0):
+    """Old sync-engine signature/keys, computed by core.engine (same formulas everywhere)."""
+    m = _engine_metrics(price, volume, variable_cost, fixed_cost,
+                        ar_days, inv_days, ap_days,
+                        annual_debt_service, opening_cash,
+                        target_profit=target_profit)
+    return {
+        "unit_contribution": m["unit_contribution"],
+        "revenue": m["revenue"],
+        "ebit": m["ebit"],
+        "cash_wall": m["cash_wall"],
+        "bep_units": m["bep_units"],
+        "wc_requirement": m["net_working_capital"],
+        "net_cash_position": m["net_cash_position"],
+        "ccc": m["ccc"]
+    }
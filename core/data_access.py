@@ -0,0 +1,26 @@
+"""
+Which files the Streamlit UI may open. Everything typed into a file field
+resolves inside MLAB_DATA_DIR and stays under MLAB_UI_MAX_FILE_MB; larger
+files go through the streaming CLIs, not a rerun.
+"""
+import os
+
+DATA_DIR = os.environ.get("MLAB_DATA_DIR") or None              # ο μόνος φάκελος που ανοίγει το UI
+UI_MAX_FILE_MB = float(os.environ.get("MLAB_UI_MAX_FILE_MB", 200))  # μεγαλύτερα αρχεία -> CLI
+
+
+def resolve_data_path(name, max_mb=UI_MAX_FILE_MB):
+    """
+    File name typed in the UI -> real path inside DATA_DIR. ValueError, with
+    a message safe to show, when there is no DATA_DIR, the name points
+    outside it, the file is missing or it is larger than max_mb.
+    """
+    if not DATA_DIR:
+        raise ValueError("No data directory configured (MLAB_DATA_DIR).")
+    root = os.path.realpath(DATA_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise ValueError(f"No such file in the data directory: {name}")
+    if max_mb is not None and os.path.getsize(path) > max_mb * 1e6:
+        raise ValueError(f"{name} is larger than {max_mb:,.0f} MB; use the command-line tool for it.")
+    return path
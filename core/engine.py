@@ -1,4 +1,23 @@
-import streamlit as st
+import numpy as np
+
+# Σειρά εισόδων του engine (ίδια με την υπογραφή του calculate_metrics)
+ENGINE_INPUTS = (
+    "price", "volume", "variable_cost", "fixed_cost",
+    "ar_days", "inv_days", "ap_days",
+    "annual_debt_service", "opening_cash",
+    "total_debt", "fixed_assets", "target_profit",
+    "tax_rate", "annual_interest", "equity", "depreciation",
+)
+
+ENGINE_DEFAULTS = {
+    "total_debt": 0.0,
+    "fixed_assets": 0.0,
+    "target_profit": 0.0,
+    "tax_rate": 22.0,
+    "annual_interest": 0.0,
+    "equity": 0.0,
+    "depreciation": 0.0,
+}
 
 def calculate_metrics(price, volume, variable_cost, fixed_cost,
                      ar_days, inv_days, ap_days,
@@ -120,6 +139,7 @@ def calculate_metrics(price, volume, variable_cost, fixed_cost,
         "roe": roe,
         "bep_units": bep_units,
         "margin_of_safety": margin_of_safety,
+        "cash_wall": cash_wall_requirements,
         "net_cash_position": net_cash,
         "net_working_capital": net_working_capital,
         "invested_capital": invested_capital,
@@ -135,3 +155,155 @@ def calculate_metrics(price, volume, variable_cost, fixed_cost,
         "runway_months": runway,
         "monthly_burn": abs(min(0, monthly_cf))
     }
+
+
+# ------------------------------------------------
+# BATCH MODE (Vectorized - one pass over NumPy columns)
+# ------------------------------------------------
+
+def calculate_metrics_batch(price, volume, variable_cost, fixed_cost,
+                            ar_days, inv_days, ap_days,
+                            annual_debt_service, opening_cash,
+                            total_debt=0.0,
+                            fixed_assets=0.0,
+                            target_profit=0.0,
+                            tax_rate=22.0,
+                            annual_interest=0.0,
+                            equity=0.0,
+                            depreciation=0.0
+                            ):
+    """
+    Vectorized twin of calculate_metrics.
+    Every input may be a scalar or a 1-D array (broadcast together); every
+    metric comes back as a float64 column. Row i matches calculate_metrics
+    on row i exactly. Undefined cases: bep_units is NaN where
+    unit_contribution <= 0 (see the 'bep_defined' mask) and runway_months
+    stays +inf when there is no burn. 'roic_debug' is not returned - its
+    fields are already columns (ebit, nopat, net_working_capital, ...).
+    """
+    (price, volume, variable_cost, fixed_cost,
+     ar_days, inv_days, ap_days,
+     annual_debt_service, opening_cash,
+     total_debt, fixed_assets, target_profit,
+     tax_rate, annual_interest, equity, depreciation) = np.broadcast_arrays(*[
+        np.atleast_1d(np.asarray(x, dtype=np.float64)) for x in (
+            price, volume, variable_cost, fixed_cost,
+            ar_days, inv_days, ap_days,
+            annual_debt_service, opening_cash,
+            total_debt, fixed_assets, target_profit,
+            tax_rate, annual_interest, equity, depreciation)
+    ])
+
+    # Οι κλάδοι (if/else) του scalar engine γίνονται np.where.
+    # Οι διαιρέσεις υπολογίζονται και στις "κρυμμένες" γραμμές, γι' αυτό σιωπούμε τα warnings.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 1. Base Unit Economics
+        unit_contribution = price - variable_cost
+        revenue = price * volume
+        total_vc = variable_cost * volume
+
+        ebitda = (unit_contribution * volume) - fixed_cost
+        ebit = ebitda - depreciation
+
+        # 2. Taxes, Interest & Net Profit
+        ebt = ebit - annual_interest
+        tax_factor = tax_rate / 100
+        tax_amount = np.maximum(0, ebt * tax_factor)
+        net_profit = ebt - tax_amount
+        nopat = np.where(ebit > 0, ebit * (1 - tax_factor), ebit)
+
+        # 3. 365-Day Logic
+        daily_rev = np.where(revenue > 0, revenue / 365, 0.0)
+        daily_vc = np.where(total_vc > 0, total_vc / 365, 0.0)
+
+        # 4. Operating Working Capital
+        ar_value = daily_rev * ar_days
+        inv_value = daily_vc * inv_days
+        ap_value = daily_vc * ap_days
+        net_working_capital = ar_value + inv_value - ap_value
+
+        # 5. Invested Capital
+        operating_cash_limit = revenue * 0.02
+        effective_cash_for_roic = np.minimum(opening_cash, operating_cash_limit)
+        invested_capital = net_working_capital + fixed_assets + effective_cash_for_roic
+
+        # 6. ROIC / ROE
+        invested_capital_for_roic = np.maximum(invested_capital, 1.0)
+        roic = np.where(nopat > 0, nopat / invested_capital_for_roic, 0.0)
+        roe = np.where(equity > 0, net_profit / np.maximum(equity, 1.0), 0.0)
+
+        # 7. Debt & Liquidity
+        net_debt = total_debt - opening_cash
+
+        # 8. Final Cash Position
+        net_cash = opening_cash + net_profit + depreciation - (annual_debt_service - annual_interest) - net_working_capital
+
+        # 9. Break-Even (Cash Basis)
+        cash_wall_requirements = fixed_cost + annual_debt_service + target_profit
+        bep_defined = unit_contribution > 0
+        bep_units = np.where(bep_defined, cash_wall_requirements / unit_contribution, np.nan)
+        margin_of_safety = np.where(
+            bep_defined & (volume > 0), (volume - bep_units) / volume, -1.0
+        )
+
+        # 10. Efficiency & Risk
+        ccc = ar_days + inv_days - ap_days
+        contribution_margin = unit_contribution * volume
+        dol = np.where(ebit != 0, contribution_margin / ebit, 0.0)
+
+        # 11. Cash Burn & Runway
+        monthly_cf = (net_profit + depreciation - (annual_debt_service - annual_interest)) / 12
+        runway = np.where(monthly_cf < 0, opening_cash / np.abs(monthly_cf), np.inf)
+
+    return {
+        "unit_contribution": unit_contribution,
+        "revenue": revenue,
+        "total_costs": total_vc + fixed_cost + depreciation,
+        "ebit": ebit,
+        "ebt": ebt,
+        "tax_amount": tax_amount,
+        "tax_rate": tax_rate,
+        "annual_interest": annual_interest,
+        "nopat": nopat,
+        "net_profit": net_profit,
+        "roe": roe,
+        "bep_units": bep_units,
+        "bep_defined": bep_defined,
+        "margin_of_safety": margin_of_safety,
+        "cash_wall": cash_wall_requirements,
+        "net_cash_position": net_cash,
+        "net_working_capital": net_working_capital,
+        "invested_capital": invested_capital,
+        "roic": roic,
+        "net_debt": net_debt,
+        "total_debt": total_debt,
+        "ar_value": ar_value,
+        "inv_value": inv_value,
+        "ap_value": ap_value,
+        "ccc": ccc,
+        "dol": dol,
+        "runway_months": runway,
+        "monthly_burn": np.abs(np.minimum(0, monthly_cf))
+    }
+
+
+def calculate_metrics_frame(frame):
+    """
+    Runs calculate_metrics_batch on a column container (DataFrame, dict of
+    arrays, NumPy structured array). Optional columns that are missing take
+    the engine defaults.
+    """
+    columns = {}
+    for name in ENGINE_INPUTS:
+        if name in _column_names(frame):
+            columns[name] = np.asarray(frame[name], dtype=np.float64)
+        elif name in ENGINE_DEFAULTS:
+            columns[name] = ENGINE_DEFAULTS[name]
+        else:
+            raise KeyError(f"Missing required engine input column: '{name}'")
+    return calculate_metrics_batch(**columns)
+
+
+def _column_names(frame):
+    names = getattr(getattr(frame, "dtype", None), "names", None)
+    return names if names is not None else frame
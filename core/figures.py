@@ -0,0 +1,151 @@
+"""
+Process-wide Plotly figure cache and compact chart payloads.
+
+Building a go.Figure (property validation of every trace / layout key) costs
+far more than sending it; most reruns redraw a chart whose inputs did not
+change. `cached_figure(name, builder, *inputs)` keys the figure on the values
+that feed it and builds it once per process:
+
+    fig = cached_figure("ct:break_even", _break_even_figure, p, vc, fc, v)
+    st.plotly_chart(fig, use_container_width=True)
+
+Chart series go in as NumPy arrays (`series`) and long ones are decimated to
+MLAB_CHART_POINTS (min/max per bucket, peaks survive). plotly >= 6 encodes
+NumPy arrays as base64 typed arrays, and long series there are sent as
+float32; plotly 5.x writes them as JSON number lists, so only the
+decimation shrinks them and they stay float64.
+Cached figures are shared between sessions: callers must not mutate them
+(st.plotly_chart only reads - it serializes a copy).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.tracing import span
+
+FIGURE_CACHE_SIZE = int(os.environ.get("MLAB_FIGURE_CACHE_SIZE", 256))
+POINT_BUDGET = int(os.environ.get("MLAB_CHART_POINTS", 2000))
+FLOAT32_ABOVE = 256  # μικρές σειρές μένουν float64 (ακριβές hover)
+
+
+def _typed_arrays():
+    # plotly >= 6: base64 typed arrays· στο 5.x ένα float32 γράφεται ως 0.30000001192092896
+    try:
+        from importlib.metadata import version
+        return int(version("plotly").split(".")[0]) >= 6
+    except Exception:
+        return False
+
+
+TYPED_ARRAYS = _typed_arrays()
+
+
+# ------------------------------------------------
+# COMPACT SERIES
+# ------------------------------------------------
+
+def decimate(x, y, budget=POINT_BUDGET):
+    """
+    Indices to keep so that len <= ~budget: first/last point plus the min and
+    max of y in each of budget/2 equal-width buckets (x assumed sorted).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = y.size
+    if budget <= 0 or n <= budget:
+        return np.arange(n)
+    n_buckets = max(budget // 2, 1)
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))                     # ανά bucket, αύξουσα y
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    keep = np.concatenate(([0, n - 1], order[starts], order[ends]))
+    return np.unique(keep)
+
+
+def series(x, y, budget=POINT_BUDGET):
+    """(x, y) as NumPy arrays ready for a trace: decimated, float32 when long (plotly >= 6)."""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if y.size > budget:
+        idx = decimate(x, y, budget)
+        x, y = x[idx], y[idx]
+    if TYPED_ARRAYS and y.size > FLOAT32_ABOVE:
+        y = y.astype(np.float32)
+        if x.dtype.kind == "f":
+            x = x.astype(np.float32)
+    return x, y
+
+
+# ------------------------------------------------
+# FIGURE CACHE (LRU)
+# ------------------------------------------------
+
+def _freeze(value):
+    # Hashable κλειδί: floats κανονικοποιημένα, arrays ως bytes
+    if isinstance(value, np.ndarray):
+        return ("nd", value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (float, np.floating)):
+        return float(value) + 0.0
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+class FigureCache:
+    """Thread-safe bounded LRU of built figures, keyed on (name, inputs)."""
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, builder, *inputs):
+        key = (name, _freeze(inputs))
+        with self._lock:
+            fig = self._data.get(key)
+            if fig is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+
+        with span(f"figure_build:{name}"):
+            fig = builder(*inputs)
+
+        with self._lock:
+            self._data[key] = fig
+            self._data.move_to_end(key)
+            while len(self._data) > max(self.maxsize, 0):
+                self._data.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def cached_figure(name, builder, *inputs):
+    """builder(*inputs) -> go.Figure, built once per distinct inputs (process-wide)."""
+    return FIGURE_CACHE.get(name, builder, *inputs)
+
+
+def figure_cache_stats():
+    return FIGURE_CACHE.stats()
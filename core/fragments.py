@@ -0,0 +1,32 @@
+import functools
+
+import streamlit as st
+
+from core.tracing import TRACE_ENABLED, begin_rerun, end_rerun, span, trace_active
+
+# st.fragment (>= 1.37) / st.experimental_fragment (1.33 - 1.36); χωρίς αυτά τρέχει ως απλή συνάρτηση
+_st_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def tool_fragment(name):
+    """
+    Decorator for a tool's interactive panel: widget changes inside it rerun
+    only this function, not app.py (page config, Clarity, engine, sidebar).
+    Fragment-only reruns are traced as their own rerun (step="fragment").
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            if not TRACE_ENABLED or trace_active():
+                # μέρος ενός full rerun του app.py
+                with span(f"fragment:{name}"):
+                    return func(*args, **kwargs)
+            begin_rerun(step="fragment", tool=name)
+            try:
+                with span(f"fragment:{name}"):
+                    return func(*args, **kwargs)
+            finally:
+                end_rerun()
+
+        return _st_fragment(traced) if _st_fragment else traced
+    return decorate
@@ -0,0 +1,197 @@
+import numpy as np
+
+from core.engine import ENGINE_INPUTS, ENGINE_DEFAULTS, calculate_metrics_batch
+from core.sensitivity import SENSITIVITY_METRICS, calculate_sensitivities
+
+# ------------------------------------------------
+# GOAL SEEK ("What must be true")
+# ------------------------------------------------
+# Βρίσκει την τιμή ενός input ώστε ένα metric να πιάσει στόχο, για πολλές γραμμές μαζί.
+#   1. Closed form όπου υπάρχει (break-even / margin of safety - υπερβολικά στο unit contribution)
+#   2. Ένα βήμα με το analytic Jacobian: ακριβές όπου ο engine είναι γραμμικός στο input
+#   3. Ό,τι μένει -> vectorized bracketed root finding (Illinois / regula falsi)
+
+METHOD_FAILED, METHOD_CLOSED_FORM, METHOD_LINEAR, METHOD_BRACKET = -1, 0, 1, 2
+
+
+def _closed_form(metric, name, cols, target):
+    """Exact solution for the hyperbolic break-even family, NaN where not applicable."""
+    price, vc, volume = cols["price"], cols["variable_cost"], cols["volume"]
+    uc = price - vc
+    cash_wall = cols["fixed_cost"] + cols["annual_debt_service"] + cols["target_profit"]
+    burden = {
+        "fixed_cost": cols["annual_debt_service"] + cols["target_profit"],
+        "annual_debt_service": cols["fixed_cost"] + cols["target_profit"],
+        "target_profit": cols["fixed_cost"] + cols["annual_debt_service"],
+    }
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metric == "bep_units":
+            bep = np.where(target > 0, target, np.nan)
+        elif metric == "margin_of_safety":
+            # bep = volume * (1 - mos)
+            bep = np.where((volume > 0) & (target < 1), volume * (1 - target), np.nan)
+            if name == "volume":
+                return np.where(uc > 0, (cash_wall / uc) / (1 - target), np.nan)
+        else:
+            return None
+
+        if name == "price":
+            return vc + cash_wall / bep
+        if name == "variable_cost":
+            return price - cash_wall / bep
+        if name in burden:
+            return np.where(uc > 0, bep * uc - burden[name], np.nan)
+    return None
+
+
+def _evaluate(metric, name, cols, rows, x):
+    inputs = {k: v[rows] for k, v in cols.items()}
+    inputs[name] = x
+    return calculate_metrics_batch(**inputs)[metric]
+
+
+def _default_bracket(x0):
+    """[0, max(10*|x0|, 1)] - οι είσοδοι του engine είναι μη αρνητικές."""
+    return np.zeros_like(x0), np.maximum(10 * np.abs(x0), 1.0)
+
+
+def goal_seek(metric, target, solve_for, baseline, lo=None, hi=None,
+              tol=1e-9, max_iter=100, expand=8):
+    """
+    Value of input `solve_for` that makes `metric` equal `target`, per row.
+
+    baseline: engine inputs (scalars or arrays - broadcast to N rows).
+    target, lo, hi: scalars or arrays. Without a bracket the search runs over
+    [0, 10*|current|], widening the upper end up to `expand` times. Every
+    solution must lie in [lo, hi] (default [0, inf)); closed-form / linear
+    answers outside it fall through to the bracket step.
+    tol is absolute on the metric, scaled by max(1, |target|).
+
+    Returns {"value", "solved", "method", "residual"} arrays; unsolved rows
+    (no sign change / undefined metric) have value NaN and method -1.
+    """
+    if solve_for not in ENGINE_INPUTS:
+        raise KeyError(f"Unknown engine input: '{solve_for}'")
+
+    raw = {name: baseline.get(name, ENGINE_DEFAULTS.get(name)) for name in ENGINE_INPUTS}
+    missing = [name for name, value in raw.items() if value is None]
+    if missing:
+        raise KeyError(f"Missing engine inputs: {missing}")
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in raw.values()],
+                                 np.atleast_1d(np.asarray(target, dtype=np.float64)))
+    cols = {name: np.ascontiguousarray(a) for name, a in zip(ENGINE_INPUTS, arrays[:-1])}
+    target = np.ascontiguousarray(arrays[-1])
+    n = target.shape[0]
+    all_rows = np.arange(n)
+    tol_abs = tol * np.maximum(1.0, np.abs(target))
+
+    value = np.full(n, np.nan)
+    method = np.full(n, METHOD_FAILED)
+    # Πεδίο λύσεων: [lo, hi] αν δίνονται, αλλιώς μη αρνητικές είσοδοι (όπως ο engine)
+    x_min = np.broadcast_to(np.asarray(0.0 if lo is None else lo, dtype=np.float64), (n,))
+    x_max = np.broadcast_to(np.asarray(np.inf if hi is None else hi, dtype=np.float64), (n,))
+
+    def accept(rows, x, code):
+        with np.errstate(invalid="ignore"):
+            resid = _evaluate(metric, solve_for, cols, rows, x) - target[rows]
+            ok = np.isfinite(x) & (np.abs(resid) <= tol_abs[rows]) & (x >= x_min[rows]) & (x <= x_max[rows])
+        value[rows[ok]] = x[ok]
+        method[rows[ok]] = code
+
+    # 1. Closed form
+    closed = _closed_form(metric, solve_for, cols, target)
+    if closed is not None:
+        accept(all_rows, closed, METHOD_CLOSED_FORM)
+
+    # 2. Linear step με το exact Jacobian
+    pending = np.flatnonzero(method == METHOD_FAILED)
+    if pending.size and metric in SENSITIVITY_METRICS:
+        sens = calculate_sensitivities(**{k: v[pending] for k, v in cols.items()}, metrics=(metric,))
+        f0 = sens["values"][metric]
+        slope = sens["jacobian"][metric][solve_for]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x1 = cols[solve_for][pending] + (target[pending] - f0) / slope
+        accept(pending, np.where(slope != 0, x1, np.nan), METHOD_LINEAR)
+
+    # 3. Bracketed root finding
+    pending = np.flatnonzero(method == METHOD_FAILED)
+    if pending.size:
+        x0 = cols[solve_for][pending]
+        a, b = _default_bracket(x0)
+        if lo is not None:
+            a = np.broadcast_to(np.asarray(lo, dtype=np.float64), (n,))[pending].copy()
+        if hi is not None:
+            b = np.broadcast_to(np.asarray(hi, dtype=np.float64), (n,))[pending].copy()
+        x, ok = _bracket_solve(metric, solve_for, cols, pending, target[pending], tol_abs[pending],
+                               a, b, max_iter, expand if hi is None else 0)
+        value[pending[ok]] = x[ok]
+        method[pending[ok]] = METHOD_BRACKET
+
+    solved = method != METHOD_FAILED
+    with np.errstate(invalid="ignore"):
+        residual = np.full(n, np.nan)
+        if solved.any():
+            rows = np.flatnonzero(solved)
+            residual[rows] = _evaluate(metric, solve_for, cols, rows, value[rows]) - target[rows]
+    return {"value": value, "solved": solved, "method": method, "residual": residual}
+
+
+def _bracket_solve(metric, name, cols, rows, target, tol_abs, a, b, max_iter, expand):
+    """Vectorized Illinois method; only unconverged rows are re-evaluated."""
+    def f(idx, x):
+        with np.errstate(invalid="ignore"):
+            return _evaluate(metric, name, cols, rows[idx], x) - target[idx]
+
+    idx = np.arange(rows.size)
+    fa, fb = f(idx, a), f(idx, b)
+
+    # Άνοιγμα του πάνω άκρου μέχρι να βρεθεί αλλαγή προσήμου
+    for _ in range(expand):
+        grow = np.flatnonzero(np.sign(fa) * np.sign(fb) > 0)
+        if not grow.size:
+            break
+        b[grow] = b[grow] * 4
+        fb[grow] = f(grow, b[grow])
+
+    x = np.full(rows.size, np.nan)
+    done = np.zeros(rows.size, dtype=bool)
+
+    for end, fend in ((a, fa), (b, fb)):
+        hit = np.isfinite(fend) & (np.abs(fend) <= tol_abs)
+        x[hit & ~done] = end[hit & ~done]
+        done |= hit
+
+    # ±inf στο άκρο (π.χ. runway_months χωρίς burn) έχει γνωστό πρόσημο· μόνο το NaN αποκλείεται
+    active = np.flatnonzero(~done & ~np.isnan(fa) & ~np.isnan(fb) & (np.sign(fa) * np.sign(fb) < 0))
+    side = np.zeros(rows.size, dtype=np.int8)
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        aa, bb, fa_, fb_ = a[active], b[active], fa[active], fb[active]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = bb - fb_ * (bb - aa) / (fb_ - fa_)
+        # Bisection όταν το secant βήμα δεν ορίζεται (άπειρο f στο άκρο) ή βγαίνει εκτός
+        secant = np.isfinite(c) & np.isfinite(fa_) & np.isfinite(fb_)
+        c = np.where(secant & (c > np.minimum(aa, bb)) & (c < np.maximum(aa, bb)), c, (aa + bb) / 2)
+        fc = f(active, c)
+
+        conv = np.isfinite(fc) & (np.abs(fc) <= tol_abs[active])
+        x[active[conv]] = c[conv]
+        done[active[conv]] = True
+        # Bracket που κατέρρευσε χωρίς |f| <= tol (ασυνέχεια, όχι ρίζα): αποτυχία
+        stuck = ~conv & (np.abs(bb - aa) <= 1e-12 * np.maximum(1.0, np.abs(c)))
+
+        # Illinois: αν το ίδιο άκρο μένει δύο φορές, μισό βάρος στο f του άλλου
+        same_b = np.sign(fc) * np.sign(fb_) > 0
+        a_new = np.where(same_b, aa, c)
+        b_new = np.where(same_b, c, bb)
+        fa_new = np.where(same_b, np.where(side[active] == 1, fa_ / 2, fa_), fc)
+        fb_new = np.where(same_b, fc, np.where(side[active] == -1, fb_ / 2, fb_))
+        side[active] = np.where(same_b, 1, -1)
+
+        a[active], b[active], fa[active], fb[active] = a_new, b_new, fa_new, fb_new
+        active = active[~(conv | stuck)]
+
+    return x, done
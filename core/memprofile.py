@@ -0,0 +1,106 @@
+"""
+Opt-in per-tool memory profiling (MLAB_MEMPROFILE=1).
+
+app.py wraps every TOOL_MAP dispatch in `with profile_tool(key)`: tracemalloc
+snapshots before/after the tool function (after a gc pass), top allocation
+sites of what is still alive, and matplotlib figures opened but not closed.
+tracemalloc is process-wide, so under concurrent sessions a tool's numbers
+can include allocations of other sessions running at the same time.
+"""
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+MEMPROFILE_ENABLED = os.environ.get("MLAB_MEMPROFILE", "0") == "1"
+TOP_N = int(os.environ.get("MLAB_MEMPROFILE_TOP", "10"))
+FRAMES = int(os.environ.get("MLAB_MEMPROFILE_FRAMES", "1"))
+
+# Θόρυβος που δεν ανήκει στο tool
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_reports = {}
+
+
+def _open_figures():
+    # Μόνο αν το pyplot είναι ήδη φορτωμένο - το profiling δεν πρέπει να το φορτώσει
+    plt = sys.modules.get("matplotlib.pyplot")
+    return set(plt.get_fignums()) if plt is not None else set()
+
+
+def _snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def _top_sites(stats, limit):
+    sites = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        sites.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+        })
+    return sites
+
+
+@contextmanager
+def profile_tool(key, enabled=None, top=TOP_N):
+    """Records retained bytes / top sites / leaked figures for one tool run."""
+    if not (MEMPROFILE_ENABLED if enabled is None else enabled):
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(FRAMES)
+
+    figures_before = _open_figures()
+    before = _snapshot()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Και με st.stop() / st.rerun() μέσα στο tool
+        elapsed = time.perf_counter() - t0
+        after = _snapshot()
+        stats = after.compare_to(before, "lineno")
+        leaked = sorted(_open_figures() - figures_before)
+        _record(key, {
+            "ts": time.time(),
+            "seconds": elapsed,
+            "retained_bytes": sum(stat.size_diff for stat in stats),
+            "top_sites": _top_sites(stats, top),
+            "leaked_figures": leaked,
+            "traced_bytes": tracemalloc.get_traced_memory()[0],
+        })
+
+
+def _record(key, run):
+    with _lock:
+        report = _reports.setdefault(key, {"tool": key, "runs": 0, "retained_total": 0,
+                                           "leaked_figures_total": 0, "last": None})
+        report["runs"] += 1
+        report["retained_total"] += run["retained_bytes"]
+        report["leaked_figures_total"] += len(run["leaked_figures"])
+        report["last"] = run
+
+
+def memory_report():
+    """Per-tool reports, largest cumulative retention first."""
+    with _lock:
+        rows = [dict(r) for r in _reports.values()]
+    return sorted(rows, key=lambda r: r["retained_total"], reverse=True)
+
+
+def reset_memory_report():
+    with _lock:
+        _reports.clear()
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from core.engine import ENGINE_INPUTS, ENGINE_DEFAULTS, calculate_metrics
+
+# ------------------------------------------------
+# PROCESS-WIDE METRICS CACHE (LRU + TTL)
+# ------------------------------------------------
+# Κοινό για όλα τα sessions του Streamlit process: ίδιο baseline -> ίδιο αποτέλεσμα,
+# χωρίς να ξανατρέξει ο engine.
+
+DEFAULT_MAXSIZE = int(os.environ.get("MLAB_METRICS_CACHE_SIZE", 512))
+DEFAULT_TTL = float(os.environ.get("MLAB_METRICS_CACHE_TTL", 900))  # seconds, 0 = no expiry
+
+
+def normalize_inputs(**inputs):
+    """Engine inputs -> hashable tuple in ENGINE_INPUTS order (defaults filled, floats)."""
+    key = []
+    for name in ENGINE_INPUTS:
+        if name in inputs:
+            value = inputs[name]
+        elif name in ENGINE_DEFAULTS:
+            value = ENGINE_DEFAULTS[name]
+        else:
+            raise KeyError(f"Missing required engine input: '{name}'")
+        key.append(float(value) + 0.0)  # +0.0: το -0.0 γίνεται 0.0
+    return tuple(key)
+
+
+def _copy_result(result):
+    # Κάθε session παίρνει δικό του dict ώστε να μη "μολύνει" την cache
+    out = dict(result)
+    out["roic_debug"] = dict(result["roic_debug"])
+    return out
+
+
+class MetricsCache:
+    """Thread-safe bounded LRU with TTL eviction and hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (stored_at, result)
+        self._clock = clock
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = int(maxsize)
+            if ttl is not None:
+                self.ttl = float(ttl)
+            self._trim()
+
+    def get_metrics(self, **inputs):
+        """calculate_metrics(**inputs), served from the cache when possible."""
+        key = normalize_inputs(**inputs)
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if self.ttl > 0 and now - stored_at > self.ttl:
+                    del self._data[key]
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return _copy_result(result)
+            self.misses += 1
+
+        # Ο engine τρέχει εκτός lock - δύο ταυτόχρονα misses απλώς γράφουν το ίδιο αποτέλεσμα
+        result = calculate_metrics(**dict(zip(ENGINE_INPUTS, key)))
+
+        with self._lock:
+            self._data[key] = (now, result)
+            self._data.move_to_end(key)
+            self._trim()
+        return _copy_result(result)
+
+    def _trim(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+METRICS_CACHE = MetricsCache()
+
+
+def cached_calculate_metrics(**inputs):
+    return METRICS_CACHE.get_metrics(**inputs)
+
+
+def configure_metrics_cache(maxsize=None, ttl=None):
+    METRICS_CACHE.configure(maxsize=maxsize, ttl=ttl)
+
+
+def metrics_cache_stats():
+    return METRICS_CACHE.stats()
@@ -0,0 +1,120 @@
+import numpy as np
+
+from core.engine import ENGINE_INPUTS, calculate_metrics_batch
+
+# ------------------------------------------------
+# MONTE CARLO ENGINE (vectorized over the shared baseline)
+# ------------------------------------------------
+# Τα draws οργανώνονται σε blocks σταθερού μεγέθους. Κάθε block έχει δικό του
+# seed substream (SeedSequence(seed, spawn_key=(block,))), άρα το αποτέλεσμα
+# δεν εξαρτάται από το πώς/πού τρέχουν τα blocks.
+
+BLOCK_SIZE = 65536
+
+# input -> (distribution, params...) - όλα σχετικά με την τιμή του baseline
+#   "normal":     (rel_sd,)                 x * (1 + rel_sd * z)
+#   "lognormal":  (sigma,)                  x * exp(sigma * z - sigma^2 / 2)  (mean preserving)
+#   "uniform":    (rel_low, rel_high)       x * (1 + U(rel_low, rel_high))
+#   "triangular": (rel_low, rel_mode, rel_high)
+DEFAULT_SHOCKS = {
+    "price": ("normal", 0.05),
+    "volume": ("normal", 0.15),
+    "variable_cost": ("normal", 0.08),
+    "fixed_cost": ("normal", 0.05),
+    "ar_days": ("triangular", -0.10, 0.0, 0.50),
+    "inv_days": ("triangular", -0.10, 0.0, 0.30),
+    "ap_days": ("triangular", -0.30, 0.0, 0.10),
+}
+
+# Οι έξοδοι που κρατάμε ανά draw (όχι όλο το dict του engine - μνήμη)
+SAMPLE_METRICS = ("net_cash_position", "runway_months", "roic")
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def block_rng(seed, block):
+    """Independent, reproducible generator for one block of draws."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def draw_inputs(baseline, shocks, rng, rows):
+    """Sampled engine inputs for `rows` draws; unshocked inputs stay scalars."""
+    inputs = {}
+    for name in ENGINE_INPUTS:
+        base = float(baseline[name])
+        spec = shocks.get(name)
+        if spec is None:
+            inputs[name] = base
+            continue
+        kind, params = spec[0], spec[1:]
+        if kind == "normal":
+            factor = 1 + params[0] * rng.standard_normal(rows)
+        elif kind == "lognormal":
+            sigma = params[0]
+            factor = np.exp(sigma * rng.standard_normal(rows) - sigma ** 2 / 2)
+        elif kind == "uniform":
+            factor = 1 + rng.uniform(params[0], params[1], rows)
+        elif kind == "triangular":
+            factor = 1 + rng.triangular(params[0], params[1], params[2], rows)
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for '{name}'")
+        # Τιμές, όγκοι, κόστη και ημέρες δεν γίνονται αρνητικά
+        inputs[name] = np.maximum(base * factor, 0.0)
+    return inputs
+
+
+def simulate_block(baseline, shocks, seed, block, rows):
+    """One block: draw inputs, run the batch engine, keep SAMPLE_METRICS."""
+    rng = block_rng(seed, block)
+    metrics = calculate_metrics_batch(**draw_inputs(baseline, shocks, rng, rows))
+    return {key: metrics[key] for key in SAMPLE_METRICS}
+
+
+def block_layout(n_draws, block_size=BLOCK_SIZE):
+    """[(block_index, start, stop), ...] covering n_draws."""
+    return [(b, start, min(start + block_size, n_draws))
+            for b, start in enumerate(range(0, n_draws, block_size))]
+
+
+def summarize(samples, wacc=15.0, quantiles=DEFAULT_QUANTILES):
+    """Risk profile from the per-draw arrays."""
+    net_cash = samples["net_cash_position"]
+    runway = samples["runway_months"]
+    roic = samples["roic"]
+    n = net_cash.shape[0]
+    burning = np.isfinite(runway)
+    # inverted_cdf: επιστρέφει πραγματικά δείγματα, άρα το inf (χωρίς burn) μένει inf
+    runway_q = np.quantile(runway, quantiles, method="inverted_cdf") if n else np.full(len(quantiles), np.nan)
+    return {
+        "n_draws": n,
+        "p_negative_cash": float(np.mean(net_cash < 0)) if n else float("nan"),
+        "p_cash_burn": float(np.mean(burning)) if n else float("nan"),
+        "p_roic_below_wacc": float(np.mean(roic < wacc / 100)) if n else float("nan"),
+        "runway_quantiles": {float(q): float(v) for q, v in zip(quantiles, runway_q)},
+        "net_cash_mean": float(np.mean(net_cash)) if n else float("nan"),
+        "net_cash_p05": float(np.quantile(net_cash, 0.05)) if n else float("nan"),
+    }
+
+
+def run_monte_carlo(baseline, n_draws=100_000, seed=None, shocks=None, wacc=15.0,
+                    quantiles=DEFAULT_QUANTILES, block_size=BLOCK_SIZE, keep_samples=False):
+    """
+    Monte Carlo risk profile around `baseline` (dict of engine inputs).
+    seed=None draws fresh entropy; the seed actually used is returned so the
+    run can be reproduced.
+    """
+    shocks = DEFAULT_SHOCKS if shocks is None else shocks
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+
+    samples = {key: np.empty(n_draws) for key in SAMPLE_METRICS}
+    for block, start, stop in block_layout(n_draws, block_size):
+        out = simulate_block(baseline, shocks, seed, block, stop - start)
+        for key in SAMPLE_METRICS:
+            samples[key][start:stop] = out[key]
+
+    result = summarize(samples, wacc=wacc, quantiles=quantiles)
+    result["seed"] = seed
+    if keep_samples:
+        result["samples"] = samples
+    return result
@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from core.monte_carlo import (
+    BLOCK_SIZE, DEFAULT_QUANTILES, DEFAULT_SHOCKS, SAMPLE_METRICS,
+    block_layout, simulate_block, summarize,
+)
+
+# ------------------------------------------------
+# PARALLEL BACKEND (process pool + shared-memory outputs)
+# ------------------------------------------------
+# Οι workers γράφουν κατευθείαν σε multiprocessing.shared_memory arrays, οπότε
+# τα αποτελέσματα δεν γίνονται pickle πίσω στον parent. Κάθε block έχει το δικό
+# του seed substream -> ίδια bits για 1, 2, 4 ή 8 workers.
+
+DEFAULT_START_METHOD = "spawn"  # ασφαλές μέσα σε multi-threaded process (Streamlit)
+
+_worker_buffers = {}
+
+
+def _attach(name, columns, n_rows):
+    # Οι spawned workers μοιράζονται τον resource tracker του parent, ο οποίος κάνει το unlink
+    shm = SharedMemory(name=name)
+    table = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=shm.buf)
+    return shm, {col: table[i] for i, col in enumerate(columns)}
+
+
+def _init_worker(name, columns, n_rows):
+    _worker_buffers["shm"], _worker_buffers["out"] = _attach(name, columns, n_rows)
+
+
+def _run_blocks(kernel, args, seed, blocks, out):
+    for block, start, stop in blocks:
+        result = kernel(*args, seed, block, stop - start)
+        for col, arr in out.items():
+            arr[start:stop] = result[col]
+    return len(blocks)
+
+
+def _worker_task(kernel, args, seed, blocks):
+    return _run_blocks(kernel, args, seed, blocks, _worker_buffers["out"])
+
+
+def _split(items, parts):
+    """Contiguous, near-equal chunks (για load balancing μεταξύ workers)."""
+    parts = max(1, min(parts, len(items)))
+    size, extra = divmod(len(items), parts)
+    chunks, start = [], 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        chunks.append(items[start:stop])
+        start = stop
+    return chunks
+
+
+class SharedResult:
+    """
+    Column views over the shared-memory buffer. Use as a context manager (or
+    call close()) to release it; copy() detaches the data first.
+    """
+
+    def __init__(self, shm, columns, n_rows):
+        self._shm = shm
+        table = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=shm.buf)
+        self.columns = {col: table[i] for i, col in enumerate(columns)}
+
+    def __getitem__(self, col):
+        return self.columns[col]
+
+    def copy(self):
+        return {col: np.array(arr) for col, arr in self.columns.items()}
+
+    def close(self):
+        if self._shm is not None:
+            self.columns = {}
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_blocks_parallel(kernel, args, n_rows, columns, seed, workers=None,
+                        block_size=BLOCK_SIZE, start_method=DEFAULT_START_METHOD,
+                        tasks_per_worker=4):
+    """
+    Runs kernel(*args, seed, block, rows) -> {column: array} over every block
+    of n_rows and returns a SharedResult. The kernel must be a module-level
+    function (picklable). workers=1 runs in-process with the same blocks.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    columns = tuple(columns)
+    shm = SharedMemory(create=True, size=max(len(columns) * n_rows * 8, 1))
+    result = SharedResult(shm, columns, n_rows)
+    blocks = block_layout(n_rows, block_size)
+
+    try:
+        if workers <= 1:
+            _run_blocks(kernel, args, seed, blocks, result.columns)
+        else:
+            ctx = get_context(start_method)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=_init_worker,
+                                     initargs=(shm.name, columns, n_rows)) as pool:
+                futures = [pool.submit(_worker_task, kernel, args, seed, chunk)
+                           for chunk in _split(blocks, workers * tasks_per_worker)]
+                for future in futures:
+                    future.result()
+    except BaseException:
+        result.close()
+        raise
+    return result
+
+
+def run_monte_carlo_parallel(baseline, n_draws=10_000_000, seed=None, shocks=None, wacc=15.0,
+                             quantiles=DEFAULT_QUANTILES, workers=None,
+                             block_size=BLOCK_SIZE, keep_samples=False,
+                             start_method=DEFAULT_START_METHOD):
+    """
+    Same draws and summary as core.monte_carlo.run_monte_carlo (same seed and
+    block_size -> bit-identical samples), spread over a process pool.
+    """
+    shocks = DEFAULT_SHOCKS if shocks is None else shocks
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+
+    with run_blocks_parallel(simulate_block, (dict(baseline), shocks), n_draws, SAMPLE_METRICS,
+                             seed, workers=workers, block_size=block_size,
+                             start_method=start_method) as shared:
+        out = summarize(shared.columns, wacc=wacc, quantiles=quantiles)
+        if keep_samples:
+            out["samples"] = shared.copy()
+    out["seed"] = seed
+    return out
@@ -0,0 +1,142 @@
+"""
+Import timing + background prewarm of tool modules.
+
+Tools are imported on first use (app.py routes through importlib), so their
+plotly / pandas / matplotlib cost lands on the first click. After Home has
+rendered, a daemon thread imports the heavy libraries and the likely-next
+tools so that click finds them in sys.modules.
+
+    python -m core.prewarm          # cold import report for every tool module
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+
+# Βαριές βιβλιοθήκες που φορτώνουν τα tools (πρώτα αυτές -> το κόστος ανά tool μένει "καθαρό")
+HEAVY_MODULES = ("pandas", "plotly.graph_objects", "plotly.express", "matplotlib.pyplot")
+
+# Σειρά προτεραιότητας: το "Test My Business" πάει στο control_tower, μετά τα κουμπιά του Home
+LIKELY_NEXT = {
+    "home": (
+        "control_tower", "stress_test", "cash_fragility", "break_even_shift", "pricing_strategy",
+        "wc_optimizer", "receivables_npv", "clv_calculator", "growth_funding",
+    ),
+    "control_tower": ("stress_test", "cash_fragility", "wc_optimizer", "break_even_shift"),
+}
+
+PREWARM_ENABLED = os.environ.get("MLAB_PREWARM", "1") != "0"
+
+_lock = threading.Lock()
+# Ένα import τη φορά: ταυτόχρονα imports του ίδιου πακέτου (π.χ. pandas) από prewarm και
+# main thread πέφτουν στο deadlock detection του importlib -> μισο-αρχικοποιημένο module
+_import_lock = threading.RLock()
+_timings = {}
+_started = set()
+
+
+def _loaded(name):
+    # Πλήρως φορτωμένο module (όχι μισό, ενώ το εισάγει άλλο thread)
+    module = sys.modules.get(name)
+    if module is None or getattr(getattr(module, "__spec__", None), "_initializing", False):
+        return None
+    return module
+
+
+def timed_import(name, source="on_demand"):
+    """importlib.import_module that records the first (cold) import cost of `name`."""
+    module = _loaded(name)
+    if module is not None:
+        # Συνηθισμένη περίπτωση σε κάθε rerun: χωρίς _import_lock, δεν περιμένει το prewarm
+        if name not in _timings:
+            with _lock:
+                _timings.setdefault(name, {"module": name, "seconds": 0.0, "source": "preloaded",
+                                           "thread": threading.current_thread().name})
+        return module
+    t0 = time.perf_counter()
+    with _import_lock:
+        module = importlib.import_module(name)
+    elapsed = time.perf_counter() - t0
+    with _lock:
+        if name not in _timings:
+            _timings[name] = {
+                "module": name,
+                "seconds": elapsed,
+                "source": source,
+                "thread": threading.current_thread().name,
+            }
+    return module
+
+
+def likely_next_tools(step, tool_map):
+    """Tool keys worth prewarming from page `step` (only keys present in tool_map)."""
+    return [key for key in LIKELY_NEXT.get(step, ()) if key in tool_map]
+
+
+def _prewarm(modules):
+    for name in modules:
+        try:
+            timed_import(name, source="prewarm")
+        except Exception as exc:
+            # Ένα χαλασμένο / ανύπαρκτο tool δεν σταματά το prewarm - θα φανεί στο click
+            with _lock:
+                _timings.setdefault(name, {"module": name, "seconds": 0.0, "source": "prewarm",
+                                           "thread": threading.current_thread().name,
+                                           "error": f"{type(exc).__name__}: {exc}"})
+
+
+def start_prewarm(tool_map, keys, heavy=HEAVY_MODULES):
+    """
+    Imports `heavy` then the modules of `keys` (from tool_map) on a daemon
+    thread. Idempotent per process: modules already queued are skipped.
+    Returns the thread, or None when there is nothing left to do.
+    """
+    if not PREWARM_ENABLED:
+        return None
+    with _lock:
+        modules = [name for name in list(heavy) + [tool_map[k][0] for k in keys if k in tool_map]
+                   if name not in _started and name not in sys.modules]
+        _started.update(modules)
+    if not modules:
+        return None
+    thread = threading.Thread(target=_prewarm, args=(modules,), name="mlab-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_report():
+    """Recorded imports, most expensive first."""
+    with _lock:
+        rows = [dict(row) for row in _timings.values()]
+    return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+
+def format_import_report(rows=None):
+    rows = import_report() if rows is None else rows
+    lines = [f"{'module':<42}{'ms':>9}  source"]
+    for row in rows:
+        note = f"  ! {row['error']}" if row.get("error") else ""
+        lines.append(f"{row['module']:<42}{row['seconds'] * 1000:>9.1f}  {row['source']}{note}")
+    total = sum(row["seconds"] for row in rows if row["source"] != "preloaded")
+    lines.append(f"{'total (cold)':<42}{total * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    import pkgutil
+    import core.tools
+
+    timed_import("streamlit", source="startup")
+    for name in HEAVY_MODULES:
+        timed_import(name, source="startup")
+    for info in pkgutil.iter_modules(core.tools.__path__):
+        try:
+            timed_import(f"core.tools.{info.name}", source="startup")
+        except Exception as exc:
+            print(f"core.tools.{info.name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+    print(format_import_report())
+
+
+if __name__ == "__main__":
+    main()
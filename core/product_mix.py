@@ -0,0 +1,150 @@
+import numpy as np
+
+from core.engine import ENGINE_DEFAULTS, calculate_metrics_batch
+
+# ------------------------------------------------
+# PRODUCT MIX ENGINE (many SKUs, one fixed cost base)
+# ------------------------------------------------
+# Οι SKUs είναι στήλες (NumPy arrays), όχι dict ανά SKU: 100k SKUs = λίγα MB.
+# Το consolidated κομμάτι τρέχει στον ίδιο engine, με σταθμισμένα price / VC / days.
+
+SKU_REQUIRED = ("price", "variable_cost", "volume")
+SKU_OPTIONAL = ("ar_days", "inv_days", "ap_days")
+
+# Drivers που υπολογίζονται από τον engine (οτιδήποτε άλλο = στήλη των SKUs)
+COMPUTED_DRIVERS = ("revenue", "volume", "contribution", "variable_costs")
+
+
+def load_sku_columns(skus, ar_days=0.0, inv_days=0.0, ap_days=0.0, extra=()):
+    """
+    SKU container (DataFrame, dict of arrays, structured array) -> dict of
+    contiguous float64 columns. Missing day columns take the company value.
+    """
+    names = getattr(getattr(skus, "dtype", None), "names", None) or skus
+    defaults = {"ar_days": ar_days, "inv_days": inv_days, "ap_days": ap_days}
+    cols = {}
+    for name in SKU_REQUIRED + SKU_OPTIONAL + tuple(extra):
+        if name in names:
+            cols[name] = np.ascontiguousarray(skus[name], dtype=np.float64)
+        elif name in defaults:
+            cols[name] = None
+        else:
+            raise KeyError(f"Missing SKU column: '{name}'")
+    n = cols["price"].shape[0]
+    for name, value in defaults.items():
+        if cols[name] is None:
+            cols[name] = np.full(n, float(value))
+    return cols
+
+
+def allocate_fixed_costs(pools):
+    """
+    pools: [(amount, driver_array), ...] - each cost pool split pro rata on
+    its own driver (negative driver values count as 0). Pools whose driver
+    sums to 0 are spread evenly.
+    """
+    allocated = None
+    for amount, driver in pools:
+        weights = np.maximum(np.asarray(driver, dtype=np.float64), 0.0)
+        total = weights.sum()
+        share = weights / total if total > 0 else np.full(weights.shape, 1.0 / weights.size)
+        allocated = amount * share if allocated is None else allocated + amount * share
+    return allocated
+
+
+def calculate_product_mix(skus, fixed_cost=0.0, allocation="revenue",
+                          ar_days=0.0, inv_days=0.0, ap_days=0.0,
+                          annual_debt_service=0.0, opening_cash=0.0,
+                          **company):
+    """
+    Per-SKU and consolidated metrics for a sales mix.
+
+    allocation: driver for the shared fixed_cost - one of COMPUTED_DRIVERS,
+    a SKU column name, or an array; or a list of (amount, driver) cost pools
+    (then fixed_cost is their sum). company: the remaining engine inputs
+    (total_debt, fixed_assets, target_profit, tax_rate, annual_interest,
+    equity, depreciation).
+
+    Returns {"sku": {column: array}, "consolidated": {metric: float},
+             "fixed_cost_total": float}.
+    """
+    extra = []
+    pools = allocation if isinstance(allocation, (list, tuple)) else [(fixed_cost, allocation)]
+    for _, driver in pools:
+        if isinstance(driver, str) and driver not in COMPUTED_DRIVERS:
+            extra.append(driver)
+    cols = load_sku_columns(skus, ar_days, inv_days, ap_days, extra=extra)
+    price, vc, volume = cols["price"], cols["variable_cost"], cols["volume"]
+
+    # 1. Per-SKU unit economics & working capital (365-day logic)
+    unit_contribution = price - vc
+    revenue = price * volume
+    total_vc = vc * volume
+    contribution = unit_contribution * volume
+    ar_value = revenue / 365 * cols["ar_days"]
+    inv_value = total_vc / 365 * cols["inv_days"]
+    ap_value = total_vc / 365 * cols["ap_days"]
+
+    # 2. Fixed cost allocation
+    computed = {"revenue": revenue, "volume": volume, "contribution": contribution, "variable_costs": total_vc}
+    resolved = [(float(amount), computed[d] if isinstance(d, str) and d in computed
+                 else cols[d] if isinstance(d, str) else d)
+                for amount, d in pools]
+    allocated = allocate_fixed_costs(resolved)
+    fixed_total = float(sum(amount for amount, _ in resolved))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sku_bep = np.where(unit_contribution > 0, allocated / unit_contribution, np.nan)
+        sku = {
+            "unit_contribution": unit_contribution,
+            "revenue": revenue,
+            "variable_costs": total_vc,
+            "contribution": contribution,
+            "contribution_margin_ratio": np.where(revenue > 0, contribution / revenue, np.nan),
+            "allocated_fixed_cost": allocated,
+            "sku_profit": contribution - allocated,
+            "standalone_bep_units": sku_bep,
+            "ar_value": ar_value,
+            "inv_value": inv_value,
+            "ap_value": ap_value,
+            "net_working_capital": ar_value + inv_value - ap_value,
+        }
+
+    # 3. Consolidated: ένα "σύνθετο προϊόν" με σταθμισμένες τιμές -> ίδιος engine
+    units = float(volume.sum())
+    rev_total, vc_total = float(revenue.sum()), float(total_vc.sum())
+    w_price = rev_total / units if units > 0 else 0.0
+    w_vc = vc_total / units if units > 0 else 0.0
+    w_ar = ar_value.sum() * 365 / rev_total if rev_total > 0 else 0.0
+    w_inv = inv_value.sum() * 365 / vc_total if vc_total > 0 else 0.0
+    w_ap = ap_value.sum() * 365 / vc_total if vc_total > 0 else 0.0
+
+    engine_inputs = {**ENGINE_DEFAULTS, **company}
+    consolidated = calculate_metrics_batch(
+        w_price, units, w_vc, fixed_total, w_ar, w_inv, w_ap,
+        annual_debt_service, opening_cash, **engine_inputs
+    )
+    consolidated = {k: float(v[0]) for k, v in consolidated.items()}
+
+    # 4. Sales-mix break-even (weighted average contribution)
+    cash_wall = consolidated["cash_wall"]
+    w_uc = w_price - w_vc
+    cm_ratio = (rev_total - vc_total) / rev_total if rev_total > 0 else 0.0
+    if w_uc > 0:
+        mix_bep_units = float(cash_wall / w_uc)
+        sku["mix_bep_units"] = mix_bep_units * (volume / units)
+    else:
+        mix_bep_units = None
+        sku["mix_bep_units"] = np.full(volume.shape, np.nan)
+    consolidated.update({
+        "sku_count": int(volume.shape[0]),
+        "weighted_price": w_price,
+        "weighted_unit_contribution": w_uc,
+        "contribution_margin_ratio": cm_ratio,
+        "mix_bep_units": mix_bep_units,
+        "mix_bep_revenue": cash_wall / cm_ratio if cm_ratio > 0 else None,
+        "weighted_ar_days": w_ar,
+        "weighted_inv_days": w_inv,
+        "weighted_ap_days": w_ap,
+    })
+    return {"sku": sku, "consolidated": consolidated, "fixed_cost_total": fixed_total}
@@ -0,0 +1,122 @@
+import numpy as np
+
+# ------------------------------------------------
+# MULTI-PERIOD CASH PROJECTION (scenarios x periods)
+# ------------------------------------------------
+# Ίδια λογική με τον engine (365 ημέρες, NWC από AR/Inventory/AP days), αλλά
+# ανά μήνα ή ανά ημέρα. Με flat profile, το ταμείο στο τέλος του 1ου έτους
+# ισούται με το net_cash_position του calculate_metrics.
+
+FREQUENCIES = {
+    # freq: (periods per year, days per period)
+    "monthly": (12, 365 / 12),
+    "daily": (365, 1.0),
+}
+
+# Ημέρες ανά μήνα (365-day year) για να "απλώσουμε" μηνιαίο profile σε ημέρες
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _scenario_col(x):
+    """Scenario parameter -> shape (S, 1) for broadcasting against periods."""
+    arr = np.asarray(x, dtype=np.float64)
+    return arr.reshape(-1, 1) if arr.ndim else arr.reshape(1, 1)
+
+
+def volume_profile(periods, freq="monthly", seasonality=None, ramp_periods=0.0, ramp_start=1.0):
+    """
+    Multiplier on flat volume per period, shape (S or 1, periods).
+    seasonality: 12 monthly indices (or one per period of the year, or
+    (S, ...) per scenario) - rescaled to average 1 so annual volume holds.
+    ramp: linear from ramp_start x volume to full volume over ramp_periods.
+    """
+    per_year, _ = FREQUENCIES[freq]
+    t = np.arange(periods, dtype=np.float64)
+
+    if seasonality is None:
+        season = np.ones((1, periods))
+    else:
+        season = np.atleast_2d(np.asarray(seasonality, dtype=np.float64))
+        if season.shape[1] == 12 and per_year == 365:
+            season = np.repeat(season, _MONTH_DAYS, axis=1)
+        if season.shape[1] != per_year:
+            raise ValueError(f"seasonality needs 12 or {per_year} values for freq='{freq}'")
+        season = season / season.mean(axis=1, keepdims=True)
+        season = season[:, np.arange(periods) % per_year]
+
+    ramp_periods = _scenario_col(ramp_periods)
+    ramp_start = _scenario_col(ramp_start)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progress = np.where(ramp_periods > 0, np.minimum(1.0, t / ramp_periods), 1.0)
+    ramp = ramp_start + (1 - ramp_start) * progress
+    return season * ramp
+
+
+def project_cash(price, volume, variable_cost, fixed_cost,
+                 ar_days, inv_days, ap_days,
+                 annual_debt_service, opening_cash,
+                 total_debt=0.0,
+                 fixed_assets=0.0,
+                 target_profit=0.0,
+                 tax_rate=22.0,
+                 annual_interest=0.0,
+                 equity=0.0,
+                 depreciation=0.0,
+                 periods=24,
+                 freq="monthly",
+                 seasonality=None,
+                 ramp_periods=0.0,
+                 ramp_start=1.0,
+                 opening_nwc=0.0
+                 ):
+    """
+    Period-by-period cash, NWC build-up and debt service for S scenarios.
+    Inputs take the engine's names (annual figures); each may be a scalar or
+    an (S,) array. total_debt, fixed_assets, target_profit and equity do not
+    move cash and are accepted only so engine input dicts can be passed as is.
+    Arrays in the result are (S, periods); 'cash_out_period' is the first
+    period (0-based) whose closing cash is negative, or -1 if it never is.
+    """
+    per_year, days = FREQUENCIES[freq]
+
+    price, volume, variable_cost, fixed_cost = map(_scenario_col, (price, volume, variable_cost, fixed_cost))
+    ar_days, inv_days, ap_days = map(_scenario_col, (ar_days, inv_days, ap_days))
+    debt_service, cash0 = _scenario_col(annual_debt_service) / per_year, _scenario_col(opening_cash)
+    tax_factor = _scenario_col(tax_rate) / 100
+    interest = _scenario_col(annual_interest) / per_year
+    dep = _scenario_col(depreciation) / per_year
+
+    # 1. Operating flows per period
+    units = (volume / per_year) * volume_profile(periods, freq, seasonality, ramp_periods, ramp_start)
+    revenue = price * units
+    total_vc = variable_cost * units
+    ebt = revenue - total_vc - fixed_cost / per_year - dep - interest
+    net_profit = ebt - np.maximum(0, ebt * tax_factor)
+
+    # 2. NWC balances (365-day logic: ημερήσιος ρυθμός της περιόδου x days)
+    daily_rev = revenue / days
+    daily_vc = total_vc / days
+    nwc = daily_rev * ar_days + daily_vc * inv_days - daily_vc * ap_days
+    nwc_change = np.diff(nwc, axis=1, prepend=np.broadcast_to(_scenario_col(opening_nwc), (nwc.shape[0], 1)))
+
+    # 3. Cash (depreciation πίσω - μη ταμειακή, μόνο το κεφάλαιο του debt service εκτός P&L)
+    cash_flow = net_profit + dep - (debt_service - interest) - nwc_change
+    cash = cash0 + np.cumsum(cash_flow, axis=1)
+
+    negative = cash < 0
+    cash_out = np.where(negative.any(axis=1), negative.argmax(axis=1), -1)
+
+    return {
+        "freq": freq,
+        "periods": periods,
+        "revenue": revenue,
+        "net_profit": net_profit,
+        "nwc": nwc,
+        "nwc_change": nwc_change,
+        "debt_service": np.broadcast_to(debt_service, cash.shape),
+        "cash_flow": cash_flow,
+        "cash": cash,
+        "min_cash": cash.min(axis=1),
+        "min_cash_period": cash.argmin(axis=1),
+        "cash_out_period": cash_out,
+    }
@@ -0,0 +1,205 @@
+import numpy as np
+
+from core.engine import ENGINE_INPUTS, calculate_metrics_batch
+
+# ------------------------------------------------
+# ANALYTIC SENSITIVITY (Closed-form Jacobian of the engine)
+# ------------------------------------------------
+# Κάθε ενδιάμεσο μέγεθος κρατάει το gradient του ως sparse dict {input: array}.
+# Στους κλάδους (max/min/if) παίρνουμε την παράγωγο του κλάδου που εκτελεί ο engine.
+
+SENSITIVITY_METRICS = (
+    "roic",
+    "net_cash_position",
+    "bep_units",
+    "runway_months",
+    "net_working_capital",
+    "margin_of_safety",
+    "net_profit",
+    "ebit",
+    "revenue",
+)
+
+
+def _combine(*terms):
+    """sum(coef * grad) for (coef, grad) pairs - grads are sparse dicts."""
+    out = {}
+    for coef, grad in terms:
+        for name, d in grad.items():
+            out[name] = out[name] + coef * d if name in out else coef * d
+    return out
+
+
+def _where(mask, grad_true, grad_false):
+    out = {}
+    for name in set(grad_true) | set(grad_false):
+        out[name] = np.where(mask, grad_true.get(name, 0.0), grad_false.get(name, 0.0))
+    return out
+
+
+def calculate_sensitivities(price, volume, variable_cost, fixed_cost,
+                            ar_days, inv_days, ap_days,
+                            annual_debt_service, opening_cash,
+                            total_debt=0.0,
+                            fixed_assets=0.0,
+                            target_profit=0.0,
+                            tax_rate=22.0,
+                            annual_interest=0.0,
+                            equity=0.0,
+                            depreciation=0.0,
+                            metrics=SENSITIVITY_METRICS
+                            ):
+    """
+    Metric values and their partial derivatives w.r.t. every engine input,
+    from one vectorized evaluation (scalars or arrays, like calculate_metrics_batch).
+
+    Returns {"values": <batch metrics>, "inputs": <input columns>,
+             "jacobian": {metric: {input: array}}}.
+    Where a metric is undefined (bep_units with contribution <= 0) the partials
+    are NaN; where runway is infinite (no burn) they are 0.
+    """
+    values = calculate_metrics_batch(
+        price, volume, variable_cost, fixed_cost,
+        ar_days, inv_days, ap_days,
+        annual_debt_service, opening_cash,
+        total_debt, fixed_assets, target_profit,
+        tax_rate, annual_interest, equity, depreciation
+    )
+    rows = values["revenue"].shape[0]
+
+    def col(x):
+        return np.broadcast_to(np.asarray(x, dtype=np.float64), (rows,))
+
+    inputs = {name: col(x) for name, x in zip(ENGINE_INPUTS, (
+        price, volume, variable_cost, fixed_cost,
+        ar_days, inv_days, ap_days,
+        annual_debt_service, opening_cash,
+        total_debt, fixed_assets, target_profit,
+        tax_rate, annual_interest, equity, depreciation))}
+    p, v, c = inputs["price"], inputs["volume"], inputs["variable_cost"]
+    ar, inv, ap = inputs["ar_days"], inputs["inv_days"], inputs["ap_days"]
+    cash, t = inputs["opening_cash"], inputs["tax_rate"]
+    one = np.ones(rows)
+
+    uc = values["unit_contribution"]
+    revenue = values["revenue"]
+    total_vc = c * v
+    ebit = values["ebit"]
+    ebt = values["ebt"]
+    tax_factor = t / 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 1. Unit economics & EBIT
+        g_uc = {"price": one, "variable_cost": -one}
+        g_rev = {"price": v, "volume": p}
+        g_tvc = {"variable_cost": v, "volume": c}
+        g_ebit = {"price": v, "variable_cost": -v, "volume": uc,
+                  "fixed_cost": -one, "depreciation": -one}
+        g_ebt = _combine((1.0, g_ebit), (1.0, {"annual_interest": -one}))
+
+        # 2. Tax = max(0, ebt * tf) -> net profit / NOPAT
+        taxed = ebt * tax_factor > 0
+        g_tax = _where(taxed, _combine((tax_factor, g_ebt), (1.0, {"tax_rate": ebt / 100})), {})
+        g_np = _combine((1.0, g_ebt), (-1.0, g_tax))
+        g_nopat = _where(ebit > 0,
+                         _combine((1 - tax_factor, g_ebit), (1.0, {"tax_rate": -ebit / 100})),
+                         g_ebit)
+
+        # 3-4. Working capital (365-day logic)
+        daily_rev = np.where(revenue > 0, revenue / 365, 0.0)
+        daily_vc = np.where(total_vc > 0, total_vc / 365, 0.0)
+        g_drev = _where(revenue > 0, _combine((1 / 365, g_rev)), {})
+        g_dvc = _where(total_vc > 0, _combine((1 / 365, g_tvc)), {})
+        g_nwc = _combine(
+            (ar, g_drev), (inv - ap, g_dvc),
+            (1.0, {"ar_days": daily_rev, "inv_days": daily_vc, "ap_days": -daily_vc}),
+        )
+
+        # 5. Invested capital: min(cash, 2% revenue) + NWC + fixed assets
+        cash_binds = cash <= revenue * 0.02
+        g_eff_cash = _where(cash_binds, {"opening_cash": one}, _combine((0.02, g_rev)))
+        g_ic = _combine((1.0, g_nwc), (1.0, g_eff_cash), (1.0, {"fixed_assets": one}))
+
+        # 6. ROIC = nopat / max(ic, 1) when nopat > 0
+        ic = values["invested_capital"]
+        ic_roic = np.maximum(ic, 1.0)
+        g_icr = _where(ic >= 1.0, g_ic, {})
+        nopat = values["nopat"]
+        g_roic = _where(nopat > 0,
+                        _combine((1 / ic_roic, g_nopat), (-nopat / ic_roic ** 2, g_icr)),
+                        {})
+
+        # 8. Net cash position
+        g_net_cash = _combine(
+            (1.0, g_np), (-1.0, g_nwc),
+            (1.0, {"opening_cash": one, "depreciation": one,
+                   "annual_debt_service": -one, "annual_interest": one}),
+        )
+
+        # 9. Break-even & margin of safety
+        bep_defined = values["bep_defined"]
+        cash_wall = values["cash_wall"]
+        bep = values["bep_units"]
+        g_wall = {"fixed_cost": one, "annual_debt_service": one, "target_profit": one}
+        g_bep = _combine((1 / uc, g_wall), (-cash_wall / uc ** 2, g_uc))
+        g_mos = _where(bep_defined & (v > 0),
+                       _combine((-1 / v, g_bep), (1.0, {"volume": bep / v ** 2})),
+                       {})
+
+        # 11. Runway = cash / |monthly_cf| when burning
+        monthly_cf = (values["net_profit"] + inputs["depreciation"]
+                      - (inputs["annual_debt_service"] - inputs["annual_interest"])) / 12
+        g_mcf = _combine(
+            (1 / 12, g_np),
+            (1 / 12, {"depreciation": one, "annual_debt_service": -one, "annual_interest": one}),
+        )
+        burning = monthly_cf < 0
+        g_runway = _where(burning,
+                          _combine((-1 / monthly_cf, {"opening_cash": one}),
+                                   (cash / monthly_cf ** 2, g_mcf)),
+                          {})
+
+    grads = {
+        "roic": g_roic,
+        "net_cash_position": g_net_cash,
+        "bep_units": g_bep,
+        "runway_months": g_runway,
+        "net_working_capital": g_nwc,
+        "margin_of_safety": g_mos,
+        "net_profit": g_np,
+        "ebit": g_ebit,
+        "revenue": g_rev,
+    }
+
+    jacobian = {}
+    for metric in metrics:
+        grad = grads[metric]
+        jacobian[metric] = {}
+        for name in ENGINE_INPUTS:
+            d = np.array(np.broadcast_to(grad.get(name, 0.0), (rows,)), dtype=np.float64)
+            if metric == "bep_units":
+                d = np.where(bep_defined, d, np.nan)
+            jacobian[metric][name] = d
+    return {"values": values, "inputs": inputs, "jacobian": jacobian}
+
+
+def elasticities(result, metric):
+    """% change of metric per 1% change of each input: dM/dx * x / M."""
+    m = result["values"][metric]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {name: d * result["inputs"][name] / m
+                for name, d in result["jacobian"][metric].items()}
+
+
+def tornado(result, metric, names, shock=0.10, row=0):
+    """
+    First-order impact on `metric` of a +shock (relative) move in each named
+    input: dM/dx * x * shock. Sorted by absolute impact, ascending
+    (plotly horizontal bar order).
+    """
+    items = []
+    for name in names:
+        d = float(result["jacobian"][metric][name][row])
+        x = float(result["inputs"][name][row])
+        items.append({"Variable": name, "Impact": d * x * shock})
+    return sorted(items, key=lambda item: abs(item["Impact"]))
@@ -0,0 +1,162 @@
+"""
+Chunked table I/O shared by the streaming CLIs (batch_cli, receivables_ledger,
+ar_aging, clv_transactions): CSV / Parquet chunk readers and writers, the
+--rename parser, date columns as day numbers and peak-RSS reporting.
+Parquet needs pyarrow.
+"""
+import os
+import sys
+
+import numpy as np
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (NaN where unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return float("nan")
+
+
+def _optional_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet input/output needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Yields pandas DataFrames of at most `chunksize` rows."""
+    if _is_parquet(path):
+        reader = _require_pyarrow().parquet.ParquetFile(path)
+        for batch in reader.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def parse_rename(pairs, columns):
+    """--rename SRC:COL ... -> {SRC: COL}; COL must be one of `columns`."""
+    rename = {}
+    for pair in pairs or []:
+        old, sep, new = pair.partition(":")
+        if not sep or not old or new not in columns:
+            raise SystemExit(f"--rename expects source:column with column in {', '.join(columns)}; got '{pair}'")
+        rename[old] = new
+    return rename
+
+
+class ChunkWriter:
+    """
+    Appends DataFrame chunks to CSV or Parquet (one row group per chunk).
+    CSV goes through pyarrow's streaming writer when available - pandas
+    to_csv is ~10x slower on wide float frames.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self._pa = _require_pyarrow() if self.parquet else _optional_pyarrow()
+        self._writer = None
+        self._schema = None
+        self._first = True
+
+    def write(self, frame):
+        if self._pa is not None:
+            table = self._pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is not None and table.schema != self._schema:
+                # pandas διαβάζει κάθε chunk χωριστά (int64 εδώ, float64 εκεί)
+                try:
+                    table = table.cast(self._schema)
+                except (self._pa.ArrowInvalid, self._pa.ArrowNotImplementedError, ValueError) as exc:
+                    raise ValueError(f"Chunk column types differ from the first chunk's: {exc}") from exc
+            if self._writer is None:
+                self._schema = table.schema
+                if self.parquet:
+                    self._writer = self._pa.parquet.ParquetWriter(self.path, table.schema)
+                else:
+                    self._writer = self._pa.csv.CSVWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def guess_date_format(*columns):
+    """
+    One strftime format for a file's date columns, guessed from their first
+    non-blank values (up to 1000): month-first unless day-first parses more
+    of them; ISO dates use pandas' "ISO8601" so a time part is allowed. None
+    when there is nothing to guess from (all blank, or already datetimes).
+    """
+    import warnings
+    import pandas as pd
+    from pandas.tseries.api import guess_datetime_format
+    columns = [c for c in columns if c.dtype.kind != "M"]
+    if not columns:
+        return None
+    sample = pd.concat(columns, ignore_index=True).dropna().astype(str).str.strip()
+    sample = sample[sample != ""].head(1000)
+    if sample.empty:
+        return None
+    best, parsed = None, -1
+    for dayfirst in (False, True):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            fmt = guess_datetime_format(sample.iloc[0], dayfirst=dayfirst)
+        if fmt is None:
+            continue
+        fmt = "ISO8601" if fmt.startswith("%Y-%m-%d") else fmt
+        hits = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if hits > parsed:
+            best, parsed = fmt, hits
+    if best is None:
+        raise ValueError(f"Cannot infer the date format of '{sample.iloc[0]}'; pass --date-format")
+    return best
+
+
+def day_numbers(values, fmt=None, column="date"):
+    """
+    Dates -> day numbers since 1970-01-01 (float, NaN for blanks). Pass the
+    file's format (guess_date_format) so every chunk parses the same way; a
+    non-blank value that does not match raises ValueError.
+    """
+    import pandas as pd
+    days = pd.to_datetime(values, format=fmt, errors="coerce").to_numpy(dtype="datetime64[D]")
+    missing = np.isnat(days)
+    bad = missing & values.notna().to_numpy()
+    if bad.any():
+        text = values[bad].astype(str).str.strip()
+        text = text[text != ""]
+        if not text.empty:
+            raise ValueError(f"{column}: '{text.iloc[0]}' does not match the date format "
+                             f"{fmt or '(inferred)'}; pass --date-format")
+    out = days.astype(np.int64).astype(np.float64)
+    out[missing] = np.nan
+    return out
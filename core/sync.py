@@ -1,74 +1,157 @@
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
 import streamlit as st
+from core.engine import ENGINE_INPUTS, ENGINE_DEFAULTS
+from core.metrics_cache import cached_calculate_metrics, normalize_inputs
+from core.compute.summary import summary_metrics
 
 # ------------------------------------------------
-# CORE CALCULATION ENGINE
+# SESSION STATE -> ENGINE INPUTS
 # ------------------------------------------------
+# Ένα σημείο αντιστοίχισης: engine input -> key στο session_state (Home / app.py defaults)
+SESSION_INPUT_KEYS = {
+    "price": "price",
+    "volume": "volume",
+    "variable_cost": "variable_cost",
+    "fixed_cost": "fixed_cost",
+    "ar_days": "ar_days",
+    "inv_days": "inv_days",
+    "ap_days": "ap_days",
+    "annual_debt_service": "annual_debt_service",
+    "opening_cash": "opening_cash",
+    "total_debt": "total_debt",
+    "fixed_assets": "fixed_assets",
+    "target_profit": "target_profit_goal",
+    "tax_rate": "tax_rate",
+    "annual_interest": "annual_interest_only",
+    "equity": "equity",
+    "depreciation": "depreciation",
+}
 
-def calculate_metrics(price, volume, variable_cost, fixed_cost,
-                      ar_days, inv_days, ap_days,
-                      annual_debt_service, opening_cash,
-                      target_profit=0.0):
-
-    unit_contribution = price - variable_cost
-    revenue = price * volume
-    total_vc = variable_cost * volume
-
-    contribution_margin = unit_contribution * volume
-    ebit = contribution_margin - fixed_cost
-    
-    # --------------------------------------------
-    # Working Capital (365 day rule - [2026-02-18])
-    # --------------------------------------------
-    daily_rev = revenue / 365 if revenue > 0 else 0
-    daily_costs = (total_vc + fixed_cost) / 365 if (total_vc + fixed_cost) > 0 else 0
-
-    accounts_receivable = daily_rev * ar_days
-    inventory_val = daily_costs * inv_days
-    accounts_payable = daily_costs * ap_days
-
-    wc_requirement = accounts_receivable + inventory_val - accounts_payable
-    
-    # REAL LIQUIDITY: Opening Cash - WC Requirement
-    net_cash_position = opening_cash - wc_requirement
-
-    # Survival Point (Cash Wall)
-    cash_wall = fixed_cost + annual_debt_service + target_profit
-
-    # Analytical Fix: None if margin is negative or zero
-    if unit_contribution > 0:
-        bep_units = cash_wall / unit_contribution
-    else:
-        bep_units = None
-
-    return {
-        "unit_contribution": unit_contribution,
-        "revenue": revenue,
-        "ebit": ebit,
-        "cash_wall": cash_wall,
-        "bep_units": bep_units,
-        "wc_requirement": wc_requirement,
-        "net_cash_position": net_cash_position,
-        "ccc": ar_days + inv_days - ap_days
-    }
 
-def sync_global_state():
+def read_engine_inputs(s=None):
+    """Engine inputs (floats) from session state."""
+    s = st.session_state if s is None else s
+    inputs = {}
+    for name in ENGINE_INPUTS:
+        value = s.get(SESSION_INPUT_KEYS[name])
+        if value is None:
+            value = ENGINE_DEFAULTS.get(name, 0.0)
+        inputs[name] = float(value)
+    return inputs
+
+
+# ------------------------------------------------
+# METRICS PROVIDER (one pass per input change)
+# ------------------------------------------------
+
+def get_metrics():
+    """
+    The single source of s.metrics.
+    Recomputes only when the engine inputs in session state change; each new
+    result is stamped with an increasing 'metrics_version'. Every tool reads
+    the same dict object.
+    """
     s = st.session_state
-    if not s.get("baseline_locked"):
-        return {}
-
-    params = {
-        "price": float(s.get("price", 100.0)),
-        "volume": float(s.get("volume", 1000.0)),
-        "variable_cost": float(s.get("variable_cost", 60.0)),
-        "fixed_cost": float(s.get("fixed_cost", 20000.0)),
-        "ar_days": float(s.get("ar_days", 45.0)),
-        "inv_days": float(s.get("inventory_days", 60.0)),
-        "ap_days": float(s.get("ap_days", 30.0)),
-        "annual_debt_service": float(s.get("annual_debt_service", 0.0)),
-        "opening_cash": float(s.get("opening_cash", 10000.0)),
-        "target_profit": float(s.get("target_profit_goal", 0.0))
-    }
-
-    metrics = calculate_metrics(**params)
-    st.session_state.metrics = metrics
+    inputs = read_engine_inputs(s)
+    key = normalize_inputs(**inputs)
+
+    if s.get("metrics_key") == key and s.get("metrics"):
+        return s.metrics
+
+    metrics = cached_calculate_metrics(**inputs)
+    version = s.get("metrics_version", 0) + 1
+    metrics["metrics_version"] = version
+
+    s.metrics_version = version
+    s.metrics_key = key
+    s.metrics = metrics
     return metrics
+
+
+def sync_global_state():
+    # Παλιό entry point - πλέον απλώς ο provider
+    return get_metrics()
+
+
+# ------------------------------------------------
+# LOCKED BASELINE SNAPSHOT
+# ------------------------------------------------
+# Παγωμένα inputs + metrics τη στιγμή του "Test My Business": τα tools μετράνε
+# deltas ως απλή αφαίρεση από εδώ, χωρίς να ξανατρέξει ο engine.
+
+BASELINE_KEY = "baseline_snapshot"
+
+BaselineSnapshot = namedtuple("BaselineSnapshot", ["inputs", "metrics", "key", "locked_at"])
+
+
+def _frozen(d):
+    return MappingProxyType({k: _frozen(v) if isinstance(v, dict) else v for k, v in d.items()})
+
+
+def lock_baseline(s=None):
+    """Freezes the current engine inputs and their metrics as the session's baseline."""
+    s = st.session_state if s is None else s
+    inputs = read_engine_inputs(s)
+    metrics = cached_calculate_metrics(**inputs)  # ήδη αντίγραφο - δεν μοιράζεται με την cache
+    snapshot = BaselineSnapshot(
+        inputs=_frozen(inputs),
+        metrics=_frozen(metrics),
+        key=normalize_inputs(**inputs),
+        locked_at=time.time(),
+    )
+    s[BASELINE_KEY] = snapshot
+    s["baseline_locked"] = True
+    return snapshot
+
+
+def unlock_baseline(s=None):
+    s = st.session_state if s is None else s
+    s.pop(BASELINE_KEY, None)
+    s["baseline_locked"] = False
+
+
+def get_baseline(s=None):
+    """
+    The locked BaselineSnapshot, or None while the baseline is open.
+    Sessions locked without a snapshot (older state, tests setting
+    baseline_locked directly) are snapshotted on first access.
+    """
+    s = st.session_state if s is None else s
+    if not s.get("baseline_locked"):
+        return None
+    snapshot = s.get(BASELINE_KEY)
+    return snapshot if snapshot is not None else lock_baseline(s)
+
+
+def _delta(current, base):
+    if current is None or base is None:
+        return None                    # π.χ. bep_units όταν contribution <= 0
+    current, base = float(current), float(base)
+    return 0.0 if current == base else current - base   # inf - inf (runway χωρίς burn) -> 0
+
+
+def baseline_delta(metrics, *names, s=None):
+    """
+    metrics[name] - baseline[name] for each name, or for every numeric metric
+    if none given (names that are None on either side are left out then).
+    None where a requested metric is undefined; 0 for equal infinite values.
+    """
+    snapshot = get_baseline(s)
+    if snapshot is None:
+        return {name: 0.0 for name in names}
+    base = snapshot.metrics
+    if not names:
+        names = [k for k, v in base.items() if isinstance(v, (int, float)) and not isinstance(v, bool)
+                 and metrics.get(k, 0.0) is not None]
+    return {name: _delta(metrics.get(name, 0.0), base.get(name, 0.0)) for name in names}
+
+
+# ------------------------------------------------
+# LEGACY SIGNATURE
+# ------------------------------------------------
+
+# core.compute.summary_metrics - χωρίς streamlit, για workers / scripts
+calculate_metrics = summary_metrics
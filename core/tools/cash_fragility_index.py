@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.graph_objects as go
+from core.projection import project_cash
+from core.sync import read_engine_inputs
 
 def show_cash_fragility_index():
     s = st.session_state
@@ -80,7 +82,30 @@ def show_cash_fragility_index():
     fig.update_layout(height=350, template="plotly_dark", margin=dict(l=20, r=20, t=50, b=20))
     st.plotly_chart(fig, use_container_width=True)
 
-    # 6. ANALYST'S VERDICT (Cold & Direct)
+    # 6. CASH PATH (Monthly projection - πότε τελειώνει το ταμείο, όχι μόνο αν)
+    st.subheader("📅 Projected Cash Path (24 Months)")
+    m = s.get("metrics", {})
+    path = project_cash(
+        **{**read_engine_inputs(s), "opening_cash": total_liquidity},
+        periods=24,
+        freq="monthly",
+        opening_nwc=m.get("net_working_capital", 0.0),  # ήδη χρηματοδοτημένο NWC (λειτουργούσα επιχείρηση)
+    )
+    cash_path = path["cash"][0]
+    cash_out = int(path["cash_out_period"][0])
+
+    fig_path = go.Figure()
+    fig_path.add_trace(go.Scatter(x=list(range(1, 25)), y=cash_path, mode="lines+markers", name="Closing Cash", line=dict(color="#3b82f6")))
+    fig_path.add_hline(y=0, line_dash="dash", line_color="#FF4B4B", annotation_text="Cash Out")
+    fig_path.update_layout(height=300, template="plotly_dark", margin=dict(l=20, r=20, t=30, b=20), xaxis_title="Month", yaxis_title="Cash ($)")
+    st.plotly_chart(fig_path, use_container_width=True)
+
+    if cash_out >= 0:
+        st.error(f"🚨 **Cash runs out in Month {cash_out + 1}** at the current baseline.")
+    else:
+        st.success(f"✅ Cash stays positive for 24 months (low point: ${cash_path.min():,.0f}).")
+
+    # 7. ANALYST'S VERDICT (Cold & Direct)
     st.subheader("2. Strategic Analytical Verdict")
     if fragility_score > 1:
         st.error(f"**Structural Deficit:** Your Runway ({cash_runway:.1f} days) is shorter than your CCC ({ccc_days:.1f} days).")
@@ -89,7 +114,7 @@ def show_cash_fragility_index():
         st.success(f"**Structural Buffer:** The system is anti-fragile.")
         st.write(f"✅ **Insight:** You possess a safety margin of {(cash_runway - ccc_days):.1f} days after completing the operational cycle.")
 
-    # 7. NAVIGATION
+    # 8. NAVIGATION
     st.divider()
     if st.button("⬅️ Back to Control Tower", use_container_width=True):
         st.session_state.flow_step = "home"
@@ -1,29 +1,91 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from core.compute.clv import clv_batch, clv_schedule
+from core.figures import cached_figure, series
 
 def get_clv_data(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac):
     """
     Calculates NPV Customer Lifetime Value year-by-year
     """
-    adj_disc = (float(discount) / 100) + (float(risk_p) / 100)
-    churn_rate = float(churn) / 100
-    cum_npv = -float(cac)
-    data = []
-    payback = None
-    
-    for t in range(1, int(retention_years) + 1):
-        survival = (1 - churn_rate) ** t
-        annual_flow = (float(purchases) * float(margin_per_order) * float(realization)) * survival
-        discounted_flow = annual_flow / ((1 + adj_disc) ** t)
-        cum_npv += discounted_flow
-        
-        data.append({"Year": t, "Cumulative_NPV": float(cum_npv)})
-        if cum_npv >= 0 and payback is None:
-            payback = t
-            
+    years, cumulative, cum_npv, payback = clv_schedule(
+        purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac
+    )
+    data = [{"Year": t, "Cumulative_NPV": v} for t, v in zip(years, cumulative)]
     return pd.DataFrame(data), cum_npv, payback
 
+def _clv_figure(years_a, npv_a, years_b, npv_b):
+    x_a, y_a = series(years_a, npv_a)
+    x_b, y_b = series(years_b, npv_b)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x_a, y=y_a, name='Scenario A', line=dict(color='#EF553B', dash='dash')))
+    fig.add_trace(go.Scatter(x=x_b, y=y_b, name='Scenario B', line=dict(color='#00CC96', width=4)))
+    fig.add_hline(y=0, line_dash="dot", line_color="grey")
+    
+    fig.update_layout(height=400, template="plotly_white", title="Cumulative Customer NPV Projection", xaxis_title="Year", yaxis_title="Cumulative Value ($)")
+    return fig
+
+def _use_log_profile(scenario, purchases, units, churn):
+    # Callback: γράφει τις τιμές πριν ξαναχτιστούν τα widgets του σεναρίου
+    suffix = scenario.lower()
+    if np.isfinite(purchases):
+        st.session_state[f"p{suffix}"] = round(float(purchases), 2)
+    if units is not None and np.isfinite(units):
+        st.session_state[f"u{suffix}"] = round(float(units), 2)
+    if np.isfinite(churn):
+        st.session_state[f"ch{suffix}"] = int(round(churn))
+
+def _calibrate_from_log(s):
+    """Purchases / units / churn from an order-line log in MLAB_DATA_DIR - streamed, never loaded whole."""
+    from core.data_access import DATA_DIR, UI_MAX_FILE_MB, resolve_data_path
+    with st.expander("📥 Calibrate from a transaction log"):
+        if not DATA_DIR:
+            st.caption("Set MLAB_DATA_DIR to read order-line logs here, or run "
+                       "`python -m core.clv_transactions <log>` and enter the figures by hand.")
+            return
+        st.caption(f"Logs in the data directory, up to {UI_MAX_FILE_MB:,.0f} MB. "
+                   "Larger logs: `python -m core.clv_transactions <log>`.")
+        name = st.text_input("Order-line log (CSV / Parquet)", key="clv_log_path",
+                             help="Columns: customer_id, order_date, amount, optional order_id / quantity.")
+        if st.button("Analyze log", key="btn_clv_log", disabled=not name):
+            from core.clv_transactions import transaction_clv
+            try:
+                path = resolve_data_path(name)
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                try:
+                    with st.spinner("Streaming order lines..."):
+                        s.clv_log_result = transaction_clv(path)
+                except (OSError, ValueError, KeyError):
+                    st.error("Could not read the log: check its columns "
+                             "(customer_id, order_date, amount, optional order_id / quantity).")
+
+        r = s.get("clv_log_result")
+        if not r:
+            return
+        t = r["table"]
+        st.caption(f"{r['lines']:,} lines | {r['customers']:,} customers | as of {r['as_of']} | "
+                   f"{r['lines_per_s']:,.0f} lines/s")
+        st.table(pd.DataFrame({
+            "Cohort": t["cohort"],
+            "Customers": [f"{v:,.0f}" for v in t["customers"]],
+            "Purchases / Year": [f"{v:.2f}" for v in t["purchases_per_year"]],
+            "Units / Order": [f"{v:.2f}" for v in t["units_per_order"]],
+            "Revenue / Order": [f"${v:,.2f}" for v in t["revenue_per_order"]],
+            "Annual Churn %": [f"{v:.1f}" for v in t["churn"]],
+        }))
+        row = st.selectbox("Cohort", range(len(t["cohort"])), index=len(t["cohort"]) - 1,
+                           format_func=lambda i: t["cohort"][i], key="clv_log_cohort")
+        units = t["units_per_order"][row] if r["has_units"] else None      # χωρίς quantity: μένει το Units / Order
+        args = (t["purchases_per_year"][row], units, t["churn"][row])
+        c1, c2 = st.columns(2)
+        c1.button("Use in Scenario A", key="btn_clv_log_a", on_click=_use_log_profile, args=("A", *args),
+                  use_container_width=True)
+        c2.button("Use in Scenario B", key="btn_clv_log_b", on_click=_use_log_profile, args=("B", *args),
+                  use_container_width=True)
+
 def show_clv_calculator():
     st.header("👥 Executive CLV Simulator")
     
@@ -51,21 +113,27 @@ def show_clv_calculator():
 
     st.divider()
 
+    # Defaults μέσω session state: το calibration από log γράφει τα ίδια keys
+    for k, v in {"pa": 4.0, "ua": 1.0, "cha": 15, "pb": 5.0, "ub": 1.2, "chb": 8}.items():
+        if k not in s:
+            s[k] = v
+    _calibrate_from_log(s)
+
     # --- 2. SCENARIOS INPUT ---
     col_a, col_b = st.columns(2)
     with col_a:
         st.subheader("📊 Scenario A (Baseline)")
-        purch_a = st.number_input("Purchases / Year (A)", value=4.0, key="pa")
-        units_a = st.number_input("Units / Order (A)", value=1.0, key="ua")
+        purch_a = st.number_input("Purchases / Year (A)", key="pa")
+        units_a = st.number_input("Units / Order (A)", key="ua")
         cac_a = st.number_input("CAC ($) (A)", value=150.0, key="caca")
-        churn_a = st.slider("Annual Churn % (A)", 0, 100, 15, key="cha")
+        churn_a = st.slider("Annual Churn % (A)", 0, 100, key="cha")
 
     with col_b:
         st.subheader("🚀 Scenario B (Optimization)")
-        purch_b = st.number_input("Purchases / Year (B)", value=5.0, key="pb")
-        units_b = st.number_input("Units / Order (B)", value=1.2, key="ub")
+        purch_b = st.number_input("Purchases / Year (B)", key="pb")
+        units_b = st.number_input("Units / Order (B)", key="ub")
         cac_b = st.number_input("CAC ($) (B)", value=180.0, key="cacb")
-        churn_b = st.slider("Annual Churn % (B)", 0, 100, 8, key="chb")
+        churn_b = st.slider("Annual Churn % (B)", 0, 100, key="chb")
 
     # --- 3. NPV & RISK SETTINGS ---
     with st.expander("⚙️ Advanced NPV & Risk Adjustment"):
@@ -84,8 +152,11 @@ def show_clv_calculator():
     margin_a = unit_contrib * units_a
     margin_b = unit_contrib * units_b
 
-    df_a, final_a, pb_a = get_clv_data(purch_a, margin_a, horizon, disc, churn_a, real, risk_p, cac_a)
-    df_b, final_b, pb_b = get_clv_data(purch_b, margin_b, horizon, disc, churn_b, real, risk_p, cac_b)
+    # Και τα δύο σενάρια σε μία κλήση (γραμμή 0 = A, 1 = B)
+    clv = clv_batch([purch_a, purch_b], [margin_a, margin_b], horizon, disc,
+                    [churn_a, churn_b], real, risk_p, [cac_a, cac_b])
+    final_a, final_b = (float(v) for v in clv["final"])
+    pb_a, pb_b = (None if np.isnan(v) else int(v) for v in clv["payback"])
 
     # --- 5. RESULTS DASHBOARD ---
     st.divider()
@@ -104,14 +175,10 @@ def show_clv_calculator():
         st.caption(f"Payback: {f'{pb_b} Years' if pb_b else 'Not Reached'}")
 
     # --- 6. VISUALIZATION ---
-    
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df_a['Year'], y=df_a['Cumulative_NPV'], name='Scenario A', line=dict(color='#EF553B', dash='dash')))
-    fig.add_trace(go.Scatter(x=df_b['Year'], y=df_b['Cumulative_NPV'], name='Scenario B', line=dict(color='#00CC96', width=4)))
-    fig.add_hline(y=0, line_dash="dot", line_color="grey")
-    
-    fig.update_layout(height=400, template="plotly_white", title="Cumulative Customer NPV Projection", xaxis_title="Year", yaxis_title="Cumulative Value ($)")
+    fig = cached_figure(
+        "clv:cumulative_npv", _clv_figure,
+        clv["years"], clv["cumulative"][0], clv["years"], clv["cumulative"][1],
+    )
     st.plotly_chart(fig, use_container_width=True)
 
     # --- 7. VERDICT ---
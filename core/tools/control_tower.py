@@ -1,8 +1,9 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from core.engine import calculate_metrics
+from core.sync import get_metrics, read_engine_inputs, baseline_delta
+from core.goal_seek import goal_seek
+from core.figures import cached_figure, series
 
 def _safe_get(key, default=0.0):
     """Safe session_state getter with float casting."""
@@ -12,42 +13,46 @@ def _safe_get(key, default=0.0):
     except Exception:
         return float(default)
 
+def _break_even_figure(p, vc, fc, v):
+    upper_limit = int(v * 2) if v > 0 else 1000
+    step = int(max(1, upper_limit / 10))
+    units = np.arange(0, upper_limit + step, step)
+    x, revenue = series(units, units * p)
+    _, costs = series(units, fc + units * vc)
+
+    fig_be = go.Figure()
+    fig_be.add_trace(go.Scatter(x=x, y=revenue, name="Revenue", line=dict(color='#10b981', width=3)))
+    fig_be.add_trace(go.Scatter(x=x, y=costs, name="Total Costs", line=dict(color='#ef4444', width=3)))
+    fig_be.add_vline(x=v, line_dash="dash", line_color="white", annotation_text="Current Volume")
+
+    fig_be.update_layout(
+        height=300, template="plotly_dark", margin=dict(l=10, r=10, t=30, b=10),
+        legend=dict(orientation="h", y=1.1), xaxis_title="Volume (Units)", yaxis_title="Value ($)"
+    )
+    return fig_be
+
+def _ccc_figure(ar, inv, ap):
+    fig_ccc = go.Figure(go.Bar(
+        y=['Receivables', 'Inventory', 'Payables'], 
+        x=np.array([ar, inv, -ap]), 
+        orientation='h', 
+        marker_color=['#3b82f6', '#f59e0b', '#ef4444']
+    ))
+    fig_ccc.update_layout(height=250, margin=dict(l=10, r=10, t=10, b=10), template="plotly_dark")
+    return fig_ccc
+
 def show_control_tower():
     st.title("🕹️ Mission Control: Enterprise Tower")
     st.caption("Integrated Strategic & Financial Oversight")
     
     s = st.session_state
     
-    # --- 1. LIVE SYNC ---
-    m = calculate_metrics(
-        price=_safe_get('price', 150.0),
-        volume=_safe_get('volume', 10000.0),
-        variable_cost=_safe_get('variable_cost', 100.0),
-        fixed_cost=_safe_get('fixed_cost', 450000.0),
-        ar_days=_safe_get('ar_days', 60),
-        inv_days=_safe_get('inv_days', 45),
-        ap_days=_safe_get('ap_days', 30),
-        annual_debt_service=_safe_get('annual_debt_service', 70000.0),
-        opening_cash=_safe_get('opening_cash', 150000.0),
-        total_debt=_safe_get('total_debt', 500000.0),
-        fixed_assets=_safe_get('fixed_assets', 800000.0)
-    )
-    s.metrics = m
-
-    # --- 1.1 BASELINE CALCULATION (For Delta WC Logic) ---
-    if 'baseline_nwc' not in s:
-        b = calculate_metrics(
-            price=150.0, 
-            volume=15000.0, 
-            variable_cost=90.0, 
-            fixed_cost=450000.0,
-            ar_days=60, 
-            inv_days=45, 
-            ap_days=30,
-            annual_debt_service=_safe_get('annual_debt_service', 70000.0),
-            opening_cash=_safe_get('opening_cash', 150000.0)
-        )
-        s.baseline_nwc = (b.get('ar_value', 0.0) + b.get('inv_value', 0.0)) - b.get('ap_value', 0.0)
+    # --- 1. LIVE SYNC (κοινός metrics provider) ---
+    m = get_metrics()
+
+    # --- 1.1 LOCKED BASELINE (For Delta WC Logic) ---
+    # Δ NWC έναντι του snapshot του "Test My Business" - απλή αφαίρεση
+    d = baseline_delta(m, "net_working_capital", s=s)
     
     # --- 2. TOP LEVEL METRICS (Dynamic Strategic FCF) ---
     revenue = m.get("revenue", 0.0)
@@ -55,8 +60,7 @@ def show_control_tower():
     depreciation = _safe_get('depreciation', 0.0)
     debt_service = _safe_get('annual_debt_service', 0.0)
     
-    current_nwc = (m.get('ar_value', 0.0) + m.get('inv_value', 0.0)) - m.get('ap_value', 0.0)
-    wc_cash_impact = current_nwc - s.baseline_nwc 
+    wc_cash_impact = d["net_working_capital"]
     
     fcf = net_profit + depreciation - debt_service - wc_cash_impact
     
@@ -83,25 +87,7 @@ def show_control_tower():
         vc = _safe_get('variable_cost', 90.0)
         fc = _safe_get('fixed_cost', 450000.0)
         
-        upper_limit = int(v * 2) if v > 0 else 1000
-        step = int(max(1, upper_limit / 10))
-        v_range = list(range(0, upper_limit + step, step))
-        
-        df_be = pd.DataFrame({
-            "Units": v_range,
-            "Revenue": [vol * p for vol in v_range],
-            "Total Costs": [fc + (vol * vc) for vol in v_range]
-        })
-        
-        fig_be = go.Figure()
-        fig_be.add_trace(go.Scatter(x=df_be["Units"], y=df_be["Revenue"], name="Revenue", line=dict(color='#10b981', width=3)))
-        fig_be.add_trace(go.Scatter(x=df_be["Units"], y=df_be["Total Costs"], name="Total Costs", line=dict(color='#ef4444', width=3)))
-        fig_be.add_vline(x=v, line_dash="dash", line_color="white", annotation_text="Current Volume")
-
-        fig_be.update_layout(
-            height=300, template="plotly_dark", margin=dict(l=10, r=10, t=30, b=10),
-            legend=dict(orientation="h", y=1.1), xaxis_title="Volume (Units)", yaxis_title="Value ($)"
-        )
+        fig_be = cached_figure("control_tower:break_even", _break_even_figure, p, vc, fc, v)
         st.plotly_chart(fig_be, use_container_width=True)
 
     with q2: # QUADRANT 2: LIQUIDITY (CCC)
@@ -110,13 +96,7 @@ def show_control_tower():
         st.write(f"**CCC:** {ccc:.0f} Days")
         ar, inv, ap = _safe_get("ar_days", 30), _safe_get("inv_days", 60), _safe_get("ap_days", 45)
         
-        fig_ccc = go.Figure(go.Bar(
-            y=['Receivables', 'Inventory', 'Payables'], 
-            x=[ar, inv, -ap], 
-            orientation='h', 
-            marker_color=['#3b82f6', '#f59e0b', '#ef4444']
-        ))
-        fig_ccc.update_layout(height=250, margin=dict(l=10, r=10, t=10, b=10), template="plotly_dark")
+        fig_ccc = cached_figure("control_tower:ccc", _ccc_figure, ar, inv, ap)
         st.plotly_chart(fig_ccc, use_container_width=True)
 
     with q3: # QUADRANT 3: RISK RADAR
@@ -140,6 +120,13 @@ def show_control_tower():
         if spread > 0: st.success("Value Creation")
         else: st.error("Value Destruction")
 
+        # What must be true: όγκος για ROIC = WACC
+        need = goal_seek("roic", wacc_locked / 100, "volume", read_engine_inputs(s))
+        if need["solved"][0]:
+            st.caption(f"🎯 ROIC = WACC requires **{need['value'][0]:,.0f} units** (now {v:,.0f}).")
+        else:
+            st.caption("🎯 No sales volume brings ROIC to WACC at the current unit economics.")
+
     # --- 4. STRATEGIC INTELLIGENCE CHECKLIST ---
     st.markdown("### 🧠 Strategic Intelligence Checklist")
     col_ch1, col_ch2, col_ch3 = st.columns(3)
@@ -1,11 +1,7 @@
 import streamlit as st
 import matplotlib.pyplot as plt
+from core.compute.resilience import analyze_resilience
 
-def analyze_resilience(profit, assets, current_assets, current_liabilities):
-    # Fixed division by zero by using a minimum epsilon or conditional check
-    roa = (profit / assets) * 100 if assets > 0 else 0
-    current_ratio = current_assets / current_liabilities if current_liabilities > 0 else 0
-    return round(roa, 2), round(current_ratio, 2)
 
 def show_resilience_map():
     s = st.session_state
@@ -22,7 +18,7 @@ def show_resilience_map():
     sys_assets = float(s.get('total_assets', revenue * 0.8 if revenue > 0 else 1.0))
     if sys_assets <= 0: sys_assets = 1.0
     
-    sys_c_assets = float(s.get('current_assets', s.get('opening_cash', 0.0) + m.get('wc_requirement', 0.0)))
+    sys_c_assets = float(s.get('current_assets', s.get('opening_cash', 0.0) + m.get('net_working_capital', 0.0)))
     
     sys_c_liabilities = float(s.get('current_liabilities', s.get('fixed_cost', 0.0) / 4))
     if sys_c_liabilities <= 0: sys_c_liabilities = 1.0 # Avoid DivisionByZero
@@ -56,6 +52,7 @@ def show_resilience_map():
     ax.set_ylabel("Efficiency (ROA %)")
     ax.grid(True, alpha=0.1)
     st.pyplot(fig)
+    plt.close(fig)  # αλλιώς το pyplot κρατάει κάθε figure ζωντανό σε όλη τη διάρκεια του process
 
     # 4. SHOCK ABSORPTION ANALYSIS
     st.divider()
@@ -1,5 +1,22 @@
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
+from core.figures import cached_figure
+
+def _afn_figure(required_assets, spontaneous_liabs, internal_funding, afn):
+    fig = go.Figure(go.Waterfall(
+        measure = ["relative", "relative", "relative", "total"],
+        x = ["New Asset Requirement", "Spontaneous Liabs", "Retained Profit", "External Funding Gap"],
+        y = np.array([required_assets, -spontaneous_liabs, -internal_funding, 0.0]),
+        text = [f"+{required_assets:,.0f}", f"-{spontaneous_liabs:,.0f}", f"-{internal_funding:,.0f}", f"{afn:,.0f}"],
+        textposition = "outside",
+        connector = {"line":{"color":"#64748b"}},
+        decreasing = {"marker":{"color":"#00CC96"}},
+        increasing = {"marker":{"color":"#EF553B"}},
+        totals = {"marker":{"color":"#1E3A8A"}}
+    ))
+    fig.update_layout(height=400, margin=dict(l=20, r=20, t=20, b=20))
+    return fig
 
 def show_growth_funding_needed():
     st.header("📈 Growth Funding Requirement (AFN)")
@@ -66,18 +83,7 @@ def show_growth_funding_needed():
 
     # 7. VISUALIZATION (Waterfall Chart)
     
-    fig = go.Figure(go.Waterfall(
-        measure = ["relative", "relative", "relative", "total"],
-        x = ["New Asset Requirement", "Spontaneous Liabs", "Retained Profit", "External Funding Gap"],
-        y = [required_assets, -spontaneous_liabs, -internal_funding, 0],
-        text = [f"+{required_assets:,.0f}", f"-{spontaneous_liabs:,.0f}", f"-{internal_funding:,.0f}", f"{afn:,.0f}"],
-        textposition = "outside",
-        connector = {"line":{"color":"#64748b"}},
-        decreasing = {"marker":{"color":"#00CC96"}},
-        increasing = {"marker":{"color":"#EF553B"}},
-        totals = {"marker":{"color":"#1E3A8A"}}
-    ))
-    fig.update_layout(height=400, margin=dict(l=20, r=20, t=20, b=20))
+    fig = cached_figure("growth_funding:afn_waterfall", _afn_figure, required_assets, spontaneous_liabs, internal_funding, afn)
     st.plotly_chart(fig, use_container_width=True)
 
     # 8. VERDICT (Cold & Direct)
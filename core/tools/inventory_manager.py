@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 
 def show_inventory_manager(): # Διορθωμένο όνομα για τον Router
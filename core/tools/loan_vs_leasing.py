@@ -1,84 +1,10 @@
 import streamlit as st
+from core.compute.leasing import calculate_final_burden
 
 def format_number_gr(value):
     """Formats numbers with a thousands separator."""
     return f"{value:,.0f}"
 
-def pmt_basic(rate, nper, pv, fv=0, when=0):
-    """Calculates the monthly payment (PMT) without external libraries."""
-    if rate == 0:
-        return -(pv + fv) / nper
-    
-    factor = (1 + rate)**nper
-    payment = (pv * rate * factor) / (factor - 1)
-    
-    if when == 1:
-        payment = payment / (1 + rate)
-    
-    return payment
-
-def calculate_final_burden(
-    loan_rate,
-    wc_rate,
-    duration_years,
-    property_value,
-    loan_financing_percent,
-    leasing_financing_percent,
-    add_expenses_loan,
-    add_expenses_leasing,
-    residual_value_leasing,
-    depreciation_years,
-    tax_rate,
-    pay_when
-):
-    """Calculates the 15-year total financial burden for both options."""
-    months = 12
-    n_months = duration_years * months
-
-    # 1. Acquisition Costs
-    acquisition_cost_loan = property_value + add_expenses_loan
-    acquisition_cost_lease = property_value + add_expenses_leasing
-
-    # 2. Working Capital Loans (Required to cover own participation and expenses)
-    wc_loan = property_value - (property_value * loan_financing_percent) + add_expenses_loan
-    wc_lease = property_value - (property_value * leasing_financing_percent) + add_expenses_leasing
-
-    # 3. Monthly Payments (Calculated using the basic PMT function)
-    monthly_loan = pmt_basic(loan_rate / months, n_months, property_value * loan_financing_percent, 0, pay_when)
-    monthly_lease = pmt_basic(loan_rate / months, n_months, property_value * leasing_financing_percent, 0, pay_when)
-    monthly_wc_loan = pmt_basic(wc_rate / months, n_months, wc_loan, 0, pay_when)
-    monthly_wc_lease = pmt_basic(wc_rate / months, n_months, wc_lease, 0, pay_when)
-
-    # 4. Total Monthly Obligations
-    total_monthly_loan = monthly_loan + monthly_wc_loan
-    total_monthly_lease = monthly_lease + monthly_wc_lease
-
-    # 5. Interest Components
-    total_interest_loan = (total_monthly_loan * n_months) - property_value
-    total_interest_lease = (total_monthly_lease * n_months) - property_value
-
-    # 6. Total 15-year Gross Cost
-    total_cost_loan = total_interest_loan + property_value
-    total_cost_lease = total_interest_lease + property_value
-
-    # 7. Depreciation
-    depreciation_loan = acquisition_cost_loan / depreciation_years * duration_years
-    depreciation_lease = (acquisition_cost_lease / duration_years * duration_years) + residual_value_leasing
-
-    # 8. Deductible Expenses (Tax Shield components)
-    deductible_loan = total_interest_loan + depreciation_loan
-    deductible_lease = (monthly_wc_lease * n_months - wc_lease) + depreciation_lease
-
-    # 9. Tax Benefits
-    tax_benefit_loan = deductible_loan * tax_rate
-    tax_benefit_lease = deductible_lease * tax_rate
-
-    # 10. Final Net Burden
-    final_loan = total_cost_loan - tax_benefit_loan
-    final_lease = total_cost_lease - tax_benefit_lease
-
-    return round(final_loan), round(final_lease)
-
 def loan_vs_leasing_ui():
     st.header("📊 Loan vs Leasing Comparison")
     st.info("Analytical comparison of the total financial burden considering tax shields and financing structures.")
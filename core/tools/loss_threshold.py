@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 
 def calculate_sales_loss_threshold(our_p, u_cost, price_cut_pct):
     """
@@ -1,5 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
+from core.fragments import tool_fragment
 
 def show_qspm_tool():
     st.header("🧭 QSPM – Strategy Comparison")
@@ -18,6 +19,20 @@ def show_qspm_tool():
     st.write(f"**Current System Context:** Survival Margin: {survival_margin:.1%} | Cash Conversion Cycle: {int(cash_cycle)} Days")
     st.divider()
 
+    _scoring_panel()
+
+    # Navigation (Ευθυγραμμισμένο με το νέο app.py)
+    st.divider()
+    if st.button("⬅️ Back to Control Tower", use_container_width=True):
+        st.session_state.flow_step = "home"
+        st.session_state.selected_tool = None
+        st.rerun()
+
+
+@tool_fragment("qspm:scoring")
+def _scoring_panel():
+    # Κάθε slider ξανατρέχει μόνο το scoring panel
+
     # 2. DEFINE STRATEGIES
     col_s1, col_s2 = st.columns(2)
     with col_s1:
@@ -88,10 +103,3 @@ def show_qspm_tool():
         st.success(f"🏆 **Winner: {strat1_name}.** This strategy demonstrates superior alignment with your current financial constraints and resource availability.")
     else:
         st.success(f"🏆 **Winner: {strat2_name}.** This path offers higher expected returns and better capitalizes on market opportunities, despite potentially higher risk.")
-
-    # Navigation (Ευθυγραμμισμένο με το νέο app.py)
-    st.divider()
-    if st.button("⬅️ Back to Control Tower", use_container_width=True):
-        st.session_state.flow_step = "home"
-        st.session_state.selected_tool = None
-        st.rerun()
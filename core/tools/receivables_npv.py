@@ -1,79 +1,65 @@
 import streamlit as st
 import plotly.graph_objects as go
-from decimal import Decimal, getcontext
 import numpy as np
-
-# --- CALCULATION ENGINE
-def calculate_discount_npv(
-    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
-    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
-    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
-):
-    getcontext().prec = 50 
-    
-    cs = Decimal(str(current_sales))
-    es = Decimal(str(extra_sales))
-    dt = Decimal(str(discount_trial))
-    pct_take = Decimal(str(prc_clients_take_disc))
-    d_take_old = Decimal(str(days_curently_paying_clients_take_discount))
-    d_no_take_old = Decimal(str(days_curently_paying_clients_not_take_discount))
-    d_new_policy = Decimal(str(new_days_payment_clients_take_disc))
-    cg = Decimal(str(cogs))
-    wc = Decimal(str(wacc))
-    d_supp = Decimal(str(avg_days_pay_suppliers))
-    
-    pct_no_take = Decimal('1') - pct_take
-    avg_curr_days = (pct_take * d_take_old) + (pct_no_take * d_no_take_old)
-    curr_rec = (cs * avg_curr_days) / Decimal('365')
-    
-    total_sales = cs + es
-    prcnt_new_policy = ((cs * pct_take) + es) / total_sales
-    prcnt_old_policy = Decimal('1') - prcnt_new_policy
-    
-    new_avg_period = (prcnt_new_policy * d_new_policy) + (prcnt_old_policy * d_no_take_old)
-    new_rec = (total_sales * new_avg_period) / Decimal('365')
-    free_cap = curr_rec - new_rec
-    
-    prof_extra = es * (Decimal('1') - (cg / cs))
-    prof_free_cap = free_cap * wc
-    dist_cost = total_sales * prcnt_new_policy * dt
-    
-    i = wc / Decimal('365')
-    term1 = (total_sales * prcnt_new_policy * (Decimal('1') - dt)) / ((Decimal('1') + i) ** d_new_policy)
-    term2 = (total_sales * prcnt_old_policy) / ((Decimal('1') + i) ** d_no_take_old)
-    inflow = term1 + term2
-    
-    term3 = (cg / cs) * (es / cs) * cs / ((Decimal('1') + i) ** d_supp)
-    term4 = cs / ((Decimal('1') + i) ** avg_curr_days)
-    outflow = term3 + term4
-    
-    npv = inflow - outflow
-
-    max_d = Decimal('1') - (
-        (Decimal('1') + i)**(d_new_policy - d_no_take_old) * (
-            (Decimal('1') - Decimal('1')/prcnt_new_policy) + (
-                (Decimal('1') + i)**(d_no_take_old - avg_curr_days) + 
-                (cg/cs)*(es/cs)*(Decimal('1') + i)**(d_no_take_old - d_supp)
-            ) / (prcnt_new_policy * (Decimal('1') + es/cs))
+from core.compute.receivables import calculate_discount_npv, calculate_discount_npv_batch, audit_discount_npv
+from core.figures import cached_figure, series
+
+# --- CHARTS ---
+def _liquidity_gap_figure(c_sales, e_sales, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps, survival_days):
+    discounts = np.linspace(0, 0.05, 11) # 0% to 5%
+    r = calculate_discount_npv_batch(c_sales, e_sales, discounts, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps)
+    gaps = r['new_avg_collection_period'] - survival_days
+    x, y = series(discounts * 100, gaps)
+
+    fig_gap = go.Figure()
+    fig_gap.add_trace(go.Scatter(x=x, y=y, mode='lines+markers', name='Liquidity Gap', line=dict(color='#ff4b4b')))
+    fig_gap.add_hline(y=0, line_dash="dash", line_color="green", annotation_text="Survival Threshold")
+    fig_gap.update_layout(title="Liquidity Gap (Days) by Discount level", xaxis_title="Discount %", yaxis_title="Days (Positive = Danger)", template="plotly_dark")
+    return fig_gap
+
+def _sensitivity_grid(c_sales, e_sales, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps):
+    # Discount x Adoption x WACC (±5pp) σε μία vectorized κλήση
+    discounts = np.linspace(0, 0.05, 21)
+    adoption = np.linspace(0.05, 1.0, 20)
+    waccs = np.unique(np.clip(wacc_val + np.arange(-5, 6) / 100, 0.0, None))
+    cube = calculate_discount_npv_batch(
+        c_sales, e_sales, discounts[:, None, None], adoption[None, :, None],
+        d_take_current, d_no_take, d_new_target, cogs_val, waccs[None, None, :], d_supps,
+    )["npv"]
+    return discounts, adoption, waccs, cube
+
+def _sensitivity_heatmap_figure(c_sales, e_sales, d_trial, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps):
+    discounts, adoption, waccs, cube = _sensitivity_grid(c_sales, e_sales, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps)
+    active = int(np.argmin(np.abs(waccs - wacc_val)))
+    # Συμμετρική κλίμακα γύρω από το 0· χωρίς πεπερασμένες τιμές (NaN / inf) -> ±1
+    finite = np.abs(cube[np.isfinite(cube)])
+    limit = float(finite.max()) if finite.size else 1.0
+    limit = limit if limit > 0 else 1.0
+
+    def heatmap(k):
+        return go.Heatmap(
+            x=discounts * 100, y=adoption * 100, z=cube[:, :, k].T,
+            colorscale="RdYlGn", zmin=-limit, zmax=limit, colorbar=dict(title="NPV ($)"),
+            hovertemplate="Discount %{x:.2f}%<br>Adoption %{y:.0f}%<br>NPV $%{z:,.0f}<extra></extra>",
         )
+
+    fig = go.Figure(data=[heatmap(active), go.Scatter(
+        x=[d_trial * 100], y=[p_take * 100], mode="markers", name="Your scenario",
+        marker=dict(symbol="x", size=12, color="white"),
+    )])
+    # Το slider του WACC αλλάζει frame στον browser - χωρίς rerun
+    fig.frames = [go.Frame(data=[heatmap(k)], traces=[0], name=f"{w * 100:.1f}") for k, w in enumerate(waccs)]
+    fig.update_layout(
+        template="plotly_dark", height=480, margin=dict(l=20, r=20, t=30, b=20),
+        xaxis_title="Discount %", yaxis_title="Clients Adopting %", showlegend=False,
+        sliders=[dict(
+            active=active, currentvalue=dict(prefix="WACC: ", suffix="%"), pad=dict(t=50),
+            steps=[dict(label=f"{w * 100:.1f}", method="animate",
+                        args=[[f"{w * 100:.1f}"], dict(mode="immediate", frame=dict(duration=0, redraw=True))])
+                   for w in waccs],
+        )],
     )
-    
-    opt_d = (Decimal('1') - ((Decimal('1') + i)**(d_new_policy - avg_curr_days))) / Decimal('2')
-
-    return {
-        "avg_current_collection_days": float(avg_curr_days),
-        "current_receivables": float(curr_rec),
-        "new_avg_collection_period": float(new_avg_period),
-        "new_receivables": float(new_rec),
-        "free_capital": float(free_cap),
-        "profit_from_extra_sales": float(prof_extra),
-        "profit_from_free_capital": float(prof_free_cap),
-        "discount_cost": float(dist_cost),
-        "npv": float(npv),
-        "max_discount": float(max_d * 100),
-        "optimum_discount": float(opt_d * 100),
-        "pct_new_policy": float(prcnt_new_policy * 100)
-    }
+    return fig
 
 # --- UI LAYER ---
 def show_receivables_analyzer_ui():
@@ -107,10 +93,20 @@ def show_receivables_analyzer_ui():
             d_supps = st.number_input("DPO (Supplier Days)", value=int(sys_ap_days))
             d_no_take = st.number_input("Collection for Non-Adopters (Days)", value=int(sys_ar_days * 1.5))
 
+        audit = st.checkbox("Audit mode (Decimal, 50 digits - cross-checked)", value=False)
         submitted = st.form_submit_button("Execute NPV Simulation", use_container_width=True)
 
     if submitted:
-        r = calculate_discount_npv(c_sales, e_sales, d_trial, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps)
+        args = (c_sales, e_sales, d_trial, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps)
+        if audit:
+            check = audit_discount_npv(*args)
+            r = check['decimal']
+            if check['mismatches']:
+                st.error(f"Audit: float64 engine differs from Decimal on {', '.join(check['mismatches'])}.")
+            else:
+                st.caption(f"Audit passed: Decimal vs float64 max relative difference {check['max_rel_diff']:.1e}.")
+        else:
+            r = calculate_discount_npv(*args)
         
         # Financial Verdict Cards
         st.divider()
@@ -133,7 +129,12 @@ def show_receivables_analyzer_ui():
         # Sensitivity Matrix
         st.divider()
         st.subheader("🔬 Sensitivity Analysis")
-        # [Κώδικας Heatmap εδώ - Παραλείπεται για συντομία αλλά παραμένει στο αρχείο σου]
+        st.caption("Strategy NPV by discount and adoption rate; the slider moves WACC ±5pp.")
+        fig_sens = cached_figure(
+            "receivables:sensitivity", _sensitivity_heatmap_figure,
+            c_sales, e_sales, d_trial, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps,
+        )
+        st.plotly_chart(fig_sens, use_container_width=True)
 
         # --- SURVIVAL SHIELD & LIQUIDITY GAP CHART ---
         st.divider()
@@ -154,16 +155,10 @@ def show_receivables_analyzer_ui():
 
         # --- NEW: LIQUIDITY GAP LINE CHART ---
         st.write("**Liquidity Gap vs. Discount Rate**")
-        discounts = np.linspace(0, 0.05, 11) # 0% to 5%
-        gaps = []
-        for d in discounts:
-            temp_r = calculate_discount_npv(c_sales, e_sales, d, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps)
-            gaps.append(temp_r['new_avg_collection_period'] - survival_days)
-
-        fig_gap = go.Figure()
-        fig_gap.add_trace(go.Scatter(x=discounts*100, y=gaps, mode='lines+markers', name='Liquidity Gap', line=dict(color='#ff4b4b')))
-        fig_gap.add_hline(y=0, line_dash="dash", line_color="green", annotation_text="Survival Threshold")
-        fig_gap.update_layout(title="Liquidity Gap (Days) by Discount level", xaxis_title="Discount %", yaxis_title="Days (Positive = Danger)", template="plotly_dark")
+        fig_gap = cached_figure(
+            "receivables:liquidity_gap", _liquidity_gap_figure,
+            c_sales, e_sales, p_take, d_take_current, d_no_take, d_new_target, cogs_val, wacc_val, d_supps, survival_days,
+        )
         st.plotly_chart(fig_gap, use_container_width=True)
 
     st.divider()
@@ -1,6 +1,11 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from core.sensitivity import calculate_sensitivities, tornado
+from core.monte_carlo import run_monte_carlo
+from core.projection import project_cash
+from core.sync import read_engine_inputs
+from core.fragments import tool_fragment
 
 def show_stress_test_tool():
     """
@@ -15,17 +20,33 @@ def show_stress_test_tool():
         st.warning("⚠️ Baseline not locked. Please lock parameters in Home first.")
         return
     
-    # 1. BASELINE DATA RETRIEVAL (Linked to Home Inputs)
-    price = float(s.get('price', 150.0))
-    vc = float(s.get('variable_cost', 90.0))
-    volume = float(s.get('volume', 15000))
-    fixed_costs = float(s.get('fixed_cost', 450000.0))
-    current_cash = float(s.get('opening_cash', 150000.0))
+    # 1. BASELINE DATA RETRIEVAL (Linked to Home Inputs) - μία φορά ανά full rerun,
+    # τα fragments παρακάτω ξανατρέχουν μόνο τα δικά τους panels πάνω σε αυτό το snapshot
+    baseline = read_engine_inputs(s)
+    opening_nwc = metrics.get("net_working_capital", 0.0)
+
+    _scenario_panel(baseline, opening_nwc)
+    _monte_carlo_panel(baseline, float(s.get('wacc_locked', 15.0)))
+
+    # 8. NAVIGATION
+    st.divider()
+    if st.button("⬅️ Return to Hub", use_container_width=True):
+        s.flow_step = "home"
+        st.rerun()
+
+
+@tool_fragment("stress_test:scenario")
+def _scenario_panel(baseline, opening_nwc):
+    price = baseline["price"]
+    vc = baseline["variable_cost"]
+    volume = baseline["volume"]
+    fixed_costs = baseline["fixed_cost"]
+    current_cash = baseline["opening_cash"]
     
     # Financial Obligations (Critical for Stress Test)
-    annual_debt_service = float(s.get('annual_debt_service', 70000.0))
-    depreciation = float(s.get('depreciation', 50000.0))
-    tax_rate = float(s.get('tax_rate', 22.0)) / 100
+    annual_debt_service = baseline["annual_debt_service"]
+    depreciation = baseline["depreciation"]
+    tax_rate = baseline["tax_rate"] / 100
 
     # 2. SCENARIO PARAMETERS (USER INPUTS)
     st.subheader("⚠️ Scenario Parameters")
@@ -66,6 +87,19 @@ def show_stress_test_tool():
               delta=f"${cash_delta:,.0f}",
               delta_color="normal" if remaining_liquidity > 0 else "inverse")
 
+    # 4.1 TIMING: πότε τελειώνει το ταμείο στο shocked scenario (μηνιαία προβολή 24 μηνών)
+    path = project_cash(
+        **{**baseline, "volume": new_volume, "variable_cost": new_vc,
+           "ar_days": baseline["ar_days"] + dso_shock},
+        periods=24,
+        opening_nwc=opening_nwc,
+    )
+    cash_out = int(path["cash_out_period"][0])
+    if cash_out >= 0:
+        st.error(f"⏳ **Cash-Out Month:** Under this shock, cash turns negative in **Month {cash_out + 1}**.")
+    else:
+        st.success(f"⏳ Cash stays positive for 24 months under this shock (low point: ${path['min_cash'][0]:,.0f}).")
+
     # 5. REMEDIES TABLE (Triggered on negative liquidity)
     if remaining_liquidity < 0:
         st.error(f"🚨 **LIQUIDITY CRUNCH:** Funding gap of ${abs(remaining_liquidity):,.0f} detected.")
@@ -90,15 +124,28 @@ def show_stress_test_tool():
     # 6. TORNADO CHART (SENSITIVITY ANALYSIS)
     st.subheader("🌪️ Sensitivity Analysis (Tornado Chart)")
     
-    # Impact calculations for Tornado
-    dso_sens = (new_rev / 365) * (dso_shock * 0.1) # 10% change in shock
-    vc_sens = (new_volume * (new_vc * 0.1)) / 12   # Monthly impact of 10% VC spike
-    vol_sens = ((price - new_vc) * (new_volume * 0.1)) / 12 # Monthly impact of 10% vol drop
+    # Analytic sensitivities at the shocked point (μία αποτίμηση του engine, χωρίς 10% bumps)
+    shocked = {
+        **baseline,
+        "volume": new_volume,
+        "variable_cost": new_vc,
+        "ar_days": baseline["ar_days"] + dso_shock,
+    }
+    sens = calculate_sensitivities(**shocked, metrics=("net_cash_position",))
 
+    # 10% adverse move per driver -> cash lost (θετικό = ζημιά)
+    drivers = [
+        ("Collection Delay (DSO)", "ar_days", 1),
+        ("Variable Cost Spike", "variable_cost", 1),
+        ("Sales Volume Drop", "volume", -1),
+        ("Price Cut", "price", -1),
+        ("Fixed Cost Overrun", "fixed_cost", 1),
+    ]
+    impact = {item["Variable"]: item["Impact"]
+              for item in tornado(sens, "net_cash_position", [key for _, key, _ in drivers], shock=0.10)}
     tornado_items = [
-        {"Variable": "Collection Delay (DSO)", "Impact": dso_sens},
-        {"Variable": "Variable Cost Spike", "Impact": vc_sens},
-        {"Variable": "Sales Volume Drop", "Impact": vol_sens}
+        {"Variable": label, "Impact": -impact[key] * direction}
+        for label, key, direction in drivers
     ]
     tornado_items = sorted(tornado_items, key=lambda x: x["Impact"])
 
@@ -115,13 +162,35 @@ def show_stress_test_tool():
     fig.update_layout(
         height=300, 
         margin=dict(l=10, r=10, t=30, b=10),
-        xaxis_title="Potential Negative Impact on Monthly Cash ($)",
+        xaxis_title="Cash Lost on a 10% Adverse Move ($, annual)",
         template="plotly_white"
     )
     st.plotly_chart(fig, use_container_width=True)
 
-    # 7. NAVIGATION
-    st.divider()
-    if st.button("⬅️ Return to Hub", use_container_width=True):
-        s.flow_step = "home"
-        st.rerun()
+
+@tool_fragment("stress_test:monte_carlo")
+def _monte_carlo_panel(baseline, wacc_locked):
+    # 7. MONTE CARLO RISK PROFILE (distributions γύρω από το baseline)
+    st.subheader("🎲 Monte Carlo Risk Profile")
+    with st.form("mc_form"):
+        mc1, mc2 = st.columns(2)
+        n_draws = mc1.select_slider("Simulated Scenarios", options=[10_000, 100_000, 1_000_000], value=100_000)
+        mc_seed = mc2.number_input("Random Seed", value=42, step=1, help="Same seed = same result.")
+        run_mc = st.form_submit_button("Run Simulation", use_container_width=True)
+
+    if run_mc:
+        mc = run_monte_carlo(baseline, n_draws=int(n_draws), seed=int(mc_seed), wacc=wacc_locked)
+
+        def _fmt_runway(months):
+            return "No Burn" if months == float("inf") else f"{months:.1f} Months"
+
+        k1, k2, k3 = st.columns(3)
+        k1.metric("P(Negative Net Cash)", f"{mc['p_negative_cash']:.1%}")
+        k2.metric("P(ROIC < WACC)", f"{mc['p_roic_below_wacc']:.1%}", help=f"WACC hurdle: {wacc_locked:.2f}%")
+        k3.metric("Median Runway", _fmt_runway(mc['runway_quantiles'][0.5]))
+
+        st.table(pd.DataFrame({
+            "Percentile": [f"P{int(q * 100)}" for q in mc['runway_quantiles']],
+            "Runway": [_fmt_runway(v) for v in mc['runway_quantiles'].values()],
+        }))
+        st.caption(f"{mc['n_draws']:,} scenarios | seed {mc['seed']} | Shocks: price, volume, variable/fixed cost, AR/inventory/AP days.")
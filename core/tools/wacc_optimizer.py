@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 
 def show_wacc_optimizer_ui():
     st.header("📉 WACC Optimizer (Cost of Capital)")
@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.graph_objects as go
+from core.sensitivity import calculate_sensitivities
+from core.sync import read_engine_inputs
 
 def show_wc_optimizer():
     st.title("🔄 Working Capital & Cash Velocity")
@@ -77,8 +79,10 @@ def show_wc_optimizer():
 
     # 3. STRATEGIC INSIGHT (365-day logic)
     if m.get('revenue', 0) > 0:
-        daily_rev = m.get('revenue') / 365
-        st.info(f"💡 **Strategy:** If you reduce your collection days (AR) by 10 days, you will unlock **${daily_rev*10:,.0f}** in immediate liquidity.")
+        # dNWC/dAR_days από το analytic Jacobian του engine
+        sens = calculate_sensitivities(**read_engine_inputs(s), metrics=("net_working_capital",))
+        ar_release = 10 * float(sens["jacobian"]["net_working_capital"]["ar_days"][0])
+        st.info(f"💡 **Strategy:** If you reduce your collection days (AR) by 10 days, you will unlock **${ar_release:,.0f}** in immediate liquidity.")
 
     # 4. NAVIGATION
     if st.button("⬅️ Back to Hub", use_container_width=True):
@@ -1,7 +1,18 @@
 import streamlit as st
+import ast
+import importlib
 import importlib.util
+import logging
 import os
 import sys
+import threading
+
+from core.prewarm import timed_import
+
+logger = logging.getLogger(__name__)
+
+# Dev hot-reload: ξαναφορτώνει ένα tool μόνο όταν αλλάξει το mtime του αρχείου του
+HOT_RELOAD = os.environ.get("MLAB_TOOL_HOT_RELOAD", "0") == "1"
 
 # --- INTERNAL TOOL (Backup) ---
 def show_payables_manager_internal():
@@ -28,6 +39,111 @@ def show_payables_manager_internal():
     st.divider()
     st.metric("Net Financial Benefit", f"€{net_benefit:,.0f}")
 
+# --- TOOL REGISTRY (load once, cache module + entry function) ---
+class ToolRegistry:
+    """
+    key -> (module name, entry function) map with a process-wide cache.
+    Entries are validated without importing the tools (spec lookup + AST
+    check for the entry function); broken entries are logged once and
+    reported by error(key) instead of failing at click time.
+    """
+
+    def __init__(self, tool_map, hot_reload=HOT_RELOAD):
+        self.tool_map = dict(tool_map)
+        self.hot_reload = hot_reload
+        self._lock = threading.Lock()
+        self._loaded = {}  # key -> (module, func, mtime)
+        self.errors = self.validate()
+        for key, error in self.errors.items():
+            logger.warning("Tool '%s' disabled: %s", key, error)
+
+    def validate(self):
+        errors = {}
+        for key, (mod_name, func_name) in self.tool_map.items():
+            path = _module_file(mod_name)
+            if path is None:
+                errors[key] = f"module '{mod_name}' not found"
+                continue
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    tree = ast.parse(fh.read(), filename=path)
+            except (OSError, SyntaxError) as exc:
+                errors[key] = f"cannot parse {path}: {exc}"
+                continue
+            names = {n.name for n in tree.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
+            names |= {a.asname or a.name for n in tree.body if isinstance(n, ast.ImportFrom) for a in n.names}
+            if func_name not in names:
+                errors[key] = f"'{mod_name}' has no function '{func_name}'"
+        return errors
+
+    @property
+    def available(self):
+        """The valid part of the tool map (for prewarm / menus)."""
+        return {k: v for k, v in self.tool_map.items() if k not in self.errors}
+
+    def error(self, key):
+        if key not in self.tool_map:
+            return f"unknown tool '{key}'"
+        return self.errors.get(key)
+
+    def entry(self, key):
+        """Entry function of tool `key`; imports the module only on first use (or on mtime change)."""
+        error = self.error(key)
+        if error:
+            raise LookupError(error)
+        mod_name, func_name = self.tool_map[key]
+        cached = self._loaded.get(key)
+        if cached is not None and self._fresh(mod_name, cached):
+            return cached[1]
+
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached is not None and self._fresh(mod_name, cached):
+                return cached[1]
+            module = sys.modules.get(mod_name)
+            if module is not None and cached is not None and module is cached[0]:
+                module = importlib.reload(module)
+            else:
+                module = timed_import(mod_name)
+            func = getattr(module, func_name)
+            self._loaded[key] = (module, func, _mtime(module))
+            return func
+
+    def _fresh(self, mod_name, cached):
+        module, _, mtime = cached
+        if sys.modules.get(mod_name) is not module:
+            return False  # π.χ. ο file watcher του Streamlit το έβγαλε από το sys.modules
+        return not self.hot_reload or _mtime(module) == mtime
+
+
+def _module_file(mod_name):
+    try:
+        spec = importlib.util.find_spec(mod_name)
+    except (ImportError, ValueError):
+        return None
+    return spec.origin if spec is not None and spec.origin and os.path.exists(spec.origin) else None
+
+
+def _mtime(module):
+    try:
+        return os.stat(module.__file__).st_mtime_ns
+    except (OSError, TypeError, AttributeError):
+        return None
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(tool_map, hot_reload=HOT_RELOAD):
+    """One registry per distinct tool map per process (app.py re-runs on every interaction)."""
+    key = (tuple(sorted(tool_map.items())), hot_reload)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ToolRegistry(tool_map, hot_reload=hot_reload)
+        return _registries[key]
+
+
 # --- MAIN LIBRARY FUNCTION ---
 def show_library():
     s = st.session_state
@@ -50,24 +166,13 @@ def show_library():
         show_payables_manager_internal()
         return
 
+    # Bare όνομα ("payables_manager") -> core.tools.payables_manager, φορτωμένο μία φορά
+    dotted = mod_name if "." in mod_name else f"core.tools.{mod_name}"
+    registry = get_registry({mod_name: (dotted, func_name)})
+
     try:
-        # ΕΠΙΣΤΡΟΦΗ ΣΤΟ PATH ΤΟΥ ΠΡΩΙΝΟΥ:
-        # Ψάχνει στον φάκελο core/tools/ (εκεί που το είχες το πρωί)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(current_dir, "tools", f"{mod_name}.py")
-        
-        # Αν δεν το βρει εκεί, ψάχνει στον κεντρικό φάκελο tools/
-        if not os.path.exists(file_path):
-            project_root = os.path.dirname(current_dir)
-            file_path = os.path.join(project_root, "tools", f"{mod_name}.py")
-
-        spec = importlib.util.spec_from_file_location(mod_name, file_path)
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[mod_name] = module
-        spec.loader.exec_module(module)
-        
         # Εκτέλεση
-        getattr(module, func_name)()
+        registry.entry(mod_name)()
         
     except Exception as e:
         st.error(f"❌ Error loading tool: {e}")
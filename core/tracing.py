@@ -0,0 +1,183 @@
+"""
+Per-rerun span tracing.
+
+app.py opens a trace at the top of every rerun (begin_rerun) and wraps each
+phase in `with span(...)`; finish_rerun() closes it into the session's ring
+buffer (s._trace_reruns) and, if MLAB_TRACE_JSONL is set, appends it to that
+file. st.plotly_chart / st.pyplot calls get a span each while a trace is open.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+TRACE_ENABLED = os.environ.get("MLAB_TRACE", "1") != "0"
+TRACE_BUFFER = int(os.environ.get("MLAB_TRACE_BUFFER", "200"))  # reruns ανά session
+TRACE_JSONL = os.environ.get("MLAB_TRACE_JSONL") or None
+
+SESSION_KEY = "_trace_reruns"
+
+_local = threading.local()  # κάθε session τρέχει το script στο δικό της thread
+_jsonl_lock = threading.Lock()
+_install_lock = threading.Lock()
+
+
+def _trace():
+    return getattr(_local, "trace", None)
+
+
+def trace_active():
+    """True while app.py's rerun trace is open on this thread."""
+    return _trace() is not None
+
+
+def _session_buffer(s):
+    buffer = s.get(SESSION_KEY)
+    if buffer is None or buffer.maxlen != TRACE_BUFFER:
+        buffer = deque(buffer or (), maxlen=TRACE_BUFFER)
+        s[SESSION_KEY] = buffer
+    return buffer
+
+
+def begin_rerun(s=None, **tags):
+    """Starts the trace of this rerun (one per script thread)."""
+    if not TRACE_ENABLED:
+        return None
+    # Το buffer πιάνεται εδώ: μετά από st.stop() κάθε πρόσβαση στο session_state ξαναπετάει StopException
+    s = st.session_state if s is None else s
+    _local.trace = {
+        "buffer": _session_buffer(s),
+        "ts": time.time(),
+        "t0": time.perf_counter(),
+        "tags": dict(tags),
+        "spans": [],
+        "depth": 0,
+    }
+    return _local.trace
+
+
+def tag_rerun(**tags):
+    trace = _trace()
+    if trace is not None:
+        trace["tags"].update(tags)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Times the block; nested spans keep their depth. No-op without an open trace."""
+    trace = _trace()
+    if trace is None:
+        yield
+        return
+    depth = trace["depth"]
+    trace["depth"] = depth + 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        # st.stop() / st.rerun() περνάνε από εδώ ως exceptions - το span κλείνει κανονικά
+        trace["depth"] = depth
+        record = {"name": name, "ms": (time.perf_counter() - t0) * 1000, "depth": depth,
+                  "start_ms": (t0 - trace["t0"]) * 1000}
+        if attrs:
+            record.update(attrs)
+        trace["spans"].append(record)
+
+
+def end_rerun():
+    """Closes the trace into the session ring buffer; returns the rerun record."""
+    trace = _trace()
+    if trace is None:
+        return None
+    _local.trace = None
+    record = {
+        "ts": trace["ts"],
+        "total_ms": (time.perf_counter() - trace["t0"]) * 1000,
+        **trace["tags"],
+        "spans": sorted(trace["spans"], key=lambda r: r["start_ms"]),
+    }
+    trace["buffer"].append(record)
+    if TRACE_JSONL:
+        _append_jsonl(TRACE_JSONL, record)
+    return record
+
+
+@contextmanager
+def finish_rerun():
+    try:
+        yield
+    finally:
+        end_rerun()
+
+
+def _append_jsonl(path, record):
+    line = json.dumps(record, default=str)
+    with _jsonl_lock:
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+def session_reruns(s=None):
+    s = st.session_state if s is None else s
+    return list(s.get(SESSION_KEY) or ())
+
+
+# ------------------------------------------------
+# CHART SPANS (st.plotly_chart / st.pyplot)
+# ------------------------------------------------
+
+def _traced(name, func):
+    def wrapper(*args, **kwargs):
+        if _trace() is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+    wrapper.__wrapped__ = func
+    wrapper.__doc__ = func.__doc__
+    wrapper._mlab_traced = True
+    return wrapper
+
+
+def install_chart_spans():
+    """Wraps st.plotly_chart and st.pyplot once per process (tools call them via `st.`)."""
+    with _install_lock:
+        for attr in ("plotly_chart", "pyplot"):
+            current = getattr(st, attr)
+            if not getattr(current, "_mlab_traced", False):
+                setattr(st, attr, _traced(f"chart:{attr}", current))
+
+
+# ------------------------------------------------
+# AGGREGATION (latency panel)
+# ------------------------------------------------
+
+def latency_summary(reruns, by="tool"):
+    """
+    p50 / p95 / max of total rerun time per `by` tag, plus per span name
+    within each group: {group: {"reruns", "p50", "p95", "max", "spans": {...}}}.
+    """
+    import numpy as np
+
+    groups = {}
+    for record in reruns:
+        key = record.get(by) or record.get("step") or "-"
+        g = groups.setdefault(key, {"total": [], "spans": {}})
+        g["total"].append(record["total_ms"])
+        for sp in record["spans"]:
+            g["spans"].setdefault(sp["name"], []).append(sp["ms"])
+
+    def stats(values):
+        arr = np.asarray(values, dtype=np.float64)
+        return {"n": int(arr.size), "p50": float(np.percentile(arr, 50)),
+                "p95": float(np.percentile(arr, 95)), "max": float(arr.max())}
+
+    summary = {}
+    for key, g in groups.items():
+        total = stats(g["total"])
+        summary[key] = {"reruns": total["n"], "p50": total["p50"], "p95": total["p95"], "max": total["max"],
+                        "spans": {name: stats(v) for name, v in g["spans"].items()}}
+    return summary
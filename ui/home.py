@@ -1,6 +1,57 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
+from core.sync import lock_baseline, unlock_baseline
+
+
+def _use_ar_days(days):
+    # Callback: τρέχει πριν ξαναχτιστεί το widget "A/R Days"
+    st.session_state.ar_days = int(round(days))
+
+
+def _ar_days_from_file(s):
+    """A/R Days from a receivables file in MLAB_DATA_DIR - streamed, never loaded whole."""
+    from core.data_access import DATA_DIR, UI_MAX_FILE_MB, resolve_data_path
+    with st.expander("📥 Measure A/R Days from a receivables file"):
+        if not DATA_DIR:
+            st.caption("Set MLAB_DATA_DIR to read receivables files here, or run "
+                       "`python -m core.ar_aging <file>` and enter the DSO by hand.")
+            return
+        st.caption(f"Files in the data directory, up to {UI_MAX_FILE_MB:,.0f} MB. "
+                   "Larger files: `python -m core.ar_aging <file>`.")
+        name = st.text_input("File name (CSV / Parquet / fixed-width)", key="ar_file_path")
+        layout = st.text_input("Fixed-width layout (optional)", key="ar_file_layout",
+                               placeholder="invoice_date:0:8,amount:8:22,paid_date:22:30")
+        date_format = st.text_input("Date format (optional)", key="ar_file_date_format", placeholder="%d/%m/%Y",
+                                    help="CSV / Parquet only; default: guessed once from the first rows.")
+        if st.button("Compute aging & DSO", key="btn_ar_aging", disabled=not name):
+            from core.ar_aging import compute_aging
+            try:
+                path = resolve_data_path(name)
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                try:
+                    with st.spinner("Streaming receivables file..."):
+                        s.ar_aging_result = compute_aging(path, fixed_width=layout or None,
+                                                         date_format=date_format or None)
+                except (OSError, ValueError, KeyError):
+                    st.error("Could not read the file: check its columns "
+                             "(invoice_date, amount, paid_date), the date format or the fixed-width layout.")
+
+        r = s.get("ar_aging_result")
+        if not r:
+            return
+        st.caption(f"{r['source']} | as of {r['as_of']} | {r['rows']:,} rows in {r['seconds']:.1f}s")
+        st.table([{"Age (days)": b["bucket"], "Open ($)": f"{b['amount']:,.0f}", "Items": b["count"],
+                   "Share": f"{b['share']:.1%}"} for b in r["buckets"]])
+        c1, c2, c3 = st.columns(3)
+        c1.metric("DSO (balance)", f"{r['dso_balance']:.1f}" if r["dso_balance"] is not None else "n/a")
+        c2.metric("DSO (amount)", f"{r['dso_amount']:.1f}")
+        c3.metric("DSO (count)", f"{r['dso_count']:.1f}")
+
+        # Balance DSO = η περίοδος είσπραξης του engine· χωρίς paid_date μένει το amount-weighted
+        days = r["dso_balance"] if r["dso_balance"] is not None else r["dso_amount"]
+        st.button(f"Use {days:.0f} days as A/R Days", key="btn_use_ar_days", on_click=_use_ar_days, args=(days,))
 
 
 def run_home():
@@ -95,6 +146,7 @@ def run_home():
                     st.number_input("Corporate Tax Rate (%)", key="tax_rate", min_value=0.0, max_value=100.0, step=0.5)
 
                 st.number_input("A/R Days", key="ar_days", min_value=0, step=1)
+                _ar_days_from_file(s)
                 st.number_input("Inventory Days", key="inv_days", min_value=0, step=1)
                 st.number_input("A/P Days", key="ap_days", min_value=0, step=1)
                 st.number_input("Annual Debt Service ($)", key="annual_debt_service", min_value=0.0, step=1000.0)
@@ -102,7 +154,7 @@ def run_home():
             # --- LOCK / UNLOCK LOGIC ---
             if not s.get("baseline_locked"):
                 if st.button("▶ Test My Business", type="primary", use_container_width=True):
-                    s.baseline_locked = True
+                    lock_baseline(s)
                     s.flow_step = "control_tower"
                     st.rerun()
             else:
@@ -113,7 +165,7 @@ def run_home():
                         st.rerun()
                 with col_nav2:
                     if st.button("🔓 Unlock", use_container_width=True):
-                        s.baseline_locked = False
+                        unlock_baseline(s)
                         st.rerun()
 
         else:
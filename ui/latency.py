@@ -0,0 +1,85 @@
+import streamlit as st
+from core.tracing import TRACE_ENABLED, TRACE_JSONL, TRACE_BUFFER, latency_summary, session_reruns
+from core.memprofile import MEMPROFILE_ENABLED, memory_report, reset_memory_report
+
+
+def show_latency_panel():
+    st.title("⏱ Rerun Latency")
+    st.caption(f"This session's last {TRACE_BUFFER} reruns | JSONL: {TRACE_JSONL or 'off (set MLAB_TRACE_JSONL)'}")
+
+    if not TRACE_ENABLED:
+        st.info("Tracing is disabled (MLAB_TRACE=0).")
+        show_memory_section()
+        return
+
+    reruns = session_reruns()
+    if not reruns:
+        st.info("No reruns recorded yet - open a few tools and come back.")
+        show_memory_section()
+        return
+
+    # 1. Ανά tool / σελίδα
+    summary = latency_summary(reruns, by="tool")
+    rows = [
+        {"Tool / Page": key, "Reruns": g["reruns"], "p50 (ms)": round(g["p50"], 1),
+         "p95 (ms)": round(g["p95"], 1), "Max (ms)": round(g["max"], 1)}
+        for key, g in sorted(summary.items(), key=lambda kv: kv[1]["p95"], reverse=True)
+    ]
+    st.subheader("Per tool")
+    st.table(rows)
+
+    # 2. Ανάλυση ανά φάση για ένα tool
+    key = st.selectbox("Phase breakdown for", [r["Tool / Page"] for r in rows])
+    spans = summary[key]["spans"]
+    st.table([
+        {"Span": name, "Count": v["n"], "p50 (ms)": round(v["p50"], 2), "p95 (ms)": round(v["p95"], 2),
+         "Max (ms)": round(v["max"], 2)}
+        for name, v in sorted(spans.items(), key=lambda kv: kv[1]["p95"], reverse=True)
+    ])
+
+    # 3. Τελευταίο rerun (πριν από αυτό το panel)
+    with st.expander("Last recorded rerun", expanded=False):
+        last = reruns[-1]
+        st.caption(f"{last.get('step')} / {last.get('tool') or '-'} | total {last['total_ms']:.1f} ms")
+        st.code("\n".join(f"{'  ' * sp['depth']}{sp['name']:<28}{sp['ms']:>9.2f} ms" for sp in last["spans"]),
+                language=None)
+
+    if st.button("🗑 Clear this session's traces"):
+        st.session_state.pop("_trace_reruns", None)
+        st.rerun()
+
+    show_memory_section()
+
+
+def show_memory_section():
+    st.divider()
+    st.subheader("🧠 Memory per tool (process-wide)")
+    if not MEMPROFILE_ENABLED:
+        st.caption("Off - start the app with MLAB_MEMPROFILE=1 to snapshot tracemalloc around every tool.")
+        return
+
+    report = memory_report()
+    if not report:
+        st.info("No profiled tool runs yet.")
+        return
+
+    st.table([
+        {"Tool": r["tool"], "Runs": r["runs"],
+         "Retained total (KB)": round(r["retained_total"] / 1024, 1),
+         "Last run (KB)": round(r["last"]["retained_bytes"] / 1024, 1),
+         "Leaked figures": r["leaked_figures_total"]}
+        for r in report
+    ])
+    for r in report:
+        if r["leaked_figures_total"]:
+            st.warning(f"**{r['tool']}** left {r['leaked_figures_total']} matplotlib figure(s) open "
+                       f"- call plt.close(fig) after st.pyplot(fig).")
+
+    tool = st.selectbox("Top allocation sites (last run)", [r["tool"] for r in report])
+    last = next(r for r in report if r["tool"] == tool)["last"]
+    st.code("\n".join(f"{site['size_diff'] / 1024:>10.1f} KB {site['count_diff']:>+8}  {site['site']}"
+                      for site in last["top_sites"]), language=None)
+
+    if st.button("🗑 Reset memory report"):
+        reset_memory_report()
+        st.rerun()
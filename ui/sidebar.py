@@ -1,4 +1,7 @@
 import streamlit as st
+from core.metrics_cache import metrics_cache_stats
+from core.figures import figure_cache_stats
+from core.prewarm import format_import_report
 
 
 def show_sidebar():
@@ -33,6 +36,23 @@ def show_sidebar():
             st.session_state.clear()
             st.rerun()
 
+        # Debug panel (κρυφό - ενεργοποιείται με ?debug=1)
+        if st.query_params.get("debug") == "1":
+            with st.expander("🧰 Engine Cache", expanded=False):
+                stats = metrics_cache_stats()
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Hits", stats["hits"])
+                c2.metric("Misses", stats["misses"])
+                c3.metric("Evictions", stats["evictions"] + stats["expirations"])
+                st.caption(f"Hit rate: {stats['hit_rate']:.1%} | Size: {stats['size']}/{stats['maxsize']} | TTL: {stats['ttl_seconds']:.0f}s")
+                figs = figure_cache_stats()
+                st.caption(f"Figures: {figs['hits']} hits / {figs['misses']} builds | Size: {figs['size']}/{figs['maxsize']}")
+            with st.expander("⏱ Import Timings", expanded=False):
+                st.code(format_import_report(), language=None)
+            if st.button("⏱ Latency Panel", use_container_width=True):
+                st.session_state.flow_step = "latency"
+                st.rerun()
+
         st.divider()
 
         # Product Hunt badge